@@ -0,0 +1,221 @@
+"""Benchmark da exportação de livros.
+
+Gera livros sintéticos de tamanhos crescentes e mede tempo, pico de memória
+e tamanho da saída de cada formato. Os resultados são gravados em JSON e
+comparados com uma baseline salva anteriormente com ``--save-baseline``.
+
+Uso:
+    python -m benchmarks.export_bench --sizes 10 50 100 500
+    python -m benchmarks.export_bench --save-baseline
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from benchmarks.synthetic import synthetic_book
+from src.core.export.bounded_export import MemoryProfiler
+from src.models.book_models import BookState
+
+logger = logging.getLogger(__name__)
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+DEFAULT_SIZES = [10, 50, 100, 500]
+TARGETS = ["md", "epub", "pdf", "convert_to_pdf"]
+METRICS = ["seconds", "traced_peak_bytes", "output_bytes"]
+
+class BenchResult(BaseModel):
+    """Medidas de um formato para um tamanho de livro."""
+    target: str
+    chapters: int
+    seconds: float
+    traced_peak_bytes: int
+    output_bytes: int
+
+class Comparison(BaseModel):
+    """Variação de uma métrica em relação à baseline."""
+    target: str
+    chapters: int
+    metric: str
+    baseline: float
+    current: float
+    change: float  # variação relativa (0.1 = 10% maior)
+    regression: bool
+
+class BenchReport(BaseModel):
+    created_at: datetime
+    python: str
+    platform: str
+    results: List[BenchResult]
+    comparisons: List[Comparison] = []
+
+def _export_target(target: str, state: BookState, output_base: Path) -> Path:
+    """Exporta o livro num formato e retorna o arquivo gerado."""
+    from src.core.export.book_exporter import BookExporter
+    from src.core.export.html_cache import HtmlFragmentCache
+
+    # Cache de fragmentos próprio: cada caso mede a conversão a frio
+    exporter = BookExporter(state, html_cache=HtmlFragmentCache())
+    if target == "md":
+        path = output_base.with_suffix(".md")
+        exporter.export_markdown(path)
+    elif target == "epub":
+        path = output_base.with_suffix(".epub")
+        exporter.export_epub(path)
+    elif target == "pdf":
+        path = output_base.with_suffix(".pdf")
+        exporter.export_pdf(path)
+    elif target == "convert_to_pdf":
+        from convert_to_pdf import convert_md_to_pdf
+
+        markdown_path = output_base.with_name(output_base.name + "-convert.md")
+        exporter.export_markdown(markdown_path)
+        path = markdown_path.with_suffix(".pdf")
+        convert_md_to_pdf(str(markdown_path), str(path))
+    else:
+        raise ValueError(f"Formato de benchmark desconhecido: {target}")
+    return path
+
+def run_case(
+    target: str,
+    state: BookState,
+    work_dir: Path,
+    export: Callable[[str, BookState, Path], Path] = _export_target
+) -> BenchResult:
+    """Mede a exportação de um livro num formato.
+
+    O livro é exportado duas vezes: a primeira, com o tracemalloc, mede o
+    pico de memória; a segunda mede o tempo sem o custo do rastreamento.
+    O pico de RSS não é medido: no mesmo processo, ele só cresce entre os
+    casos e não diz nada sobre o caso atual.
+    """
+    output_base = work_dir / f"livro-{len(state.book)}"
+    traced, timed = MemoryProfiler(), MemoryProfiler(trace=False)
+    with traced.phase(target):
+        export(target, state, output_base)
+    with timed.phase(target):
+        path = export(target, state, output_base)
+    return BenchResult(
+        target=target,
+        chapters=len(state.book),
+        seconds=timed.phases[0].seconds,
+        traced_peak_bytes=traced.phases[0].traced_peak_bytes,
+        output_bytes=path.stat().st_size
+    )
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    targets: Sequence[str],
+    export: Callable[[str, BookState, Path], Path] = _export_target
+) -> List[BenchResult]:
+    """Executa todos os casos, do menor livro para o maior."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="export-bench-") as work_dir:
+        for chapters in sorted(sizes):
+            state = synthetic_book(chapters)
+            for target in targets:
+                result = run_case(target, state, Path(work_dir), export)
+                logger.info(
+                    f"{target:<15} {chapters:>4} capítulos: {result.seconds:8.2f}s  "
+                    f"pico {result.traced_peak_bytes / 1024 / 1024:8.1f} MB  "
+                    f"saída {result.output_bytes / 1024:10.1f} KB"
+                )
+                results.append(result)
+    return results
+
+def compare(
+    results: List[BenchResult],
+    baseline: List[BenchResult],
+    threshold: float = 0.2
+) -> List[Comparison]:
+    """Compara os resultados com a baseline, caso a caso.
+
+    Casos ausentes da baseline são ignorados. Uma métrica é regressão quando
+    cresce mais que ``threshold`` em relação à baseline.
+    """
+    previous: Dict[tuple, BenchResult] = {(r.target, r.chapters): r for r in baseline}
+    comparisons = []
+    for result in results:
+        reference = previous.get((result.target, result.chapters))
+        if reference is None:
+            continue
+        for metric in METRICS:
+            base, current = getattr(reference, metric), getattr(result, metric)
+            change = (current - base) / base if base else 0.0
+            comparisons.append(Comparison(
+                target=result.target,
+                chapters=result.chapters,
+                metric=metric,
+                baseline=base,
+                current=current,
+                change=change,
+                regression=change > threshold
+            ))
+    return comparisons
+
+def load_results(path: Path) -> Optional[List[BenchResult]]:
+    """Lê os resultados de um relatório salvo (None se não existir)."""
+    if not path.exists():
+        return None
+    return BenchReport.model_validate_json(path.read_text(encoding="utf-8")).results
+
+def save_report(report: BenchReport, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report.model_dump_json(indent=2), encoding="utf-8")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark da exportação de livros")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Números de capítulos dos livros sintéticos")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=TARGETS,
+                        help="Formatos medidos")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT,
+                        help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="Baseline usada na comparação")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Grava os resultados também como nova baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Aumento relativo considerado regressão (padrão: 0.2)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_benchmarks(args.sizes, args.targets)
+    report = BenchReport(
+        created_at=datetime.now(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        results=results
+    )
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        logger.info(f"Sem baseline em {args.baseline}; use --save-baseline para criá-la")
+    else:
+        report.comparisons = compare(results, baseline, args.threshold)
+        for comparison in report.comparisons:
+            if comparison.regression:
+                logger.warning(
+                    f"Regressão: {comparison.target} com {comparison.chapters} capítulos, "
+                    f"{comparison.metric} {comparison.baseline:.2f} -> {comparison.current:.2f} "
+                    f"({comparison.change:+.0%})"
+                )
+
+    save_report(report, args.output)
+    logger.info(f"Resultados salvos em {args.output}")
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        logger.info(f"Baseline atualizada em {args.baseline}")
+    return 1 if any(c.regression for c in report.comparisons) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import random
+from typing import List
+
+from src.models.book_models import BookState, Chapter
+
+WORDS = (
+    "python dados função classe módulo pacote variável lista dicionário tupla conjunto "
+    "exceção teste desempenho memória processo thread arquivo rede banco consulta índice "
+    "cache fila evento servidor cliente requisição resposta erro valor tipo objeto"
+).split()
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+def _code_block(rng: random.Random, lines: int) -> str:
+    body = "\n".join(
+        f"    resultado_{i} = processar({rng.choice(WORDS)!r}, limite={rng.randint(1, 100)})"
+        for i in range(lines)
+    )
+    return f"```python\ndef exemplo():\n{body}\n    return resultado_0\n```"
+
+def _table(rng: random.Random, rows: int) -> str:
+    header = "| Nome | Tipo | Valor |\n| --- | --- | --- |"
+    lines = [
+        f"| {rng.choice(WORDS)} | {rng.choice(WORDS)} | {rng.randint(0, 10_000)} |"
+        for _ in range(rows)
+    ]
+    return "\n".join([header] + lines)
+
+def synthetic_chapter(rng: random.Random, number: int, sections: int = 4) -> Chapter:
+    """Capítulo com seções de parágrafos longos, blocos de código e tabelas."""
+    parts: List[str] = [f"# Capítulo {number}", _paragraph(rng, 120)]
+    for section in range(1, sections + 1):
+        parts.append(f"## Seção {number}.{section}")
+        parts.extend(_paragraph(rng, rng.randint(80, 200)) for _ in range(3))
+        parts.append(_code_block(rng, rng.randint(5, 15)))
+        parts.append(_table(rng, rng.randint(4, 10)))
+        parts.append(f"- {_paragraph(rng, 12)}\n- {_paragraph(rng, 12)}\n- {_paragraph(rng, 12)}")
+    return Chapter(title=f"Capítulo {number}", content="\n\n".join(parts), chapter_id=f"c{number}")
+
+def synthetic_book(chapters: int, sections: int = 4, seed: int = 0) -> BookState:
+    """Gera um livro sintético e determinístico com o número de capítulos pedido.
+
+    Args:
+        chapters: Número de capítulos
+        sections: Seções por capítulo (cada uma com parágrafos, código e tabela)
+        seed: Semente do gerador, para que execuções diferentes comparem o mesmo livro
+    """
+    rng = random.Random(seed)
+    return BookState(
+        title=f"Livro sintético ({chapters} capítulos)",
+        topic="Benchmark",
+        goal="Medir a exportação",
+        target_audience="Desenvolvedores",
+        book=[synthetic_chapter(rng, number, sections) for number in range(1, chapters + 1)]
+    )
@@ -1,11 +1,19 @@
 import argparse
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from weasyprint import HTML
-import markdown
 import sys
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime
+from pydantic import BaseModel
+from src.core.export.pdf_renderer import render_markdown_file
+from src.core.export.themes import get_theme
 
 # Configuração do logging
 logging.basicConfig(
@@ -14,6 +22,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MANIFEST_NAME = ".pdf_manifest.json"
+DEFAULT_WORKER_MEMORY_MB = 2048
+DEFAULT_TASKS_PER_CHILD = 50
+MAX_ATTEMPTS = 2  # rodadas interrompidas antes de converter o arquivo isoladamente
+
 def list_markdown_files(directory: str = "output") -> List[Path]:
     """Lista todos os arquivos markdown no diretório especificado."""
     output_dir = Path(directory)
@@ -63,7 +76,7 @@ def select_file(files: List[Path]) -> Optional[Path]:
         except ValueError:
             print("Entrada inválida! Digite um número ou 'q' para sair.")
 
-def convert_md_to_pdf(input_file: str, output_file: str = None):
+def convert_md_to_pdf(input_file: str, output_file: str = None, theme: str = None) -> Path:
     """
     Converte um arquivo Markdown para PDF.
     
@@ -71,93 +84,247 @@ def convert_md_to_pdf(input_file: str, output_file: str = None):
         input_file (str): Caminho do arquivo markdown de entrada
         output_file (str, optional): Caminho do arquivo PDF de saída.
             Se não fornecido, será criado no mesmo diretório com o mesmo nome.
+        theme (str, optional): Tema do PDF (padrão: PDF_THEME). O CSS e as
+            fontes são compilados uma vez por processo.
+
+    Returns:
+        Caminho do PDF gerado
+
+    Raises:
+        FileNotFoundError: Se o arquivo de entrada não existir
     """
-    try:
-        input_path = Path(input_file)
-        
-        # Verifica se o arquivo de entrada existe
-        if not input_path.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {input_file}")
-            
-        # Define o arquivo de saída se não fornecido
-        if output_file is None:
-            output_file = input_path.with_suffix('.pdf')
-        
-        logger.info(f"Convertendo {input_path} para PDF...")
-        
-        # Lê o conteúdo do arquivo markdown
-        with open(input_path, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # Converte markdown para HTML
-        html_content = markdown.markdown(
-            md_content,
-            extensions=['extra', 'nl2br', 'sane_lists', 'smarty']
-        )
-        
-        # Adiciona estilo CSS básico
-        styled_html = f"""
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    margin: 2cm;
-                }}
-                h1, h2, h3 {{
-                    color: #2c3e50;
-                }}
-                h1 {{
-                    border-bottom: 2px solid #2c3e50;
-                    padding-bottom: 10px;
-                }}
-                code {{
-                    background-color: #f7f7f7;
-                    padding: 2px 5px;
-                    border-radius: 3px;
-                }}
-                pre {{
-                    background-color: #f7f7f7;
-                    padding: 15px;
-                    border-radius: 5px;
-                    overflow-x: auto;
-                }}
-                blockquote {{
-                    border-left: 4px solid #2c3e50;
-                    margin: 0;
-                    padding-left: 15px;
-                    color: #666;
-                }}
-                table {{
-                    border-collapse: collapse;
-                    width: 100%;
-                    margin: 15px 0;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 8px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f7f7f7;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
-        
-        # Converte HTML para PDF
-        HTML(string=styled_html).write_pdf(output_file)
-        
-        logger.info(f"PDF gerado com sucesso: {output_file}")
+    input_path = Path(input_file)
+    
+    # Verifica se o arquivo de entrada existe
+    if not input_path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {input_file}")
         
+    # Define o arquivo de saída se não fornecido
+    if output_file is None:
+        output_file = input_path.with_suffix('.pdf')
+    
+    logger.info(f"Convertendo {input_path} para PDF...")
+    
+    # Converte com o mesmo HTML e tema do BookSaver; o PDF é gravado num
+    # temporário e renomeado, então uma falha não deixa um arquivo parcial
+    render_markdown_file(str(input_path), str(output_file), theme)
+    
+    logger.info(f"PDF gerado com sucesso: {output_file}")
+    return Path(output_file)
+
+class BatchSummary(BaseModel):
+    """Resultado de uma conversão em lote."""
+    converted: List[str] = []
+    skipped: List[str] = []
+    failed: Dict[str, str] = {}  # arquivo -> erro
+    seconds: float = 0.0
+
+def file_digest(path: Path, theme_digest: str) -> str:
+    """Hash do conteúdo do markdown e do tema usado na conversão."""
+    digest = hashlib.sha256(theme_digest.encode("utf-8"))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(directory: Path) -> Dict[str, str]:
+    """Lê o manifesto da conversão em lote (arquivo relativo -> hash convertido)."""
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError:
+        logger.warning(f"Manifesto inválido ignorado: {path}")
+        return {}
+
+def save_manifest(directory: Path, manifest: Dict[str, str]) -> None:
+    path = directory / MANIFEST_NAME
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def needs_conversion(md_path: Path, pdf_path: Path, digest: str, converted_digest: Optional[str]) -> bool:
+    """Decide se um markdown precisa ser convertido.
+
+    Com registro no manifesto, converte só se o conteúdo ou o tema mudaram;
+    sem registro, converte se o PDF não existir ou for mais antigo que o markdown.
+    """
+    if not pdf_path.exists():
+        return True
+    if converted_digest is not None:
+        return converted_digest != digest
+    return pdf_path.stat().st_mtime < md_path.stat().st_mtime
+
+def limit_worker_memory(max_bytes: Optional[int]) -> None:
+    """Limita o espaço de endereçamento do processo (inicializador dos workers)."""
+    if not max_bytes:
+        return
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+    except (ImportError, ValueError, OSError) as e:
+        logger.warning(f"Não foi possível limitar a memória do worker: {str(e)}")
+
+_started_files = None  # fila dos arquivos iniciados, definida nos workers
+
+def init_worker(max_bytes: Optional[int], started) -> None:
+    """Inicializador dos workers: limita a memória e guarda a fila de arquivos iniciados."""
+    global _started_files
+    _started_files = started
+    limit_worker_memory(max_bytes)
+
+def run_tracked(
+    convert: Callable[[str, Optional[str]], Optional[str]],
+    input_file: str,
+    theme: Optional[str] = None
+) -> Optional[str]:
+    """Avisa o processo principal que o arquivo começou a ser convertido e o converte."""
+    _started_files.put(input_file)
+    return convert(input_file, theme)
+
+def convert_file(input_file: str, theme: Optional[str] = None) -> Optional[str]:
+    """Converte um arquivo num worker; retorna a mensagem de erro ou None."""
+    try:
+        convert_md_to_pdf(input_file, theme=theme)
+        return None
+    except MemoryError:
+        return "memória esgotada (limite do worker)"
     except Exception as e:
-        logger.error(f"Erro ao converter arquivo: {str(e)}")
-        sys.exit(1)
+        return str(e)
+
+def convert_directory(
+    directory: str,
+    workers: Optional[int] = None,
+    theme: Optional[str] = None,
+    force: bool = False,
+    max_memory_mb: Optional[int] = DEFAULT_WORKER_MEMORY_MB,
+    max_tasks_per_child: Optional[int] = DEFAULT_TASKS_PER_CHILD,
+    convert: Callable[[str, Optional[str]], Optional[str]] = convert_file
+) -> BatchSummary:
+    """Converte todos os markdowns de uma árvore de diretórios num pool de processos.
+
+    Arquivos cujo conteúdo e tema não mudaram desde a última conversão (ou,
+    sem registro no manifesto, cujo PDF é mais novo) são pulados. Falhas não
+    interrompem o lote: ficam no resumo. Os workers têm memória limitada e
+    são reciclados a cada ``max_tasks_per_child`` conversões; se um worker
+    morrer, os arquivos pendentes seguem num pool novo, e os que estavam em
+    conversão em mais de uma queda são convertidos isoladamente; os que
+    ainda esperavam na fila não são penalizados.
+
+    Args:
+        directory: Raiz da árvore de arquivos markdown
+        workers: Número de processos (padrão: número de CPUs)
+        theme: Tema dos PDFs (padrão: PDF_THEME)
+        force: Converte todos os arquivos, ignorando o manifesto
+        max_memory_mb: Limite de memória de cada worker (None desativa)
+        max_tasks_per_child: Conversões por worker antes de reciclá-lo
+        convert: Função executada nos workers (arquivo, tema) -> erro ou None
+
+    Raises:
+        ValueError: Se o diretório não existir
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        raise ValueError(f"Diretório não encontrado: {directory}")
+
+    start = time.perf_counter()
+    summary = BatchSummary()
+    manifest = {} if force else load_manifest(root)
+    theme_digest = get_theme(theme).digest
+    pending: Dict[str, str] = {}  # arquivo -> hash
+    for md_path in sorted(root.rglob("*.md")):
+        relative = md_path.relative_to(root).as_posix()
+        digest = file_digest(md_path, theme_digest)
+        if force or needs_conversion(md_path, md_path.with_suffix('.pdf'), digest, manifest.get(relative)):
+            pending[relative] = digest
+        else:
+            summary.skipped.append(relative)
+    logger.info(f"{len(pending)} arquivos para converter, {len(summary.skipped)} sem alterações")
+
+    attempts: Dict[str, int] = {}
+    max_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+    mp_context = multiprocessing.get_context("spawn")
+    # Os workers registram cada arquivo ao começar; SimpleQueue grava direto no
+    # pipe, então o registro não se perde se o worker morrer logo depois
+    started = mp_context.SimpleQueue()
+
+    def make_pool(max_workers: int, tasks_per_child: Optional[int]) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context,
+            initializer=init_worker,
+            initargs=(max_bytes, started),
+            max_tasks_per_child=tasks_per_child
+        )
+
+    def drain_started() -> Set[str]:
+        files = set()
+        while not started.empty():
+            files.add(started.get())
+        return files
+
+    def finish(relative: str, error: Optional[str]) -> None:
+        digest = pending.pop(relative)
+        if error is None:
+            manifest[relative] = digest
+            summary.converted.append(relative)
+        else:
+            logger.error(f"Falha ao converter {relative}: {error}")
+            summary.failed[relative] = error
+
+    try:
+        while pending:
+            isolated = [relative for relative in pending if attempts.get(relative, 0) >= MAX_ATTEMPTS]
+            for relative in isolated:
+                # Num processo próprio, a morte do worker só afeta este arquivo
+                with make_pool(1, None) as executor:
+                    try:
+                        error = executor.submit(run_tracked, convert, str(root / relative), theme).result()
+                    except BrokenProcessPool:
+                        error = "worker encerrado durante a conversão"
+                finish(relative, error)
+            if not pending:
+                break
+
+            drain_started()
+            interrupted: List[str] = []
+            with make_pool(workers or os.cpu_count(), max_tasks_per_child) as executor:
+                futures = {
+                    executor.submit(run_tracked, convert, str(root / relative), theme): relative
+                    for relative in pending
+                }
+                for future in as_completed(futures):
+                    relative = futures[future]
+                    try:
+                        error = future.result()
+                    except BrokenProcessPool:
+                        # Um worker morreu (ex.: limite de memória) e derrubou o pool:
+                        # os arquivos inacabados seguem numa nova rodada
+                        interrupted.append(relative)
+                        continue
+                    finish(relative, error)
+            if interrupted:
+                # Só os arquivos em conversão na queda contam uma tentativa; os que
+                # ainda esperavam na fila voltam sem penalidade. Se nenhum chegou a
+                # começar (ex.: falha no inicializador), todos contam, para o lote terminar
+                in_flight = {str(root / relative) for relative in interrupted} & drain_started()
+                for relative in interrupted:
+                    if not in_flight or str(root / relative) in in_flight:
+                        attempts[relative] = attempts.get(relative, 0) + 1
+    finally:
+        save_manifest(root, manifest)
+
+    summary.seconds = time.perf_counter() - start
+    return summary
+
+def print_summary(summary: BatchSummary) -> None:
+    print(f"\nConvertidos: {len(summary.converted)}  "
+          f"Sem alterações: {len(summary.skipped)}  "
+          f"Falhas: {len(summary.failed)}  "
+          f"Tempo: {summary.seconds:.1f}s")
+    for relative, error in sorted(summary.failed.items()):
+        print(f"  ✗ {relative}: {error}")
 
 def main():
     parser = argparse.ArgumentParser(description='Converte arquivo Markdown para PDF')
@@ -165,22 +332,47 @@ def main():
     parser.add_argument('-o', '--output', help='Arquivo PDF de saída (opcional)')
     parser.add_argument('-d', '--directory', default='output',
                       help='Diretório onde procurar arquivos markdown (padrão: output)')
+    parser.add_argument('-t', '--theme', help='Tema do PDF (padrão: PDF_THEME)')
+    parser.add_argument('-b', '--batch', metavar='DIR',
+                      help='Converte todos os markdowns da árvore DIR, sem interação')
+    parser.add_argument('-w', '--workers', type=int, help='Processos do modo lote (padrão: número de CPUs)')
+    parser.add_argument('--force', action='store_true', help='No modo lote, converte mesmo os arquivos sem alterações')
+    parser.add_argument('--max-memory-mb', type=int, default=DEFAULT_WORKER_MEMORY_MB,
+                      help=f'Limite de memória de cada worker do modo lote (padrão: {DEFAULT_WORKER_MEMORY_MB}; 0 desativa)')
+    parser.add_argument('--max-tasks-per-child', type=int, default=DEFAULT_TASKS_PER_CHILD,
+                      help=f'Conversões por worker antes de reciclá-lo (padrão: {DEFAULT_TASKS_PER_CHILD})')
     
     args = parser.parse_args()
     
-    if args.input:
-        # Se um arquivo foi especificado, converte diretamente
-        convert_md_to_pdf(args.input, args.output)
-    else:
-        # Lista arquivos disponíveis e permite seleção
-        files = list_markdown_files(args.directory)
-        selected_file = select_file(files)
-        
-        if selected_file:
-            output_file = args.output if args.output else None
-            convert_md_to_pdf(str(selected_file), output_file)
+    try:
+        if args.batch:
+            summary = convert_directory(
+                args.batch,
+                workers=args.workers,
+                theme=args.theme,
+                force=args.force,
+                max_memory_mb=args.max_memory_mb or None,
+                max_tasks_per_child=args.max_tasks_per_child
+            )
+            print_summary(summary)
+            if summary.failed:
+                sys.exit(1)
+        elif args.input:
+            # Se um arquivo foi especificado, converte diretamente
+            convert_md_to_pdf(args.input, args.output, args.theme)
         else:
-            logger.info("Operação cancelada pelo usuário.")
+            # Lista arquivos disponíveis e permite seleção
+            files = list_markdown_files(args.directory)
+            selected_file = select_file(files)
+            
+            if selected_file:
+                output_file = args.output if args.output else None
+                convert_md_to_pdf(str(selected_file), output_file, args.theme)
+            else:
+                logger.info("Operação cancelada pelo usuário.")
+    except Exception as e:
+        logger.error(f"Erro ao converter arquivo: {str(e)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -94,8 +94,11 @@ async def main():
         # Executa o flow
         result = await book_flow.execute(topic, target_audience, book_type)
         
+        await book_flow.aclose()
         print("\n✅ Livro gerado com sucesso!")
         print(f"📁 Arquivo salvo em: {result.output_path}")
+        if result.pdf_path:
+            print(f"📄 PDF salvo em: {result.pdf_path}")
         
     except Exception as e:
         logger.error("❌ Erro durante a execução do programa:")
@@ -0,0 +1,57 @@
+import argparse
+import logging
+import sys
+from aiohttp import web
+from src.core.config.settings import settings
+from src.factories.book_factory import BookContainer
+from src.core.run_repository import get_run_repository
+from src.server import JobManager, create_app
+
+def setup_logging():
+    file_handler = logging.FileHandler(settings.LOG_FILE, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        handlers=[file_handler, console_handler]
+    )
+
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    logging.getLogger('openai').setLevel(logging.WARNING)
+    logging.getLogger('aiohttp.access').setLevel(logging.WARNING)
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor HTTP de geração de ebooks')
+    parser.add_argument('--host', default=settings.SERVER_HOST, help='Endereço de escuta')
+    parser.add_argument('--port', type=int, default=settings.SERVER_PORT, help='Porta de escuta')
+    parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS,
+                        help='Número de livros gerados simultaneamente')
+    args = parser.parse_args()
+
+    setup_logging()
+    container = BookContainer()
+
+    # O BookFlow é reentrante: uma única instância atende todos os jobs
+    manager = JobManager(
+        flow_factory=container.book_flow,
+        workers=args.workers,
+        max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+        max_finished_jobs=settings.JOB_HISTORY_MAX_SIZE,
+        finished_ttl=settings.JOB_HISTORY_TTL_SECONDS
+    )
+    app = create_app(manager, runs=get_run_repository())
+
+    async def close_flow(_: web.Application) -> None:
+        # Conclui os PDFs em renderização antes de encerrar
+        await container.book_flow().aclose()
+
+    app.on_cleanup.append(close_flow)
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
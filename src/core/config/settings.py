@@ -2,7 +2,7 @@ import os
 import sys
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Literal, Optional
 from enum import Enum
 from pathlib import Path
 import logging
@@ -52,10 +52,79 @@ class AppSettings(BaseSettings):
     
     # Configurações de Paralelismo
     MAX_CONCURRENT_CHAPTERS: int = Field(default=3, description="Número máximo de capítulos gerados em paralelo")
+    MAX_CONCURRENT_RESEARCH: int = Field(default=6, description="Número máximo de pesquisas de capítulo em paralelo")
+    PIPELINE_QUEUE_SIZE: int = Field(default=4, description="Tamanho máximo das filas entre etapas do pipeline")
+    
+    # Revisão dos capítulos
+    ENABLE_REVIEW: bool = Field(default=False, description="Revisa cada capítulo com o ReviewCrew assim que ele é escrito")
+    MAX_CONCURRENT_REVIEWS: int = Field(default=3, description="Número máximo de revisões em paralelo")
+    REVIEW_QUEUE_SIZE: int = Field(default=4, description="Capítulos escritos aguardando revisão antes de pausar a escrita")
+    
+    # Prazos e degradação
+    BOOK_DEADLINE_SECONDS: Optional[int] = Field(default=None, description="Prazo padrão para gerar um livro, em segundos (None = sem prazo)")
+    OUTLINE_TIMEOUT_SECONDS: int = Field(default=180, description="Tempo máximo da geração do outline")
+    CHAPTER_TIMEOUT_SECONDS: int = Field(default=600, description="Tempo máximo de cada requisição de capítulo")
+    FALLBACK_MODEL_NAME: str = Field(default="gpt-4o-mini", description="Modelo mais rápido usado quando o prazo não comporta o modelo padrão")
+    FALLBACK_MODEL_SPEEDUP: float = Field(default=2.0, description="Quantas vezes o modelo de fallback é mais rápido que o padrão")
+    OPTIONAL_CHAPTER_TITLES: List[str] = Field(default_factory=lambda: ["Sumário"], description="Capítulos que podem ser omitidos quando o prazo é curto")
+    
+    # Eventos de progresso
+    STREAM_CHAPTERS: bool = Field(default=True, description="Recebe os capítulos em streaming e publica os trechos como eventos")
+    EVENT_SUBSCRIBER_BUFFER: int = Field(default=1000, description="Eventos pendentes por assinante antes de descartar")
+    EVENTS_JSONL_PATH: Optional[Path] = Field(
+        default_factory=lambda: Path(__file__).parent.parent.parent.parent / "logs" / "events.jsonl",
+        description="Arquivo JSONL com os eventos das execuções (None desativa)"
+    )
+    EVENT_WEBHOOK_URL: Optional[str] = Field(default=None, description="URL que recebe os eventos via POST (None desativa)")
+    EVENT_WEBHOOK_TIMEOUT: float = Field(default=5.0, description="Tempo máximo de cada chamada ao webhook")
+    RUNS_DB_PATH: Optional[Path] = Field(
+        default_factory=lambda: Path(__file__).parent.parent.parent.parent / "output" / "runs.db",
+        description="Banco SQLite com o histórico das execuções (None desativa)"
+    )
+    RUNS_DB_BATCH_SIZE: int = Field(default=200, description="Eventos gravados por transação no banco de execuções")
+    
+    # Servidor HTTP de jobs
+    SERVER_HOST: str = Field(default="127.0.0.1", description="Endereço do servidor de jobs")
+    SERVER_PORT: int = Field(default=8080, description="Porta do servidor de jobs")
+    JOB_WORKERS: int = Field(default=4, description="Número de livros gerados simultaneamente pelo servidor")
+    JOB_QUEUE_MAX_SIZE: int = Field(default=1000, description="Número máximo de jobs aguardando na fila")
+    JOB_HISTORY_MAX_SIZE: int = Field(default=1000, description="Número máximo de jobs concluídos mantidos em memória pelo servidor")
+    JOB_HISTORY_TTL_SECONDS: int = Field(default=3600, description="Tempo em que um job concluído continua consultável no servidor")
     
     # Serper
     SERPER_API_KEY: str = Field(..., description="Serper API Key")
     
+    # Pesquisa compartilhada do livro
+    SHARED_RESEARCH_ENABLED: bool = Field(default=True, description="Executa uma pesquisa única por livro, compartilhada entre os capítulos")
+    RESEARCH_SOURCES_PER_CHAPTER: int = Field(default=5, description="Número máximo de fontes por capítulo na pesquisa compartilhada")
+    RESEARCH_SNIPPET_CHARS: int = Field(default=300, description="Tamanho máximo do resumo de cada fonte")
+    
+    # Backend de pesquisa
+    SEARCH_BACKEND: Literal["serper", "local"] = Field(default="serper", description="Backend de pesquisa dos agentes: serper (web) ou local (BM25 offline)")
+    LOCAL_SEARCH_CORPUS_DIRS: List[Path] = Field(default_factory=list, description="Diretórios do corpus indexado pela pesquisa local, além do OUTPUT_DIR")
+    LOCAL_SEARCH_INDEX_PATH: Path = Field(default_factory=lambda: Path(__file__).parent.parent.parent.parent / ".cache" / "local_search.db")
+    LOCAL_SEARCH_REFRESH_SECONDS: int = Field(default=60, description="Intervalo mínimo entre varreduras de novos arquivos para o índice local")
+    
+    # Cache de pesquisas
+    SEARCH_CACHE_DIR: Path = Field(default_factory=lambda: Path(__file__).parent.parent.parent.parent / ".cache" / "search")
+    SEARCH_CACHE_TTL: int = Field(default=7 * 24 * 3600, description="Validade das pesquisas em cache, em segundos")
+    SEARCH_CACHE_MAX_MB: int = Field(default=200, description="Tamanho máximo do cache de pesquisas em disco (MB)")
+    
+    # Cache de fragmentos HTML dos capítulos
+    HTML_CACHE_MAX_ENTRIES: int = Field(default=512, description="Fragmentos HTML de capítulos mantidos em memória")
+    HTML_CACHE_DIR: Optional[Path] = Field(default=None, description="Diretório do cache de fragmentos HTML em disco (None desativa)")
+    
+    # PDF
+    RENDER_PDF: bool = Field(default=True, description="Converte o livro salvo para PDF")
+    PDF_RENDER_WORKERS: int = Field(default=2, description="Número de processos que renderizam PDFs")
+    PDF_THEME: str = Field(default="padrao", description="Tema (folha de estilo) dos PDFs: padrao ou simples")
+    PDF_CHAPTER_CACHE_DIR: Optional[Path] = Field(default_factory=lambda: Path(__file__).parent.parent.parent.parent / ".cache" / "pdf_chapters", description="Diretório do cache de capítulos renderizados (None desativa)")
+    EXPORT_EPUB: bool = Field(default=True, description="Grava o EPUB do livro durante a geração, junto com o markdown")
+    PDF_CHAPTER_CACHE_MAX_MB: int = Field(default=500, description="Tamanho máximo do cache de capítulos renderizados (MB)")
+    
+    # Repositório de capítulos dos backups
+    CHAPTER_STORE_GC_GRACE_SECONDS: int = Field(default=3600, description="Idade mínima de um capítulo sem referências antes de ser removido do repositório")
+    
     # Configurações gerais
     DEFAULT_LANGUAGE: OutputLanguage = Field(default=OutputLanguage.PORTUGUESE, description="Linguagem padrão")
     
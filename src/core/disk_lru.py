@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class DiskLru:
+    """Índice em memória de um diretório de cache limitado por tamanho.
+
+    Registra o tamanho e o último acesso de cada arquivo e, quando o total
+    passa de ``max_bytes``, remove os menos recentemente usados. O índice é
+    montado a partir das datas de modificação, que ``touch`` renova a cada
+    acesso para que a ordem sobreviva a reinícios.
+    """
+
+    def __init__(self, cache_dir: Path, pattern: str, max_bytes: int, name: str = "Cache"):
+        """Inicializa o índice.
+
+        Args:
+            cache_dir: Diretório do cache
+            pattern: Padrão glob dos arquivos do cache (ex.: ``*/*.pdf``)
+            max_bytes: Tamanho máximo do cache em disco
+            name: Nome do cache nos logs
+        """
+        self.max_bytes = max_bytes
+        self.name = name
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # caminho -> (tamanho, último acesso)
+        self._index: Dict[Path, Tuple[int, float]] = {}
+        for path in Path(cache_dir).glob(pattern):
+            stat = path.stat()
+            self._index[path] = (stat.st_size, stat.st_mtime)
+
+    def touch(self, path: Path, size: Optional[int] = None) -> bool:
+        """Marca um arquivo como usado agora.
+
+        Com ``size``, registra o arquivo caso ainda não esteja no índice.
+
+        Returns:
+            False se o arquivo não existe mais (removido por outra thread ou
+            processo); o chamador deve tratar o acesso como ausência
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                self._index.pop(path, None)
+                return False
+            if size is None:
+                if path not in self._index:
+                    return True
+                size = self._index[path][0]
+            self._index[path] = (size, now)
+            return True
+
+    def add(self, path: Path, size: int) -> None:
+        """Registra um arquivo recém-gravado e aplica o limite de tamanho."""
+        with self._lock:
+            self._index[path] = (size, time.time())
+        self.evict()
+
+    def remove(self, path: Path) -> None:
+        with self._lock:
+            path.unlink(missing_ok=True)
+            self._index.pop(path, None)
+
+    def evict(self) -> int:
+        """Remove os arquivos menos usados até caber no limite."""
+        # Os arquivos são apagados com o lock para que ``touch`` não devolva
+        # ao índice uma entrada já escolhida para remoção
+        with self._lock:
+            total = sum(size for size, _ in self._index.values())
+            if total <= self.max_bytes:
+                return 0
+            victims = []
+            for path, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                victims.append(path)
+                total -= size
+            for path in victims:
+                self._index.pop(path, None)
+                path.unlink(missing_ok=True)
+            self.evictions += len(victims)
+        logger.debug(f"{self.name}: {len(victims)} entradas removidas")
+        return len(victims)
+
+    def usage(self) -> Tuple[int, int]:
+        """Retorna o número de entradas e o tamanho total em bytes."""
+        with self._lock:
+            return len(self._index), sum(size for size, _ in self._index.values())
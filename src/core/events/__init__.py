@@ -0,0 +1,56 @@
+"""Barramento de eventos de progresso da geração de livros."""
+
+from .bus import EventBus, Subscriber
+from .models import (
+    BookEvent,
+    ChapterFailed,
+    ChapterFinished,
+    ChapterReviewed,
+    ChapterStarted,
+    ChapterToken,
+    CoalescibleEvent,
+    DeadlineExceeded,
+    Degraded,
+    LlmRequest,
+    OutlineReady,
+    PdfRendered,
+    RunFailed,
+    RunStarted,
+    SaveDone,
+    StatusMessage
+)
+from .subscribers import (
+    CallbackSubscriber,
+    ConsoleRenderer,
+    JsonlSubscriber,
+    MetricsSubscriber,
+    WebhookSubscriber,
+    create_event_bus
+)
+
+__all__ = [
+    'BookEvent',
+    'CallbackSubscriber',
+    'ChapterFailed',
+    'ChapterFinished',
+    'ChapterReviewed',
+    'ChapterStarted',
+    'ChapterToken',
+    'CoalescibleEvent',
+    'ConsoleRenderer',
+    'DeadlineExceeded',
+    'Degraded',
+    'EventBus',
+    'JsonlSubscriber',
+    'LlmRequest',
+    'MetricsSubscriber',
+    'OutlineReady',
+    'PdfRendered',
+    'RunFailed',
+    'RunStarted',
+    'SaveDone',
+    'StatusMessage',
+    'Subscriber',
+    'WebhookSubscriber',
+    'create_event_bus'
+]
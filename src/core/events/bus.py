@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Hashable, Iterable, List, Optional
+
+from src.core.events.models import BookEvent
+
+logger = logging.getLogger(__name__)
+
+class Subscriber(ABC):
+    """Assinante assíncrono do barramento de eventos.
+
+    ``offer`` nunca bloqueia: o evento entra numa fila limitada consumida por
+    uma task própria. Eventos coalescíveis (como tokens de um capítulo) são
+    combinados com o pendente de mesma chave; com a fila cheia, os demais
+    eventos vão para ``overflow``, que por padrão os descarta.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        """Inicializa o assinante.
+
+        Args:
+            buffer_size: Eventos pendentes antes de começar a descartar
+        """
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self.coalesced = 0
+        self._queue: Deque[BookEvent] = deque()
+        self._pending: Dict[Hashable, BookEvent] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closing = False
+
+    def accepts(self, event: BookEvent) -> bool:
+        """Filtra os eventos recebidos pelo assinante."""
+        return True
+
+    @abstractmethod
+    async def handle(self, event: BookEvent) -> None:
+        """Processa um evento."""
+        pass
+
+    async def aclose_resources(self) -> None:
+        """Libera recursos do assinante depois que a fila é esvaziada."""
+        pass
+
+    def overflow(self, event: BookEvent) -> None:
+        """Trata um evento recebido com a fila cheia; por padrão o descarta."""
+        self.dropped += 1
+        logger.debug(f"{type(self).__name__}: evento {event.name} descartado (fila cheia)")
+
+    def offer(self, event: BookEvent) -> None:
+        """Enfileira um evento sem bloquear quem publica."""
+        key = event.coalesce_key()
+        if key is not None and key in self._pending:
+            self._pending[key].merge(event)
+            self.coalesced += 1
+            return
+        if len(self._queue) >= self.buffer_size:
+            self.overflow(event)
+            return
+        if key is not None:
+            # Cópia própria: o mesmo evento é entregue a vários assinantes
+            event = event.model_copy()
+            self._pending[key] = event
+        self._queue.append(event)
+        self._ensure_running()
+        self._wakeup.set()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._consume(), name=f"events-{type(self).__name__}")
+
+    async def _consume(self) -> None:
+        while True:
+            if not self._queue:
+                if self._closing:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            event = self._queue.popleft()
+            key = event.coalesce_key()
+            if key is not None and self._pending.get(key) is event:
+                del self._pending[key]
+            try:
+                await self.handle(event)
+            except Exception as e:
+                logger.warning(f"{type(self).__name__} falhou ao processar {event.name}: {str(e)}")
+
+    async def close(self) -> None:
+        """Processa os eventos pendentes e encerra a task do assinante."""
+        if self._task is not None and not self._task.done():
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+        await self.aclose_resources()
+
+class EventBus:
+    """Barramento de eventos de progresso com assinantes plugáveis.
+
+    ``publish`` é síncrono e apenas distribui o evento às filas dos
+    assinantes, então pode ser chamado no caminho crítico da geração.
+    """
+
+    def __init__(self, subscribers: Iterable[Subscriber] = ()):
+        self._subscribers: List[Subscriber] = list(subscribers)
+
+    @property
+    def subscribers(self) -> List[Subscriber]:
+        return list(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    async def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove o assinante depois de entregar os eventos pendentes."""
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+        await subscriber.close()
+
+    def publish(self, event: BookEvent) -> None:
+        for subscriber in self._subscribers:
+            if subscriber.accepts(event):
+                subscriber.offer(event)
+
+    async def aclose(self) -> None:
+        """Esvazia as filas de todos os assinantes.
+
+        Os assinantes continuam inscritos e voltam a consumir no próximo evento.
+        """
+        for subscriber in list(self._subscribers):
+            await subscriber.close()
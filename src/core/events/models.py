@@ -0,0 +1,138 @@
+import time
+from abc import abstractmethod
+from typing import Any, ClassVar, Dict, Hashable, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from src.models.book_models import ChapterOutline
+
+class BookEvent(BaseModel):
+    """Evento de progresso de uma execução do BookFlow."""
+    name: ClassVar[str] = "event"
+    run_id: str = ""
+    timestamp: float = Field(default_factory=time.time)
+
+    def payload(self) -> Dict[str, Any]:
+        """Dados específicos do evento, sem os campos comuns."""
+        return self.model_dump(exclude={"run_id", "timestamp"})
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.coalesce_key is not BookEvent.coalesce_key and not hasattr(cls, "merge"):
+            raise TypeError(f"{cls.__name__} define coalesce_key: herde de CoalescibleEvent e implemente merge")
+
+    def coalesce_key(self) -> Optional[Hashable]:
+        """Eventos comuns nunca são combinados (veja ``CoalescibleEvent``)."""
+        return None
+
+class CoalescibleEvent(BookEvent):
+    """Evento que, enquanto pendente, absorve os seguintes com a mesma chave.
+
+    Subclasses precisam implementar ``coalesce_key`` e ``merge``; a falta de
+    qualquer um é detectada na definição da classe.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        missing = [
+            name for name in ("coalesce_key", "merge")
+            if getattr(getattr(cls, name), "__isabstractmethod__", False)
+        ]
+        if missing:
+            raise TypeError(f"{cls.__name__} precisa implementar {', '.join(missing)}")
+
+    @abstractmethod
+    def coalesce_key(self) -> Hashable:
+        """Eventos pendentes com a mesma chave são combinados num só."""
+
+    @abstractmethod
+    def merge(self, other: "CoalescibleEvent") -> None:
+        """Incorpora um evento posterior com a mesma chave de coalescência."""
+
+class StatusMessage(BookEvent):
+    """Mensagem legível de andamento, exibida pelo console."""
+    name: ClassVar[str] = "status"
+    level: Literal["step", "info", "success", "warning", "error"] = "info"
+    message: str
+
+class RunStarted(BookEvent):
+    name: ClassVar[str] = "run_started"
+    topic: str
+    target_audience: str = ""
+    book_type: str = ""
+    model: str = ""
+    mode: Literal["generate", "regenerate"] = "generate"
+
+class OutlineReady(BookEvent):
+    name: ClassVar[str] = "outline_ready"
+    chapters: List[str]
+    outline: List[ChapterOutline] = []  # outline dos capítulos em ``chapters``, na mesma ordem
+    reused: int = 0
+    removed: int = 0
+
+class Degraded(BookEvent):
+    name: ClassVar[str] = "degraded"
+    degradations: List[str]
+    model: Optional[str] = None  # modelo de fallback, se houve troca
+
+class ChapterStarted(BookEvent):
+    name: ClassVar[str] = "chapter_started"
+    title: str
+    chapter_id: Optional[str] = None
+
+class ChapterToken(CoalescibleEvent):
+    """Trecho de texto recebido durante o streaming de um capítulo."""
+    name: ClassVar[str] = "chapter_token"
+    title: str
+    text: str
+
+    def coalesce_key(self) -> Hashable:
+        return (self.name, self.run_id, self.title)
+
+    def merge(self, other: "ChapterToken") -> None:
+        self.text += other.text
+        self.timestamp = other.timestamp
+
+class ChapterFinished(BookEvent):
+    name: ClassVar[str] = "chapter_finished"
+    title: str
+    chapter_id: Optional[str] = None
+    generation_time: Optional[float] = None
+
+class ChapterFailed(BookEvent):
+    name: ClassVar[str] = "chapter_failed"
+    title: str
+    chapter_id: Optional[str] = None
+    error: str
+
+class ChapterReviewed(BookEvent):
+    name: ClassVar[str] = "chapter_reviewed"
+    title: str
+    chapter_id: Optional[str] = None
+    review_time: float
+
+class LlmRequest(BookEvent):
+    """Métricas de uma requisição ao modelo de linguagem."""
+    name: ClassVar[str] = "llm_request"
+    title: str
+    chapter_id: Optional[str] = None
+    model: str
+    duration: float  # segundos
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+class SaveDone(BookEvent):
+    name: ClassVar[str] = "save_done"
+    output_path: Optional[str] = None
+
+class PdfRendered(BookEvent):
+    name: ClassVar[str] = "pdf_rendered"
+    output_path: str
+
+class RunFailed(BookEvent):
+    name: ClassVar[str] = "run_failed"
+    error: str
+
+class DeadlineExceeded(BookEvent):
+    name: ClassVar[str] = "deadline_exceeded"
@@ -0,0 +1,175 @@
+import inspect
+import json
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+import aiofiles
+from aiohttp import ClientSession, ClientTimeout
+
+from src.core.config.settings import settings
+from src.core.events.bus import EventBus, Subscriber
+from src.core.events.models import (
+    BookEvent, ChapterFailed, ChapterFinished, ChapterToken, RunFailed, RunStarted, StatusMessage
+)
+
+logger = logging.getLogger(__name__)
+
+class ConsoleRenderer(Subscriber):
+    """Exibe as mensagens de andamento no log, no formato do console."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, buffer_size: int = 1000):
+        super().__init__(buffer_size)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def accepts(self, event: BookEvent) -> bool:
+        return isinstance(event, StatusMessage)
+
+    async def handle(self, event: StatusMessage) -> None:
+        prefix = f"[{event.run_id}] " if event.run_id else ""
+        if event.level == "step":
+            self.logger.info(prefix + "=" * 50)
+            self.logger.info(f"{prefix}🔄 ETAPA: {event.message}")
+            self.logger.info(prefix + "=" * 50)
+        elif event.level == "success":
+            self.logger.info(f"{prefix}✅ {event.message}")
+        elif event.level == "warning":
+            self.logger.warning(f"{prefix}⚠️ {event.message}")
+        elif event.level == "error":
+            self.logger.error(f"{prefix}❌ {event.message}")
+        else:
+            self.logger.info(f"{prefix}📝 {event.message}")
+
+class JsonlSubscriber(Subscriber):
+    """Grava os eventos em um arquivo JSONL, um evento por linha."""
+
+    def __init__(
+        self,
+        path: Path,
+        exclude: Tuple[Type[BookEvent], ...] = (ChapterToken,),
+        buffer_size: int = 1000
+    ):
+        super().__init__(buffer_size)
+        self.path = Path(path)
+        self.exclude = exclude
+        self._file = None
+
+    def accepts(self, event: BookEvent) -> bool:
+        return not isinstance(event, self.exclude)
+
+    async def handle(self, event: BookEvent) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = await aiofiles.open(self.path, 'a', encoding='utf-8')
+        line = json.dumps(
+            {"event": event.name, "run_id": event.run_id, "timestamp": event.timestamp, **event.payload()},
+            ensure_ascii=False
+        )
+        await self._file.write(line + "\n")
+        if not self._queue:
+            await self._file.flush()
+
+    async def aclose_resources(self) -> None:
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+
+class MetricsSubscriber(Subscriber):
+    """Agrega contadores e tempos a partir dos eventos."""
+
+    def __init__(self, buffer_size: int = 1000):
+        super().__init__(buffer_size)
+        self.counts: Counter = Counter()
+        self.streamed_chars = 0
+        self.chapter_times: Dict[str, float] = {}
+        self.failures: Dict[str, str] = {}
+
+    def accepts(self, event: BookEvent) -> bool:
+        return not isinstance(event, StatusMessage)
+
+    async def handle(self, event: BookEvent) -> None:
+        self.counts[event.name] += 1
+        if isinstance(event, ChapterToken):
+            self.streamed_chars += len(event.text)
+        elif isinstance(event, ChapterFinished) and event.generation_time is not None:
+            self.chapter_times[f"{event.run_id}:{event.title}"] = event.generation_time
+        elif isinstance(event, ChapterFailed):
+            self.failures[f"{event.run_id}:{event.title}"] = event.error
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna as métricas agregadas até o momento."""
+        times = list(self.chapter_times.values())
+        return {
+            "runs_started": self.counts[RunStarted.name],
+            "runs_failed": self.counts[RunFailed.name],
+            "chapters_finished": self.counts[ChapterFinished.name],
+            "chapters_failed": self.counts[ChapterFailed.name],
+            "streamed_chars": self.streamed_chars,
+            "avg_chapter_time": sum(times) / len(times) if times else 0.0,
+            "dropped_events": self.dropped
+        }
+
+class WebhookSubscriber(Subscriber):
+    """Envia os eventos estruturados para um webhook HTTP."""
+
+    def __init__(self, url: str, timeout: float = 5.0, buffer_size: int = 100):
+        super().__init__(buffer_size)
+        self.url = url
+        self.timeout = timeout
+        self._session: Optional[ClientSession] = None
+
+    def accepts(self, event: BookEvent) -> bool:
+        return not isinstance(event, (StatusMessage, ChapterToken))
+
+    async def handle(self, event: BookEvent) -> None:
+        if self._session is None:
+            self._session = ClientSession(timeout=ClientTimeout(total=self.timeout))
+        payload = {"event": event.name, "run_id": event.run_id, "timestamp": event.timestamp, **event.payload()}
+        async with self._session.post(self.url, json=payload) as response:
+            if response.status >= 400:
+                logger.warning(f"Webhook respondeu {response.status} para o evento {event.name}")
+
+    async def aclose_resources(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+class CallbackSubscriber(Subscriber):
+    """Repassa os eventos estruturados de uma execução a um callback (evento, dados)."""
+
+    def __init__(
+        self,
+        callback: Callable[[str, Dict[str, Any]], Any],
+        run_id: str,
+        buffer_size: int = 1000
+    ):
+        super().__init__(buffer_size)
+        self.callback = callback
+        self.run_id = run_id
+
+    def accepts(self, event: BookEvent) -> bool:
+        return event.run_id == self.run_id and not isinstance(event, StatusMessage)
+
+    async def handle(self, event: BookEvent) -> None:
+        result = self.callback(event.name, {"run_id": event.run_id, **event.payload()})
+        if inspect.isawaitable(result):
+            await result
+
+def create_event_bus(console_logger: Optional[logging.Logger] = None) -> EventBus:
+    """Cria o barramento com os assinantes habilitados nas configurações.
+
+    Inclui o console, as métricas e, se configurados, o arquivo JSONL, o
+    webhook e o repositório SQLite de execuções.
+    """
+    buffer_size = settings.EVENT_SUBSCRIBER_BUFFER
+    bus = EventBus([ConsoleRenderer(console_logger, buffer_size), MetricsSubscriber(buffer_size)])
+    if settings.EVENTS_JSONL_PATH:
+        bus.subscribe(JsonlSubscriber(settings.EVENTS_JSONL_PATH, buffer_size=buffer_size))
+    if settings.EVENT_WEBHOOK_URL:
+        bus.subscribe(WebhookSubscriber(settings.EVENT_WEBHOOK_URL, settings.EVENT_WEBHOOK_TIMEOUT))
+    if settings.RUNS_DB_PATH:
+        # Import tardio: o repositório depende dos modelos deste pacote
+        from src.core.run_repository import RunRecorder, get_run_repository
+        bus.subscribe(RunRecorder(get_run_repository(), settings.RUNS_DB_BATCH_SIZE, buffer_size))
+    return bus
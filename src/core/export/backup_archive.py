@@ -0,0 +1,185 @@
+import asyncio
+import json
+import os
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.export.chapter_store import ChapterStore
+from src.models.book_models import BookState, Chapter
+
+INDEX_ENTRY = "index.json"
+STATE_ENTRY = "state.json"
+ARCHIVE_VERSION = 2
+
+class BackupArchiveWriter:
+    """Grava o backup de um livro num único arquivo zip.
+
+    Cada capítulo é uma entrada comprimida separadamente, gravada assim que
+    fica pronta; o estado (outline, métricas, pesquisa) e o índice dos
+    capítulos são escritos em ``commit``, quando o arquivo temporário é
+    renomeado sobre o destino.
+
+    Com um ``ChapterStore``, os textos vão para o repositório e o índice
+    guarda apenas seus digests.
+    """
+
+    def __init__(self, path: Path, keys: List[str], store: Optional[ChapterStore] = None):
+        """Inicializa o writer.
+
+        Args:
+            path: Arquivo zip de destino
+            keys: Identificadores dos capítulos, na ordem do livro
+            store: Repositório de textos dos capítulos (None grava os textos no zip)
+        """
+        self.path = Path(path)
+        self.store = store
+        self.committed = False
+        self._keys = list(keys)
+        self._known = set(self._keys)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> "BackupArchiveWriter":
+        """Cria o arquivo zip temporário (sem efeito se já aberto)."""
+        if self._zip is not None:
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = await asyncio.to_thread(
+            zipfile.ZipFile, self._tmp_path, 'w', zipfile.ZIP_DEFLATED
+        )
+        return self
+
+    async def add(self, key: str, chapter: Chapter) -> None:
+        """Comprime e grava um capítulo, em qualquer ordem."""
+        if key not in self._known:
+            raise ValueError(f"Capítulo desconhecido: {key}")
+        async with self._lock:
+            if key in self._entries:
+                raise ValueError(f"Capítulo já entregue: {key}")
+            item = {
+                "key": key,
+                "title": chapter.title,
+                "chapter_id": chapter.chapter_id,
+                "generation_time": chapter.generation_time
+            }
+            if self.store:
+                item["digest"] = await asyncio.to_thread(self.store.put, chapter.content)
+            else:
+                item["entry"] = f"chapters/{key}.md"
+                await asyncio.to_thread(self._zip.writestr, item["entry"], chapter.content)
+            self._entries[key] = item
+
+    async def commit(self, state: BookState) -> Path:
+        """Grava estado e índice e move o arquivo atomicamente para o destino."""
+        missing = [key for key in self._keys if key not in self._entries]
+        if missing:
+            raise RuntimeError(
+                f"Backup incompleto: {len(missing)} de {len(self._keys)} capítulos ausentes"
+            )
+        index = {
+            "version": ARCHIVE_VERSION,
+            "title": state.title,
+            "chapters": [self._entries[key] for key in self._keys]
+        }
+        async with self._lock:
+            await asyncio.to_thread(
+                self._finish,
+                state.model_dump_json(exclude={"book"}),
+                json.dumps(index, ensure_ascii=False)
+            )
+        os.replace(self._tmp_path, self.path)
+        self.committed = True
+        if self.store:
+            digests = [item["digest"] for item in index["chapters"]]
+            await asyncio.to_thread(self._release_previous, digests)
+        return self.path
+
+    def _release_previous(self, digests: List[str]) -> None:
+        """Passa a referenciar os textos deste backup e coleta os que o anterior deixou."""
+        self.store.set_refs(self.path.name, digests)
+        self.store.collect_garbage()
+
+    def _finish(self, state_json: str, index_json: str) -> None:
+        self._zip.writestr(STATE_ENTRY, state_json)
+        self._zip.writestr(INDEX_ENTRY, index_json)
+        self._zip.close()
+        self._zip = None
+
+    async def abort(self) -> None:
+        """Descarta o arquivo temporário, mantendo o backup anterior intacto."""
+        if self._zip is not None:
+            await asyncio.to_thread(self._zip.close)
+            self._zip = None
+        self._tmp_path.unlink(missing_ok=True)
+
+    async def __aenter__(self) -> "BackupArchiveWriter":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        if not self.committed:
+            await self.abort()
+        return None
+
+class BackupArchive:
+    """Leitura de um backup gravado por ``BackupArchiveWriter``.
+
+    Abrir o arquivo lê apenas o diretório do zip, então um capítulo pode ser
+    lido sem descomprimir os demais. Capítulos guardados por digest são lidos
+    do ``ChapterStore``.
+    """
+
+    def __init__(self, path: Path, store: Optional[ChapterStore] = None):
+        self.path = Path(path)
+        self.store = store
+        if not self.path.exists():
+            raise ValueError(f"Backup não encontrado: {self.path}")
+
+    def index(self) -> Dict[str, Any]:
+        """Retorna o índice dos capítulos do backup."""
+        with zipfile.ZipFile(self.path) as archive:
+            return json.loads(archive.read(INDEX_ENTRY))
+
+    def read_chapter(self, key: str) -> Chapter:
+        """Lê um único capítulo do backup."""
+        with zipfile.ZipFile(self.path) as archive:
+            index = json.loads(archive.read(INDEX_ENTRY))
+            for item in index["chapters"]:
+                if item["key"] == key:
+                    return self._chapter(archive, item)
+        raise ValueError(f"Capítulo não encontrado no backup: {key}")
+
+    def load_metadata(self) -> BookState:
+        """Lê o estado do livro sem os capítulos."""
+        with zipfile.ZipFile(self.path) as archive:
+            return BookState.model_validate_json(archive.read(STATE_ENTRY))
+
+    def iter_chapters(self) -> Iterator[Chapter]:
+        """Lê os capítulos um a um, na ordem do livro, sem carregar os demais."""
+        with zipfile.ZipFile(self.path) as archive:
+            index = json.loads(archive.read(INDEX_ENTRY))
+            for item in index["chapters"]:
+                yield self._chapter(archive, item)
+
+    def load_state(self) -> BookState:
+        """Reconstrói o estado completo do livro."""
+        state = self.load_metadata()
+        state.book = list(self.iter_chapters())
+        return state
+
+    def _chapter(self, archive: zipfile.ZipFile, item: Dict[str, Any]) -> Chapter:
+        if "digest" in item:
+            if self.store is None:
+                raise ValueError(f"Backup {self.path} requer o repositório de capítulos")
+            content = self.store.get(item["digest"])
+        else:
+            content = archive.read(item["entry"]).decode("utf-8")
+        return Chapter(
+            title=item["title"],
+            content=content,
+            generation_time=item["generation_time"],
+            chapter_id=item["chapter_id"]
+        )
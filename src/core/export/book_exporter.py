@@ -1,72 +1,148 @@
+import asyncio
+import time
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from pydantic import BaseModel
 from src.models.book_models import BookState
-import markdown
-import weasyprint
-import ebooklib
-from ebooklib import epub
+from src.core.export.epub_writer import EpubBuilder
+from src.core.export.html_cache import HtmlFragmentCache, get_html_cache
+from src.core.export.pdf_cache import PdfPartCache, get_pdf_cache
+from src.core.export.pdf_renderer import html_document, render_book_parallel
+from src.core.export.process_pool import get_process_pool
+from src.core.export import themes
+
+MARKDOWN_TEMPLATE = """# {title}
+
+{content}
+"""
+
+EXPORT_FORMATS = {"md": ".md", "pdf": ".pdf", "epub": ".epub"}
+PROCESS_FORMATS = {"pdf"}  # formatos CPU-bound, renderizados no pool de processos
+
+class ExportChapter(BaseModel):
+    """Capítulo já preparado para os formatos de saída."""
+    title: str
+    markdown: str
+    html: str
+    file_name: str
+
+class ExportDocument(BaseModel):
+    """Representação intermediária do livro, montada uma vez e usada por todos os formatos."""
+    title: str
+    language: str
+    theme: str  # tema dos PDFs
+    chapters: List[ExportChapter]
+
+    @property
+    def toc(self) -> List[Tuple[str, str]]:
+        """Pares (título, arquivo) na ordem do livro."""
+        return [(chapter.title, chapter.file_name) for chapter in self.chapters]
+
+class ExportReport(BaseModel):
+    """Resultado de ``export_all``: arquivos gerados e tempo de cada formato."""
+    paths: Dict[str, str]
+    timings: Dict[str, float]  # formato -> segundos
+    total_time: float
+
+def write_markdown(document: ExportDocument, output_file: Path, template: str = None) -> None:
+    """Grava o livro em markdown"""
+    markdown_content = (template or MARKDOWN_TEMPLATE).format(
+        title=document.title,
+        content="\n\n".join(chapter.markdown for chapter in document.chapters)
+    )
+    Path(output_file).write_text(markdown_content, encoding='utf-8')
+
+def write_pdf(document: ExportDocument, output_file: Path) -> None:
+    """Renderiza o livro num único PDF"""
+    body = f"<h1>{document.title}</h1>" + "".join(chapter.html for chapter in document.chapters)
+    themes.write_pdf(html_document(body, document.title), str(output_file), document.theme)
+
+def write_epub(document: ExportDocument, output_file: Path) -> None:
+    """Grava o livro em EPUB, capítulo a capítulo"""
+    keys = [chapter.file_name for chapter in document.chapters]
+    with EpubBuilder(output_file, document.title, keys, document.language) as builder:
+        for chapter in document.chapters:
+            builder.add(chapter.file_name, chapter.title, chapter.html)
+        builder.commit()
+
+FORMAT_WRITERS = {"md": write_markdown, "pdf": write_pdf, "epub": write_epub}
 
 class BookExporter:
     """Classe responsável por exportar o livro em diferentes formatos"""
 
-    def __init__(self, book_state: BookState):
-        """Inicializa o exportador com o estado do livro"""
+    def __init__(
+        self,
+        book_state: BookState,
+        html_cache: Optional[HtmlFragmentCache] = None,
+        theme: Optional[str] = None,
+        pdf_cache: Optional[PdfPartCache] = None
+    ):
+        """Inicializa o exportador com o estado do livro
+
+        O HTML de cada capítulo vem do cache de fragmentos, compartilhado
+        entre os formatos: exportar PDF e EPUB converte cada capítulo uma vez.
+        O tema dos PDFs é ``theme`` ou, se omitido, PDF_THEME. Os PDFs dos
+        capítulos ficam em ``pdf_cache`` (padrão: PDF_CHAPTER_CACHE_DIR).
+        """
         if not book_state:
             raise ValueError("Estado do livro não pode ser nulo")
         if not book_state.title or not book_state.book:
             raise ValueError("Livro deve ter título e pelo menos um capítulo")
         self.book_state = book_state
+        self.html_cache = html_cache or get_html_cache()
+        self.theme = themes.get_theme(theme).name
+        self.pdf_cache = pdf_cache or get_pdf_cache()
+        self._document: Optional[ExportDocument] = None
+
+    def build_document(self) -> ExportDocument:
+        """Monta a representação intermediária do livro, uma vez por exportador"""
+        if self._document is None:
+            self._document = ExportDocument(
+                title=self.book_state.title,
+                language=self.book_state.language.value,
+                theme=self.theme,
+                chapters=[
+                    ExportChapter(
+                        title=chapter.title,
+                        markdown=chapter.content,
+                        html=self.html_cache.render(chapter.content),
+                        file_name=EpubBuilder.file_name(i)
+                    )
+                    for i, chapter in enumerate(self.book_state.book)
+                ]
+            )
+        return self._document
 
     def export_markdown(self, output_file: Path, template: str = None) -> None:
         """Exporta o livro para markdown"""
         if not output_file:
             raise ValueError("Caminho de saída não pode ser vazio")
+        write_markdown(self.build_document(), output_file, template)
 
-        # Usar template padrão se nenhum for fornecido
-        if not template:
-            template = """# {title}
-
-{content}
-"""
-
-        # Gerar conteúdo
-        content = []
-        for chapter in self.book_state.book:
-            content.append(chapter.content)
-
-        # Aplicar template
-        markdown_content = template.format(
-            title=self.book_state.title,
-            content="\n\n".join(content)
-        )
+    def export_pdf(self, output_file: Path, parallel: bool = False, workers: Optional[int] = None) -> None:
+        """Exporta o livro para PDF
 
-        # Salvar arquivo
-        output_file.write_text(markdown_content, encoding='utf-8')
-
-    def export_pdf(self, output_file: Path) -> None:
-        """Exporta o livro para PDF"""
+        Com ``parallel``, cada capítulo é renderizado num processo separado e
+        as partes são unidas com sumário, marcadores e numeração contínua.
+        Os capítulos renderizados ficam em cache: numa reexportação, só os
+        alterados são renderizados de novo.
+        """
         if not output_file:
             raise ValueError("Caminho de saída não pode ser vazio")
 
-        # Converter markdown para HTML
-        html_content = f"""
-        <html>
-        <head>
-            <title>{self.book_state.title}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                h1 {{ color: #333; }}
-                h2 {{ color: #666; }}
-            </style>
-        </head>
-        <body>
-            <h1>{self.book_state.title}</h1>
-            {"".join(markdown.markdown(chapter.content) for chapter in self.book_state.book)}
-        </body>
-        </html>
-        """
+        document = self.build_document()
+        if parallel:
+            pdf = render_book_parallel(
+                document.title,
+                [(chapter.title, chapter.html) for chapter in document.chapters],
+                theme=document.theme,
+                workers=workers,
+                cache=self.pdf_cache
+            )
+            Path(output_file).write_bytes(pdf)
+            return
 
-        # Gerar PDF
-        weasyprint.HTML(string=html_content).write_pdf(str(output_file))
+        write_pdf(document, output_file)
 
     def export_epub(self, output_file: Path) -> None:
         """Exporta o livro para EPUB"""
@@ -74,30 +150,56 @@ class BookExporter:
             raise ValueError("Caminho de saída não pode ser vazio")
         if not str(output_file).endswith('.epub'):
             raise ValueError("Arquivo de saída deve ter extensão .epub")
-
-        # Criar livro EPUB
-        book = epub.EpubBook()
-        book.set_title(self.book_state.title)
-        book.set_language(self.book_state.output_language)
-
-        # Adicionar capítulos
-        chapters = []
-        for i, chapter in enumerate(self.book_state.book, 1):
-            epub_chapter = epub.EpubHtml(
-                title=chapter.title,
-                file_name=f'chapter_{i}.xhtml',
-                content=markdown.markdown(chapter.content)
-            )
-            book.add_item(epub_chapter)
-            chapters.append(epub_chapter)
-
-        # Adicionar navegação
-        book.toc = [(epub.Section('Chapters'), chapters)]
-        book.add_item(epub.EpubNcx())
-        book.add_item(epub.EpubNav())
-
-        # Gerar spine
-        book.spine = ['nav'] + chapters
-
-        # Salvar arquivo
-        epub.write_epub(str(output_file), book) 
\ No newline at end of file
+        write_epub(self.build_document(), output_file)
+
+    async def export_all(
+        self,
+        output_base: Path,
+        formats: Sequence[str] = tuple(EXPORT_FORMATS),
+        workers: Optional[int] = None
+    ) -> ExportReport:
+        """Exporta o livro em vários formatos ao mesmo tempo
+
+        A representação intermediária é montada uma única vez; os formatos
+        CPU-bound são renderizados no pool de processos compartilhado e os
+        demais em threads, todos em paralelo.
+
+        Args:
+            output_base: Caminho de saída sem extensão (ex.: output/livro)
+            formats: Formatos desejados, entre as chaves de ``EXPORT_FORMATS``
+            workers: Processos do pool (padrão: PDF_RENDER_WORKERS)
+        """
+        if not output_base:
+            raise ValueError("Caminho de saída não pode ser vazio")
+        unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Formatos não suportados: {', '.join(unknown)}")
+
+        start = time.perf_counter()
+        output_base = Path(output_base)
+        output_base.parent.mkdir(parents=True, exist_ok=True)
+        document = self.build_document()
+        paths = {fmt: output_base.with_name(output_base.name + EXPORT_FORMATS[fmt]) for fmt in formats}
+        timings: Dict[str, float] = {}
+
+        process_formats = [fmt for fmt in formats if fmt in PROCESS_FORMATS]
+        executor = get_process_pool(workers) if process_formats else None
+        loop = asyncio.get_running_loop()
+
+        async def export(fmt: str) -> None:
+            fmt_start = time.perf_counter()
+            if fmt in PROCESS_FORMATS:
+                await loop.run_in_executor(executor, FORMAT_WRITERS[fmt], document, paths[fmt])
+            else:
+                await asyncio.to_thread(FORMAT_WRITERS[fmt], document, paths[fmt])
+            timings[fmt] = time.perf_counter() - fmt_start
+
+        async with asyncio.TaskGroup() as tg:
+            for fmt in dict.fromkeys(formats):
+                tg.create_task(export(fmt))
+
+        return ExportReport(
+            paths={fmt: str(path) for fmt, path in paths.items()},
+            timings=timings,
+            total_time=time.perf_counter() - start
+        )
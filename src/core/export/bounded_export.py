@@ -0,0 +1,226 @@
+import gc
+import itertools
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from src.core.export.backup_archive import BackupArchive
+from src.core.export.book_exporter import EXPORT_FORMATS
+from src.core.export.epub_writer import EpubBuilder
+from src.core.export.html_cache import convert_markdown
+from src.core.export.pdf_renderer import (
+    count_pages,
+    html_document,
+    merge_pdf_parts,
+    page_number_documents,
+    render_front_matter,
+    render_html_to_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+def current_rss() -> int:
+    """Memória residente atual do processo, em bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()
+
+def peak_rss() -> int:
+    """Maior memória residente do processo até agora, em bytes."""
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+class PhaseMemory(BaseModel):
+    """Tempo e memória de uma etapa da exportação."""
+    phase: str
+    seconds: float
+    traced_peak_bytes: Optional[int] = None  # pico de alocações Python (tracemalloc)
+    rss_bytes: int  # memória residente ao fim da etapa
+    rss_peak_bytes: int  # maior memória residente do processo até o fim da etapa
+
+class MemoryProfiler:
+    """Mede tempo, pico do tracemalloc e RSS de cada etapa.
+
+    O tracemalloc deixa as alocações mais lentas; com ``trace=False`` só o
+    tempo e o RSS são registrados.
+    """
+
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self.phases: List[PhaseMemory] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = self.trace and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        if self.trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            traced_peak = tracemalloc.get_traced_memory()[1] if self.trace else None
+            if started:
+                tracemalloc.stop()
+            phase = PhaseMemory(
+                phase=name,
+                seconds=time.perf_counter() - start,
+                traced_peak_bytes=traced_peak,
+                rss_bytes=current_rss(),
+                rss_peak_bytes=peak_rss()
+            )
+            self.phases.append(phase)
+            logger.debug(
+                f"Exportação '{name}': {phase.seconds:.2f}s, "
+                f"pico rastreado {(traced_peak or 0) / 1024 / 1024:.1f} MB, "
+                f"RSS {phase.rss_bytes / 1024 / 1024:.1f} MB"
+            )
+
+class BoundedExportReport(BaseModel):
+    """Resultado de ``BoundedExporter.export``: arquivos gerados e medidas por etapa."""
+    paths: Dict[str, str]
+    phases: List[PhaseMemory]
+
+class BoundedExporter:
+    """Exporta um livro a partir do backup, com memória independente do tamanho.
+
+    Os capítulos são lidos um a um do zip (ou do repositório de capítulos) e
+    gravados assim que convertidos; nenhum formato monta o livro inteiro em
+    memória. No PDF, cada capítulo é renderizado para um arquivo temporário,
+    numerado à parte e gravado no PDF final sem montar o documento; só o
+    sumário conhece o livro todo.
+    """
+
+    def __init__(
+        self,
+        archive: BackupArchive,
+        theme: Optional[str] = None,
+        render: Callable[[str, Optional[str]], bytes] = render_html_to_pdf,
+        profiler: Optional[MemoryProfiler] = None
+    ):
+        """Inicializa o exportador.
+
+        Args:
+            archive: Backup do livro
+            theme: Tema dos PDFs (padrão: PDF_THEME)
+            render: Função que converte um documento HTML em PDF com o tema
+            profiler: Medidor das etapas (padrão: com tracemalloc)
+        """
+        self.archive = archive
+        self.theme = theme
+        self.render = render
+        self.profiler = profiler or MemoryProfiler()
+        self._title: Optional[str] = None
+        self._language: Optional[str] = None
+
+    def _metadata(self) -> Tuple[str, str]:
+        if self._title is None:
+            state = self.archive.load_metadata()
+            self._title, self._language = state.title, state.language.value
+        return self._title, self._language
+
+    @staticmethod
+    def _tmp_path(output_file: Path) -> Path:
+        return output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+    def export_markdown(self, output_file: Path) -> Path:
+        """Grava o markdown do livro capítulo a capítulo"""
+        title, _ = self._metadata()
+        output_file = Path(output_file)
+        tmp_path = self._tmp_path(output_file)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f"# {title}\n\n")
+                for idx, chapter in enumerate(self.archive.iter_chapters()):
+                    if idx:
+                        f.write("\n\n")
+                    f.write(chapter.content)
+                f.write("\n")
+            os.replace(tmp_path, output_file)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return output_file
+
+    def export_epub(self, output_file: Path) -> Path:
+        """Grava o EPUB do livro capítulo a capítulo"""
+        title, language = self._metadata()
+        keys = [str(idx) for idx in range(len(self.archive.index()["chapters"]))]
+        with EpubBuilder(output_file, title, keys, language) as builder:
+            for key, chapter in zip(keys, self.archive.iter_chapters()):
+                builder.add(key, chapter.title, convert_markdown(chapter.content))
+            return builder.commit()
+
+    def export_pdf(self, output_file: Path) -> Path:
+        """Renderiza o PDF do livro um capítulo por vez, unindo as partes do disco"""
+        title, _ = self._metadata()
+        output_file = Path(output_file)
+        render = lambda document: self.render(document, self.theme)
+        with tempfile.TemporaryDirectory(dir=output_file.parent, prefix=".pdf-parts-") as work_dir:
+            part_path = lambda idx: Path(work_dir) / f"{idx:05d}.pdf"
+            chapter_pages: List[Tuple[str, int]] = []
+            with self.profiler.phase("pdf:capitulos"):
+                for idx, chapter in enumerate(self.archive.iter_chapters()):
+                    pdf = render(html_document(convert_markdown(chapter.content), chapter.title))
+                    part_path(idx).write_bytes(pdf)
+                    chapter_pages.append((chapter.title, count_pages(pdf)))
+                    del pdf
+                    # O documento renderizado e o leitor do pypdf formam ciclos de
+                    # referência; coletá-los aqui evita que se acumulem até a
+                    # próxima coleta automática
+                    gc.collect(1)
+
+            with self.profiler.phase("pdf:montagem"):
+                front_pdf, front_pages = render_front_matter(title, chapter_pages, render)
+                # A numeração de cada parte é renderizada só quando a parte é gravada
+                part_pages = [front_pages] + [pages for _, pages in chapter_pages]
+                overlays = (render(document) for document in page_number_documents(part_pages))
+                parts = itertools.chain(
+                    [(None, front_pdf)],
+                    ((chapter, part_path(idx)) for idx, (chapter, _) in enumerate(chapter_pages))
+                )
+                tmp_path = self._tmp_path(output_file)
+                try:
+                    merge_pdf_parts(parts, output_file=tmp_path, overlays=overlays)
+                    os.replace(tmp_path, output_file)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+        return output_file
+
+    def export(self, output_base: Path, formats: Sequence[str] = tuple(EXPORT_FORMATS)) -> BoundedExportReport:
+        """Exporta o livro nos formatos pedidos, um de cada vez
+
+        Args:
+            output_base: Caminho de saída sem extensão (ex.: output/export/livro)
+            formats: Formatos desejados, entre as chaves de ``EXPORT_FORMATS``
+        """
+        unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Formatos não suportados: {', '.join(unknown)}")
+        output_base = Path(output_base)
+        output_base.parent.mkdir(parents=True, exist_ok=True)
+        exporters = {"md": self.export_markdown, "pdf": self.export_pdf, "epub": self.export_epub}
+
+        paths = {}
+        for fmt in dict.fromkeys(formats):
+            output_file = output_base.with_name(output_base.name + EXPORT_FORMATS[fmt])
+            if fmt == "pdf":
+                # O PDF mede suas etapas internamente
+                paths[fmt] = str(exporters[fmt](output_file))
+                continue
+            with self.profiler.phase(fmt):
+                paths[fmt] = str(exporters[fmt](output_file))
+        return BoundedExportReport(paths=paths, phases=self.profiler.phases)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS refs (
+    name TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (name, digest)
+);
+CREATE INDEX IF NOT EXISTS idx_refs_digest ON refs (digest);
+CREATE TABLE IF NOT EXISTS released (
+    digest TEXT PRIMARY KEY
+);
+"""
+
+class ChapterStore:
+    """Repositório de textos de capítulos endereçado pelo conteúdo.
+
+    Cada texto é gravado uma única vez, comprimido com zlib, num arquivo
+    nomeado pelo seu sha256. Os backups registram os digests que usam e a
+    contagem de referências decide o que a coleta de lixo pode remover;
+    gravar de novo um texto já armazenado não escreve nada.
+    """
+
+    def __init__(self, root: Path, grace_seconds: float = 3600):
+        """Inicializa o repositório.
+
+        Args:
+            root: Diretório do repositório
+            grace_seconds: Idade mínima de um texto sem referências antes de ser removido
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.grace_seconds = grace_seconds
+        # As referências ficam num banco SQLite para que instâncias e processos
+        # distintos atualizem as contagens sem sobrescrever umas às outras
+        self._db_path = self.root / "refs.db"
+        self._legacy_refs_path = self.root / "refs.json"
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._migrate_legacy_refs()
+
+    @staticmethod
+    def digest(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, content: str) -> str:
+        """Armazena um texto e retorna seu digest."""
+        digest = self.digest(content)
+        path = self._path(digest)
+        try:
+            # Renova a data para que a coleta não remova um texto recém-usado
+            os.utime(path)
+            return digest
+        except FileNotFoundError:
+            # Ausente ou removido pela coleta agora há pouco: grava de novo
+            pass
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(zlib.compress(content.encode("utf-8")))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Lê um texto pelo digest."""
+        try:
+            data = self._path(digest).read_bytes()
+        except FileNotFoundError:
+            raise ValueError(f"Texto não encontrado no repositório: {digest}")
+        return zlib.decompress(data).decode("utf-8")
+
+    def refcount(self, digest: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM refs WHERE digest = ?", (digest,)).fetchone()[0]
+
+    def set_refs(self, name: str, digests: Iterable[str]) -> None:
+        """Substitui as referências de um backup."""
+        current = set(digests)
+        with self._transaction() as conn:
+            previous = {row[0] for row in conn.execute("SELECT digest FROM refs WHERE name = ?", (name,))}
+            conn.executemany(
+                "DELETE FROM refs WHERE name = ? AND digest = ?",
+                [(name, digest) for digest in previous - current]
+            )
+            conn.executemany(
+                "INSERT INTO refs (name, digest) VALUES (?, ?)",
+                [(name, digest) for digest in current - previous]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO released (digest) "
+                "SELECT ? WHERE NOT EXISTS (SELECT 1 FROM refs WHERE digest = ?)",
+                [(digest, digest) for digest in previous - current]
+            )
+            conn.executemany("DELETE FROM released WHERE digest = ?", [(digest,) for digest in current])
+
+    def collect_garbage(self, full: bool = False) -> int:
+        """Remove textos sem referências mais antigos que o período de carência.
+
+        Por padrão verifica apenas os textos liberados por ``set_refs``; com
+        ``full`` percorre todo o repositório, incluindo textos de execuções
+        interrompidas antes de registrar suas referências.
+        """
+        cutoff = time.time() - self.grace_seconds
+        removed = 0
+        # A transação de escrita bloqueia ``set_refs`` de outras instâncias e
+        # processos enquanto os textos são verificados e removidos
+        with self._transaction() as conn:
+            if full:
+                candidates = {
+                    path.parent.name + path.name
+                    for path in self.objects_dir.glob("*/*")
+                    if not path.name.startswith(".")
+                }
+            else:
+                candidates = {row[0] for row in conn.execute("SELECT digest FROM released")}
+            for digest in candidates:
+                referenced = conn.execute("SELECT 1 FROM refs WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+                if not referenced:
+                    path = self._path(digest)
+                    try:
+                        if path.stat().st_mtime > cutoff:
+                            continue
+                        path.unlink()
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                conn.execute("DELETE FROM released WHERE digest = ?", (digest,))
+        if removed:
+            logger.debug(f"Repositório de capítulos: {removed} textos removidos")
+        return removed
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        return closing(sqlite3.connect(self._db_path, timeout=30, isolation_level=None))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma transação de escrita exclusiva entre instâncias e processos."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _migrate_legacy_refs(self) -> None:
+        """Importa as referências do antigo refs.json para o banco."""
+        if not self._legacy_refs_path.exists():
+            return
+        data = json.loads(self._legacy_refs_path.read_text(encoding="utf-8"))
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO refs (name, digest) VALUES (?, ?)",
+                [(name, digest) for name, digests in data.get("refs", {}).items() for digest in digests]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO released (digest) VALUES (?)",
+                [(digest,) for digest in data.get("released", [])]
+            )
+        self._legacy_refs_path.unlink(missing_ok=True)
+        logger.info("Referências do repositório de capítulos migradas de refs.json")
@@ -0,0 +1,222 @@
+import asyncio
+import html
+import os
+import threading
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.export.html_cache import HtmlFragmentCache, get_html_cache
+from src.models.book_models import Chapter
+
+CONTAINER_XML = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="EPUB/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+class EpubBuilder:
+    """Monta um EPUB 3 diretamente no zip, um capítulo por vez.
+
+    O ``mimetype`` e o ``container.xml`` são gravados na abertura e o XHTML
+    de cada capítulo assim que ele é entregue, em qualquer ordem; só os
+    títulos ficam em memória. Pacote (OPF), navegação e NCX são escritos em
+    ``commit``, quando o arquivo temporário é renomeado sobre o destino.
+    """
+
+    def __init__(self, path: Path, title: str, keys: List[str], language: str = "pt-BR"):
+        """Inicializa o builder.
+
+        Args:
+            path: Arquivo EPUB de destino
+            title: Título do livro
+            keys: Identificadores dos capítulos, na ordem do livro
+            language: Idioma do livro (código BCP 47)
+        """
+        self.path = Path(path)
+        self.title = title
+        self.language = language
+        self.committed = False
+        self._keys = list(keys)
+        self._positions: Dict[str, int] = {key: idx for idx, key in enumerate(self._keys)}
+        self._titles: Dict[str, str] = {}
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        self._lock = threading.Lock()
+
+    def open(self) -> "EpubBuilder":
+        """Cria o zip temporário com os arquivos fixos do contêiner."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_DEFLATED)
+        # O mimetype precisa ser a primeira entrada, sem compressão
+        self._zip.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        self._zip.writestr("META-INF/container.xml", CONTAINER_XML)
+        return self
+
+    @staticmethod
+    def file_name(position: int) -> str:
+        return f"chapter_{position + 1}.xhtml"
+
+    def add(self, key: str, title: str, body: str) -> None:
+        """Grava o XHTML de um capítulo a partir do seu fragmento HTML."""
+        if key not in self._positions:
+            raise ValueError(f"Capítulo desconhecido: {key}")
+        with self._lock:
+            if key in self._titles:
+                raise ValueError(f"Capítulo já entregue: {key}")
+            self._zip.writestr(
+                f"EPUB/{self.file_name(self._positions[key])}",
+                self._xhtml(title, body)
+            )
+            self._titles[key] = title
+
+    def commit(self) -> Path:
+        """Grava pacote, navegação e NCX e move o EPUB atomicamente para o destino."""
+        missing = [key for key in self._keys if key not in self._titles]
+        if missing:
+            raise RuntimeError(
+                f"EPUB incompleto: {len(missing)} de {len(self._keys)} capítulos ausentes"
+            )
+        book_id = f"urn:uuid:{uuid.uuid4()}"
+        chapters = [(self.file_name(idx), self._titles[key]) for idx, key in enumerate(self._keys)]
+        with self._lock:
+            self._zip.writestr("EPUB/content.opf", self._package(book_id, chapters))
+            self._zip.writestr("EPUB/nav.xhtml", self._nav(chapters))
+            self._zip.writestr("EPUB/toc.ncx", self._ncx(book_id, chapters))
+            self._zip.close()
+            self._zip = None
+        os.replace(self._tmp_path, self.path)
+        self.committed = True
+        return self.path
+
+    def abort(self) -> None:
+        """Descarta o arquivo temporário."""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "EpubBuilder":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        if not self.committed:
+            self.abort()
+        return None
+
+    def _xhtml(self, title: str, body: str) -> str:
+        lang = html.escape(self.language)
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+            f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            f'lang="{lang}" xml:lang="{lang}">\n'
+            f'<head><meta charset="utf-8"/><title>{html.escape(title)}</title></head>\n'
+            f'<body>\n{body}\n</body>\n</html>\n'
+        )
+
+    def _package(self, book_id: str, chapters: List[Tuple[str, str]]) -> str:
+        modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        manifest = "".join(
+            f'    <item id="chapter_{idx}" href="{name}" media-type="application/xhtml+xml"/>\n'
+            for idx, (name, _) in enumerate(chapters, 1)
+        )
+        spine = "".join(f'    <itemref idref="chapter_{idx}"/>\n' for idx in range(1, len(chapters) + 1))
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'    <dc:identifier id="book-id">{book_id}</dc:identifier>\n'
+            f'    <dc:title>{html.escape(self.title)}</dc:title>\n'
+            f'    <dc:language>{html.escape(self.language)}</dc:language>\n'
+            f'    <meta property="dcterms:modified">{modified}</meta>\n'
+            '  </metadata>\n'
+            '  <manifest>\n'
+            '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            '    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>\n'
+            f'{manifest}'
+            '  </manifest>\n'
+            '  <spine toc="ncx">\n'
+            '    <itemref idref="nav"/>\n'
+            f'{spine}'
+            '  </spine>\n'
+            '</package>\n'
+        )
+
+    def _nav(self, chapters: List[Tuple[str, str]]) -> str:
+        items = "".join(
+            f'<li><a href="{name}">{html.escape(title)}</a></li>' for name, title in chapters
+        )
+        return self._xhtml(
+            self.title,
+            f'<nav epub:type="toc" id="toc"><h1>{html.escape(self.title)}</h1><ol>{items}</ol></nav>'
+        )
+
+    def _ncx(self, book_id: str, chapters: List[Tuple[str, str]]) -> str:
+        points = "".join(
+            f'    <navPoint id="navpoint-{idx}" playOrder="{idx}">'
+            f'<navLabel><text>{html.escape(title)}</text></navLabel><content src="{name}"/></navPoint>\n'
+            for idx, (name, title) in enumerate(chapters, 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            f'  <head><meta name="dtb:uid" content="{book_id}"/></head>\n'
+            f'  <docTitle><text>{html.escape(self.title)}</text></docTitle>\n'
+            f'  <navMap>\n{points}  </navMap>\n'
+            '</ncx>\n'
+        )
+
+class StreamingEpubWriter:
+    """Grava o EPUB do livro durante a geração, à medida que os capítulos ficam prontos.
+
+    Versão assíncrona do ``EpubBuilder``: a conversão para HTML (pelo cache
+    de fragmentos) e a escrita no zip rodam fora do event loop.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        title: str,
+        keys: List[str],
+        language: str = "pt-BR",
+        html_cache: Optional[HtmlFragmentCache] = None
+    ):
+        self.builder = EpubBuilder(path, title, keys, language)
+        self.html_cache = html_cache or get_html_cache()
+
+    @property
+    def path(self) -> Path:
+        return self.builder.path
+
+    @property
+    def committed(self) -> bool:
+        return self.builder.committed
+
+    async def open(self) -> "StreamingEpubWriter":
+        await asyncio.to_thread(self.builder.open)
+        return self
+
+    async def add(self, key: str, chapter: Chapter) -> None:
+        """Converte e grava um capítulo, em qualquer ordem."""
+        await asyncio.to_thread(
+            lambda: self.builder.add(key, chapter.title, self.html_cache.render(chapter.content))
+        )
+
+    async def commit(self) -> Path:
+        return await asyncio.to_thread(self.builder.commit)
+
+    async def abort(self) -> None:
+        await asyncio.to_thread(self.builder.abort)
+
+    async def __aenter__(self) -> "StreamingEpubWriter":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        if not self.committed:
+            await self.abort()
+        return None
@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import markdown
+from pydantic import BaseModel
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_engines = threading.local()
+
+def convert_markdown(text: str, extensions: Sequence[str] = ()) -> str:
+    """Converte markdown em HTML reutilizando a instância configurada da thread.
+
+    Criar um ``markdown.Markdown`` carrega e configura as extensões a cada
+    chamada; aqui cada thread mantém uma instância por conjunto de extensões
+    e apenas a reinicia entre conversões.
+    """
+    key = tuple(extensions)
+    engines: Dict[Tuple[str, ...], markdown.Markdown] = getattr(_engines, "by_extensions", None)
+    if engines is None:
+        engines = _engines.by_extensions = {}
+    engine = engines.get(key)
+    if engine is None:
+        engine = engines[key] = markdown.Markdown(extensions=list(key))
+    return engine.reset().convert(text)
+
+class HtmlCacheMetrics(BaseModel):
+    """Métricas de uso do cache de fragmentos HTML."""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+class HtmlFragmentCache:
+    """Cache dos fragmentos HTML dos capítulos, compartilhado entre os formatos.
+
+    A chave é o hash do conteúdo markdown e do conjunto de extensões. As
+    entradas ficam num LRU em memória e, se houver diretório configurado,
+    também em disco, de onde são promovidas de volta à memória.
+    """
+
+    def __init__(self, max_entries: int = 512, cache_dir: Optional[Path] = None):
+        """Inicializa o cache.
+
+        Args:
+            max_entries: Fragmentos mantidos em memória
+            cache_dir: Diretório do nível em disco (None desativa)
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._metrics = HtmlCacheMetrics()
+
+    @staticmethod
+    def make_key(content: str, extensions: Sequence[str] = ()) -> str:
+        digest = hashlib.sha256("\0".join(extensions).encode("utf-8"))
+        digest.update(b"\1")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def render(self, content: str, extensions: Sequence[str] = ()) -> str:
+        """Retorna o HTML do markdown, convertendo apenas na primeira vez."""
+        key = self.make_key(content, extensions)
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self._metrics.hits += 1
+                return fragment
+
+        fragment = self._read_disk(key)
+        if fragment is not None:
+            with self._lock:
+                self._metrics.disk_hits += 1
+        else:
+            fragment = convert_markdown(content, extensions)
+            with self._lock:
+                self._metrics.misses += 1
+            self._write_disk(key, fragment)
+        self._store(key, fragment)
+        return fragment
+
+    def _store(self, key: str, fragment: str) -> None:
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        try:
+            return self._path(key).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, fragment: str) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(fragment, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o fragmento HTML em cache: {str(e)}")
+
+    def metrics(self) -> HtmlCacheMetrics:
+        """Retorna uma cópia das métricas atuais."""
+        with self._lock:
+            return self._metrics.model_copy(update={"entries": len(self._entries)})
+
+@lru_cache(maxsize=1)
+def get_html_cache() -> HtmlFragmentCache:
+    """Retorna o cache de fragmentos HTML compartilhado pelo processo."""
+    return HtmlFragmentCache(
+        max_entries=settings.HTML_CACHE_MAX_ENTRIES,
+        cache_dir=settings.HTML_CACHE_DIR
+    )
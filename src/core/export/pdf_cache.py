@@ -0,0 +1,102 @@
+import hashlib
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.core.config.settings import settings
+from src.core.disk_lru import DiskLru
+
+logger = logging.getLogger(__name__)
+
+class PdfCacheMetrics(BaseModel):
+    """Métricas de uso do cache de capítulos renderizados."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+class PdfPartCache:
+    """Cache em disco dos PDFs de cada capítulo.
+
+    A chave combina o hash do tema com o título e o HTML do capítulo, então
+    uma reexportação só renderiza os capítulos alterados (ou todos, se o tema
+    mudar). Quando o tamanho total passa do limite, os PDFs menos
+    recentemente usados são removidos.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório de persistência
+            max_bytes: Tamanho máximo do cache em disco
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._metrics = PdfCacheMetrics()
+        self._lru = DiskLru(self.cache_dir, "*/*.pdf", max_bytes, name="Cache de PDFs")
+
+    @staticmethod
+    def make_key(theme_digest: str, title: str, fragment: str) -> str:
+        digest = hashlib.sha256(theme_digest.encode("utf-8"))
+        for part in (title, fragment):
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o PDF em cache ou None se ausente."""
+        path = self._path(key)
+        try:
+            pdf = path.read_bytes()
+        except FileNotFoundError:
+            pdf = None
+        # O arquivo pode ter sido removido pelo limite logo após a leitura
+        if pdf is None or not self._lru.touch(path, len(pdf)):
+            with self._lock:
+                self._metrics.misses += 1
+            return None
+
+        with self._lock:
+            self._metrics.hits += 1
+        return pdf
+
+    def set(self, key: str, pdf: bytes) -> None:
+        """Grava um PDF de forma atômica e aplica o limite de tamanho."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(pdf)
+        os.replace(tmp_path, path)
+        self._lru.add(path, len(pdf))
+
+    def metrics(self) -> PdfCacheMetrics:
+        """Retorna uma cópia das métricas atuais."""
+        entries, size_bytes = self._lru.usage()
+        with self._lock:
+            return self._metrics.model_copy(update={
+                "evictions": self._lru.evictions,
+                "entries": entries,
+                "size_bytes": size_bytes
+            })
+
+@lru_cache(maxsize=1)
+def get_pdf_cache() -> Optional[PdfPartCache]:
+    """Retorna o cache de capítulos renderizados do processo (None se desativado)."""
+    if settings.PDF_CHAPTER_CACHE_DIR is None:
+        return None
+    return PdfPartCache(
+        cache_dir=settings.PDF_CHAPTER_CACHE_DIR,
+        max_bytes=settings.PDF_CHAPTER_CACHE_MAX_MB * 1024 * 1024
+    )
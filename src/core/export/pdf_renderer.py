@@ -0,0 +1,285 @@
+import asyncio
+import gc
+import html
+import io
+import logging
+import os
+from itertools import repeat
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from src.core.export.html_cache import convert_markdown
+from src.core.export.pdf_cache import PdfPartCache
+from src.core.export.process_pool import get_process_pool
+from src.core.export.themes import get_theme, write_pdf
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_EXTENSIONS = ['extra', 'nl2br', 'sane_lists', 'smarty']
+
+def markdown_to_html(md_content: str) -> str:
+    """Converte o markdown do livro para o HTML completo.
+
+    O estilo não é embutido: vem do tema, aplicado já compilado na renderização.
+    """
+    return html_document(convert_markdown(md_content, MARKDOWN_EXTENSIONS))
+
+def render_markdown_file(input_path: str, output_path: str, theme: Optional[str] = None) -> str:
+    """Renderiza um arquivo markdown em PDF.
+
+    Executada nos processos do pool; o PDF é gravado num arquivo temporário
+    e renomeado sobre o destino.
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        document = markdown_to_html(f.read())
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        write_pdf(document, tmp_path, theme)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+def render_html_to_pdf(document: str, theme: Optional[str] = None) -> bytes:
+    """Renderiza um documento HTML em PDF; executada nos processos do pool."""
+    return write_pdf(document, theme=theme)
+
+def count_pages(pdf: bytes) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+def html_document(body: str, title: str = "") -> str:
+    """Envolve um fragmento HTML num documento; o estilo vem do tema."""
+    return f"""
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{html.escape(title)}</title>
+</head>
+<body>
+    {body}
+</body>
+</html>
+"""
+
+def toc_html(title: str, entries: List[Tuple[str, int]]) -> str:
+    """Folha de rosto e sumário, com a página inicial de cada capítulo."""
+    items = "".join(
+        f'<li><span class="toc-title">{html.escape(chapter)}</span> '
+        f'<span class="toc-page">{page}</span></li>'
+        for chapter, page in entries
+    )
+    return f'<h1>{html.escape(title)}</h1><h2>Sumário</h2><ol class="toc">{items}</ol>'
+
+def page_numbers_html(total: int, start: int = 1) -> str:
+    """Páginas em branco numeradas no rodapé, sobrepostas às páginas do livro.
+
+    Cada página usa uma página nomeada com o número fixo no rodapé, então
+    uma parte do livro pode ser numerada sozinha a partir de ``start``.
+    """
+    numbers = "".join(
+        f"div:nth-of-type({idx}) {{ page: n{number}; }} "
+        f"@page n{number} {{ @bottom-center {{ content: \"{number}\"; }} }} "
+        for idx, number in enumerate(range(start, start + total), 1)
+    )
+    return (
+        "<html><head><style>"
+        "@page { @bottom-center { font-family: Arial, sans-serif; font-size: 9pt; } }"
+        "div { page-break-after: always; } div:last-child { page-break-after: auto; }"
+        + numbers
+        + "</style></head><body>"
+        + "<div></div>" * total
+        + "</body></html>"
+    )
+
+def page_number_documents(part_pages: Iterable[int]) -> Iterator[str]:
+    """Documentos de numeração de cada parte, continuando a contagem da anterior."""
+    start = 1
+    for pages in part_pages:
+        yield page_numbers_html(pages, start)
+        start += pages
+
+def _pdf_source(pdf: Union[bytes, Path]) -> Union[io.BytesIO, Path]:
+    return io.BytesIO(pdf) if isinstance(pdf, bytes) else Path(pdf)
+
+def merge_pdf_parts(
+    parts: Iterable[Tuple[Optional[str], Union[bytes, Path]]],
+    output_file: Optional[Path] = None,
+    overlays: Optional[Iterable[Union[bytes, Path]]] = None
+) -> Optional[bytes]:
+    """Une as partes de um livro num único PDF.
+
+    Cada parte é gravada assim que lida, sem montar o livro em memória, e
+    ``overlays`` é consumido junto com ``parts``, então pode ser um gerador
+    que renderiza a numeração de uma parte por vez.
+
+    Args:
+        parts: Pares (título do marcador, PDF em bytes ou arquivo); partes sem título não ganham marcador
+        output_file: Arquivo de destino (None retorna os bytes do PDF)
+        overlays: PDF de cada parte, com uma página por página dela, sobreposto a ela (numeração)
+    """
+    from pypdf import PdfReader
+    from src.core.export.pdf_stream import PdfStreamWriter
+
+    def write(stream: BinaryIO) -> None:
+        writer = PdfStreamWriter(stream)
+        numbered = iter(overlays) if overlays is not None else None
+        for bookmark, pdf in parts:
+            overlay = next(numbered, None) if numbered is not None else None
+            writer.add_part(
+                PdfReader(_pdf_source(pdf)),
+                bookmark,
+                PdfReader(_pdf_source(overlay)) if overlay is not None else None
+            )
+            # Os leitores do pypdf formam ciclos de referência; coletá-los a cada
+            # parte mantém a memória constante em livros longos
+            gc.collect(1)
+        writer.close()
+
+    if output_file is not None:
+        with open(output_file, 'wb') as f:
+            write(f)
+        return None
+    output = io.BytesIO()
+    write(output)
+    return output.getvalue()
+
+def render_front_matter(
+    title: str,
+    chapters: List[Tuple[str, int]],
+    render: Callable[[str], bytes]
+) -> Tuple[bytes, int]:
+    """Renderiza a folha de rosto com o sumário.
+
+    O tamanho do sumário desloca as páginas dos capítulos, então ele é
+    renderizado até o número de páginas estabilizar.
+
+    Args:
+        title: Título do livro
+        chapters: Pares (título, número de páginas) na ordem do livro
+        render: Função que converte um documento HTML em PDF
+
+    Returns:
+        PDF da abertura e seu número de páginas
+    """
+    front_pages, front_pdf = 1, b""
+    for _ in range(3):
+        entries, page = [], front_pages + 1
+        for chapter, pages in chapters:
+            entries.append((chapter, page))
+            page += pages
+        front_pdf = render(html_document(toc_html(title, entries), title))
+        if count_pages(front_pdf) == front_pages:
+            break
+        front_pages = count_pages(front_pdf)
+    return front_pdf, front_pages
+
+def render_book_parallel(
+    title: str,
+    chapters: List[Tuple[str, str]],
+    theme: Optional[str] = None,
+    workers: Optional[int] = None,
+    render: Callable[[str, Optional[str]], bytes] = render_html_to_pdf,
+    cache: Optional[PdfPartCache] = None
+) -> bytes:
+    """Renderiza um livro com um processo por capítulo e une as partes.
+
+    Cada capítulo vira um PDF independente; o sumário é renderizado depois,
+    quando a página inicial de cada capítulo é conhecida. A numeração
+    contínua é aplicada sobrepondo a cada parte um PDF só com os números
+    das suas páginas.
+
+    Com ``cache``, os capítulos já renderizados com o mesmo conteúdo e tema
+    são reaproveitados; só os alterados, o sumário e a numeração são
+    renderizados de novo. As partes são renderizadas no pool de processos
+    compartilhado, que mantém o tema compilado entre exportações.
+
+    Args:
+        title: Título do livro
+        chapters: Pares (título, fragmento HTML) na ordem do livro
+        theme: Tema aplicado a todas as partes (padrão: PDF_THEME)
+        workers: Número de processos (padrão: PDF_RENDER_WORKERS)
+        render: Função que converte um documento HTML em PDF com o tema
+        cache: Cache dos PDFs dos capítulos (None renderiza todos)
+    """
+    chapter_pdfs: List[Optional[bytes]] = [None] * len(chapters)
+    keys: List[str] = []
+    if cache is not None:
+        theme_digest = get_theme(theme).digest
+        keys = [cache.make_key(theme_digest, chapter, fragment) for chapter, fragment in chapters]
+        chapter_pdfs = [cache.get(key) for key in keys]
+    dirty = [idx for idx, pdf in enumerate(chapter_pdfs) if pdf is None]
+    if cache is not None:
+        logger.debug(f"PDF do livro: {len(chapters) - len(dirty)} capítulos em cache, {len(dirty)} a renderizar")
+
+    executor = get_process_pool(workers)
+    documents = [html_document(chapters[idx][1], chapters[idx][0]) for idx in dirty]
+    for idx, pdf in zip(dirty, executor.map(render, documents, repeat(theme))):
+        chapter_pdfs[idx] = pdf
+        if cache is not None:
+            cache.set(keys[idx], pdf)
+    chapter_pages = [count_pages(pdf) for pdf in chapter_pdfs]
+
+    front_pdf, front_pages = render_front_matter(
+        title,
+        [(chapter, pages) for (chapter, _), pages in zip(chapters, chapter_pages)],
+        lambda document: executor.submit(render, document, theme).result()
+    )
+
+    overlays = executor.map(render, page_number_documents([front_pages] + chapter_pages), repeat(theme))
+
+    parts = [(None, front_pdf)] + [(chapter, pdf) for (chapter, _), pdf in zip(chapters, chapter_pdfs)]
+    return merge_pdf_parts(parts, overlays=overlays)
+
+class PdfRenderer:
+    """Renderiza PDFs num pool de processos, fora do event loop.
+
+    O WeasyPrint é CPU-bound e segura o GIL, então cada renderização roda em
+    um processo do pool compartilhado com as demais exportações, que
+    sobrevive ao renderizador e é encerrado na saída do processo. As
+    renderizações agendadas ficam registradas para que ``drain`` aguarde as
+    pendentes antes do encerramento.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        render: Callable[[str, str, Optional[str]], str] = render_markdown_file,
+        theme: Optional[str] = None
+    ):
+        """Inicializa o renderizador.
+
+        Args:
+            workers: Número de processos de renderização (padrão: PDF_RENDER_WORKERS)
+            render: Função executada no pool (entrada markdown, saída PDF, tema)
+            theme: Tema dos PDFs (padrão: PDF_THEME); cada processo o compila uma vez
+        """
+        self.workers = workers
+        self.render = render
+        self.theme = theme
+        self._pending: Set[asyncio.Future] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, markdown_path: Path, pdf_path: Optional[Path] = None) -> asyncio.Future:
+        """Agenda a renderização de um markdown e retorna o future do PDF."""
+        pdf_path = pdf_path or Path(markdown_path).with_suffix('.pdf')
+        future = asyncio.get_running_loop().run_in_executor(
+            get_process_pool(self.workers), self.render, str(markdown_path), str(pdf_path), self.theme
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    async def drain(self) -> None:
+        """Aguarda as renderizações pendentes, ignorando falhas já reportadas."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Aguarda as renderizações pendentes; o pool compartilhado continua ativo."""
+        await self.drain()
@@ -0,0 +1,241 @@
+import zlib
+from collections import deque
+from typing import BinaryIO, Deque, Dict, List, Optional, Tuple
+
+from pypdf import PageObject, PdfReader
+from pypdf.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    PdfObject,
+    StreamObject,
+    TextStringObject,
+)
+
+ObjectKey = Tuple[int, int, int]  # (id do leitor, número, geração)
+
+def _ref(num: int) -> IndirectObject:
+    return IndirectObject(num, 0, None)
+
+class PdfStreamWriter:
+    """Grava um PDF parte a parte, sem manter o documento em memória.
+
+    As páginas de cada parte e os objetos que elas usam são gravados assim
+    que a parte é adicionada, com numeração nova; até o fim ficam em memória
+    só os deslocamentos dos objetos, as referências das páginas e os
+    marcadores. O catálogo, a árvore de páginas e os marcadores são gravados
+    em ``close``.
+    """
+
+    _CATALOG, _PAGES, _OUTLINES = 1, 2, 3
+    _STAMP = "/Sobreposicao"  # nome do Form XObject da página sobreposta
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._offsets: List[int] = [0, 0, 0]  # deslocamento de cada objeto, pelo número - 1
+        self._pages: List[int] = []
+        self._bookmarks: List[Tuple[str, int]] = []  # (título, objeto da primeira página)
+        stream.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_part(self, reader: PdfReader, bookmark: Optional[str] = None, overlay: Optional[PdfReader] = None) -> None:
+        """Grava as páginas de uma parte.
+
+        Args:
+            reader: PDF da parte
+            bookmark: Título do marcador apontando para a primeira página (None não cria marcador)
+            overlay: PDF com uma página por página da parte, sobreposta a ela (numeração)
+        """
+        pages = list(reader.pages)
+        overlay_pages = list(overlay.pages) if overlay is not None else []
+        ids: Dict[ObjectKey, int] = {}
+        by_key: Dict[ObjectKey, PdfObject] = {}
+        stamps: Dict[int, PageObject] = {}  # número da página -> página sobreposta
+        pending: Deque[Tuple[int, PdfObject]] = deque()
+        for idx, page in enumerate(pages):
+            num = self._allocate()
+            key = self._key(page.indirect_reference)
+            ids[key], by_key[key] = num, page
+            if idx < len(overlay_pages):
+                stamps[num] = overlay_pages[idx]
+            pending.append((num, page))
+            self._pages.append(num)
+        if bookmark and pages:
+            self._bookmarks.append((bookmark, self._pages[-len(pages)]))
+
+        while pending:
+            num, obj = pending.popleft()
+            if isinstance(obj, StreamObject):
+                copy = self._copy_stream(obj, ids, by_key, pending)
+            elif num in stamps:
+                copy = self._copy_stamped_page(obj, stamps.pop(num), ids, by_key, pending)
+            else:
+                copy = self._copy(obj, ids, by_key, pending)
+            self._emit(num, copy)
+
+    def close(self) -> None:
+        """Grava a árvore de páginas, os marcadores, o catálogo e a tabela de referências."""
+        self._emit(self._PAGES, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(_ref(num) for num in self._pages),
+            NameObject("/Count"): NumberObject(len(self._pages))
+        }))
+
+        items = [self._allocate() for _ in self._bookmarks]
+        for idx, ((title, page), num) in enumerate(zip(self._bookmarks, items)):
+            item = DictionaryObject({
+                NameObject("/Title"): TextStringObject(title),
+                NameObject("/Parent"): _ref(self._OUTLINES),
+                NameObject("/Dest"): ArrayObject([_ref(page), NameObject("/Fit")])
+            })
+            if idx:
+                item[NameObject("/Prev")] = _ref(items[idx - 1])
+            if idx < len(items) - 1:
+                item[NameObject("/Next")] = _ref(items[idx + 1])
+            self._emit(num, item)
+        outlines = DictionaryObject({
+            NameObject("/Type"): NameObject("/Outlines"),
+            NameObject("/Count"): NumberObject(len(items))
+        })
+        if items:
+            outlines[NameObject("/First")] = _ref(items[0])
+            outlines[NameObject("/Last")] = _ref(items[-1])
+        self._emit(self._OUTLINES, outlines)
+
+        self._emit(self._CATALOG, DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): _ref(self._PAGES),
+            NameObject("/Outlines"): _ref(self._OUTLINES)
+        }))
+
+        xref = self._stream.tell()
+        size = len(self._offsets) + 1
+        self._stream.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        for offset in self._offsets:
+            self._stream.write(f"{offset:010d} 00000 n \n".encode())
+        self._stream.write(b"trailer\n")
+        DictionaryObject({
+            NameObject("/Size"): NumberObject(size),
+            NameObject("/Root"): _ref(self._CATALOG)
+        }).write_to_stream(self._stream)
+        self._stream.write(f"\nstartxref\n{xref}\n%%EOF\n".encode())
+
+    def _allocate(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets)
+
+    @staticmethod
+    def _key(ref: IndirectObject) -> ObjectKey:
+        # A sobreposição traz objetos de outro leitor, com a mesma numeração
+        return id(ref.pdf), ref.idnum, ref.generation
+
+    def _emit(self, num: int, obj: PdfObject) -> None:
+        self._offsets[num - 1] = self._stream.tell()
+        self._stream.write(f"{num} 0 obj\n".encode())
+        obj.write_to_stream(self._stream)
+        self._stream.write(b"\nendobj\n")
+
+    def _copy(
+        self,
+        obj: PdfObject,
+        ids: Dict[ObjectKey, int],
+        by_key: Dict[ObjectKey, PdfObject],
+        pending: Deque[Tuple[int, PdfObject]]
+    ) -> PdfObject:
+        """Copia um objeto trocando as referências pela nova numeração e agendando os referenciados."""
+        if isinstance(obj, IndirectObject):
+            key = self._key(obj)
+            if key not in ids:
+                ids[key] = self._allocate()
+                pending.append((ids[key], by_key[key] if key in by_key else obj.get_object()))
+            return _ref(ids[key])
+        if isinstance(obj, StreamObject):
+            # Fluxos precisam ser objetos indiretos
+            num = self._allocate()
+            pending.append((num, obj))
+            return _ref(num)
+        if isinstance(obj, DictionaryObject):
+            is_page = obj.get("/Type") == "/Page"
+            copy = DictionaryObject()
+            for name, value in obj.items():
+                if is_page and name == "/Parent":
+                    copy[NameObject(name)] = _ref(self._PAGES)
+                else:
+                    copy[NameObject(name)] = self._copy(value, ids, by_key, pending)
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(value, ids, by_key, pending) for value in obj)
+        return obj
+
+    def _copy_stamped_page(
+        self,
+        page: DictionaryObject,
+        overlay: PageObject,
+        ids: Dict[ObjectKey, int],
+        by_key: Dict[ObjectKey, PdfObject],
+        pending: Deque[Tuple[int, PdfObject]]
+    ) -> DictionaryObject:
+        """Copia uma página desenhando a página sobreposta por cima do seu conteúdo.
+
+        A página sobreposta vira um Form XObject próprio, então seus recursos
+        não se misturam aos da página.
+        """
+        copy = self._copy(
+            DictionaryObject({name: value for name, value in page.items() if name not in ("/Resources", "/Contents")}),
+            ids, by_key, pending
+        )
+        overlay_contents = overlay.get_contents()
+        form = StreamObject()
+        form[NameObject("/Type")] = NameObject("/XObject")
+        form[NameObject("/Subtype")] = NameObject("/Form")
+        form[NameObject("/BBox")] = ArrayObject(overlay.mediabox)
+        if "/Resources" in overlay:
+            form[NameObject("/Resources")] = self._copy(overlay.raw_get("/Resources"), ids, by_key, pending)
+        form[NameObject("/Filter")] = NameObject("/FlateDecode")
+        form.set_data(zlib.compress(overlay_contents.get_data() if overlay_contents is not None else b""))
+        form_num = self._allocate()
+        self._emit(form_num, form)
+
+        resources = DictionaryObject()
+        xobjects = DictionaryObject()
+        if "/Resources" in page:
+            for name, value in page["/Resources"].items():
+                if name == "/XObject":
+                    xobjects = self._copy(value.get_object(), ids, by_key, pending)
+                else:
+                    resources[NameObject(name)] = self._copy(value, ids, by_key, pending)
+        xobjects[NameObject(self._STAMP)] = _ref(form_num)
+        resources[NameObject("/XObject")] = xobjects
+        copy[NameObject("/Resources")] = resources
+
+        contents = ArrayObject([self._emit_data(b"q\n")])
+        if "/Contents" in page:
+            original = page["/Contents"]
+            raw_streams = original if isinstance(original, ArrayObject) else [page.raw_get("/Contents")]
+            contents.extend(self._copy(stream, ids, by_key, pending) for stream in raw_streams)
+        contents.append(self._emit_data(f"Q\nq {self._STAMP} Do Q\n".encode()))
+        copy[NameObject("/Contents")] = contents
+        return copy
+
+    def _emit_data(self, data: bytes) -> IndirectObject:
+        stream = StreamObject()
+        stream.set_data(data)
+        num = self._allocate()
+        self._emit(num, stream)
+        return _ref(num)
+
+    def _copy_stream(
+        self,
+        obj: StreamObject,
+        ids: Dict[ObjectKey, int],
+        by_key: Dict[ObjectKey, PdfObject],
+        pending: Deque[Tuple[int, PdfObject]]
+    ) -> StreamObject:
+        copy = StreamObject()
+        for name, value in obj.items():
+            if name != "/Length":
+                copy[NameObject(name)] = self._copy(value, ids, by_key, pending)
+        # Os dados são gravados como estão no arquivo, ainda codificados
+        copy.set_data(obj._data)
+        return copy
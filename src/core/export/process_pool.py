@@ -0,0 +1,43 @@
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+def get_process_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Retorna o pool de processos de exportação com ``workers`` processos.
+
+    O pool é criado na primeira chamada e reaproveitado pelas exportações
+    seguintes, de modo que cada processo compila os temas e carrega as fontes
+    uma única vez. Um pool quebrado pela morte de um processo é substituído.
+
+    Args:
+        workers: Número de processos (padrão: PDF_RENDER_WORKERS)
+    """
+    workers = workers or settings.PDF_RENDER_WORKERS
+    with _pools_lock:
+        pool = _pools.get(workers)
+        # ProcessPoolExecutor não expõe publicamente se o pool está quebrado
+        if pool is None or getattr(pool, "_broken", False):
+            if pool is not None:
+                logger.warning("Pool de processos de exportação quebrado; criando outro")
+                pool.shutdown(wait=False)
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+def shutdown_process_pools() -> None:
+    """Encerra os pools de processos de exportação."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+atexit.register(shutdown_process_pools)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiofiles
+
+class StreamingBookWriter:
+    """Grava o markdown do livro capítulo a capítulo, na ordem do outline.
+
+    O arquivo é aberto uma única vez e cada capítulo é anexado assim que fica
+    disponível; capítulos concluídos fora de ordem aguardam num buffer até que
+    os anteriores cheguem. A escrita vai para um arquivo temporário, renomeado
+    sobre o destino apenas em ``commit``.
+    """
+
+    def __init__(self, path: Path, title: str, keys: List[str]):
+        """Inicializa o writer.
+
+        Args:
+            path: Arquivo markdown de destino
+            title: Título do livro
+            keys: Identificadores dos capítulos, na ordem do livro
+        """
+        self.path = Path(path)
+        self.title = title
+        self.committed = False
+        self.peak_buffered = 0  # maior número de capítulos retidos fora de ordem
+        self._positions: Dict[str, int] = {key: idx for idx, key in enumerate(keys)}
+        self._pending: Dict[int, str] = {}
+        self._next = 0
+        self._file = None
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        self._lock = asyncio.Lock()
+
+    @property
+    def written(self) -> int:
+        """Quantidade de capítulos já gravados no arquivo."""
+        return self._next
+
+    @property
+    def complete(self) -> bool:
+        return self._next == len(self._positions)
+
+    async def open(self) -> "StreamingBookWriter":
+        """Cria o arquivo temporário e grava o título (sem efeito se já aberto)."""
+        if self._file is not None:
+            return self
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = await aiofiles.open(self._tmp_path, 'w', encoding='utf-8')
+        await self._file.write(f"# {self.title}\n\n")
+        return self
+
+    async def add(self, key: str, content: str) -> None:
+        """Entrega o conteúdo de um capítulo, em qualquer ordem."""
+        position = self._positions.get(key)
+        if position is None:
+            raise ValueError(f"Capítulo desconhecido: {key}")
+        async with self._lock:
+            if position < self._next or position in self._pending:
+                raise ValueError(f"Capítulo já entregue: {key}")
+            self._pending[position] = content
+            self.peak_buffered = max(self.peak_buffered, len(self._pending))
+            while self._next in self._pending:
+                await self._file.write(f"\n{self._pending.pop(self._next)}\n")
+                self._next += 1
+
+    async def commit(self) -> Path:
+        """Fecha o arquivo e o move atomicamente para o destino."""
+        if not self.complete:
+            raise RuntimeError(
+                f"Livro incompleto: {self._next} de {len(self._positions)} capítulos gravados"
+            )
+        await self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+        self.committed = True
+        return self.path
+
+    async def abort(self) -> None:
+        """Descarta o arquivo temporário, mantendo o destino intacto."""
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+        self._tmp_path.unlink(missing_ok=True)
+
+    async def __aenter__(self) -> "StreamingBookWriter":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, traceback) -> Optional[bool]:
+        if not self.committed:
+            await self.abort()
+        return None
@@ -0,0 +1,121 @@
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+BOOK_CSS = """
+body {
+    font-family: Arial, sans-serif;
+    line-height: 1.6;
+    margin: 2cm;
+}
+h1, h2, h3 {
+    color: #2c3e50;
+}
+h1 {
+    border-bottom: 2px solid #2c3e50;
+    padding-bottom: 10px;
+}
+code {
+    background-color: #f7f7f7;
+    padding: 2px 5px;
+    border-radius: 3px;
+}
+pre {
+    background-color: #f7f7f7;
+    padding: 15px;
+    border-radius: 5px;
+    overflow-x: auto;
+}
+blockquote {
+    border-left: 4px solid #2c3e50;
+    margin: 0;
+    padding-left: 15px;
+    color: #666;
+}
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 15px 0;
+}
+th, td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+}
+th {
+    background-color: #f7f7f7;
+}
+.toc { list-style: none; padding: 0; }
+.toc li { display: flex; justify-content: space-between; border-bottom: 1px dotted #999; margin: 6px 0; }
+"""
+
+SIMPLE_CSS = """
+body { font-family: Arial, sans-serif; margin: 40px; }
+h1 { color: #333; }
+h2 { color: #666; }
+.toc { list-style: none; padding: 0; }
+.toc li { display: flex; justify-content: space-between; border-bottom: 1px dotted #999; margin: 6px 0; }
+"""
+
+_themes: Dict[str, str] = {
+    "padrao": BOOK_CSS,
+    "simples": SIMPLE_CSS,
+}
+
+class Theme(BaseModel):
+    """Folha de estilo aplicada aos PDFs."""
+    name: str
+    css: str
+
+    @property
+    def digest(self) -> str:
+        """Hash do CSS, para identificar renderizações feitas com o tema."""
+        return hashlib.sha256(self.css.encode("utf-8")).hexdigest()
+
+def register_theme(name: str, css: str) -> None:
+    """Registra (ou substitui) um tema."""
+    _themes[name] = css
+    compiled_theme.cache_clear()
+
+def get_theme(name: Optional[str] = None) -> Theme:
+    """Retorna um tema pelo nome (padrão: PDF_THEME)."""
+    name = name or settings.PDF_THEME
+    if name not in _themes:
+        raise ValueError(f"Tema de PDF desconhecido: {name} (disponíveis: {', '.join(sorted(_themes))})")
+    return Theme(name=name, css=_themes[name])
+
+@lru_cache(maxsize=None)
+def compiled_theme(name: str) -> Tuple[Any, Any]:
+    """Compila o CSS e a configuração de fontes de um tema, uma vez por processo.
+
+    Returns:
+        Par (``weasyprint.CSS``, ``FontConfiguration``) reutilizado em todas
+        as renderizações do processo
+    """
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    theme = get_theme(name)
+    font_config = FontConfiguration()
+    logger.debug(f"Tema de PDF '{name}' compilado")
+    return CSS(string=theme.css, font_config=font_config), font_config
+
+def write_pdf(document: str, target: Any = None, theme: Optional[str] = None) -> Optional[bytes]:
+    """Renderiza um documento HTML com o tema, sem recompilar o CSS.
+
+    Args:
+        document: HTML sem estilo embutido
+        target: Arquivo de destino (None retorna os bytes do PDF)
+        theme: Nome do tema (padrão: PDF_THEME)
+    """
+    from weasyprint import HTML
+
+    stylesheet, font_config = compiled_theme(get_theme(theme).name)
+    return HTML(string=document).write_pdf(target, stylesheets=[stylesheet], font_config=font_config)
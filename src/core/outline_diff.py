@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.models.book_models import Chapter, ChapterOutline
+
+# Campos do outline que, se alterados, exigem reescrever o capítulo
+CONTENT_FIELDS = ("title", "description", "topics", "expected_length")
+
+class OutlineDiff(BaseModel):
+    """Diferença entre dois outlines, capítulo a capítulo.
+
+    ``outline`` é o novo outline com a identidade dos capítulos reconciliada:
+    capítulos reconhecidos herdam o ``chapter_id`` do outline anterior.
+    """
+    outline: List[ChapterOutline]
+    added: List[str] = []  # chapter_ids
+    changed: List[str] = []
+    unchanged: List[str] = []
+    removed: List[str] = []
+
+    @property
+    def to_generate(self) -> List[ChapterOutline]:
+        """Capítulos novos ou alterados, na ordem do novo outline."""
+        pending = set(self.added) | set(self.changed)
+        return [outline for outline in self.outline if outline.chapter_id in pending]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+def _fingerprint(outline: ChapterOutline) -> tuple:
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (getattr(outline, field) for field in CONTENT_FIELDS)
+    )
+
+def diff_outlines(previous: List[ChapterOutline], new: List[ChapterOutline]) -> OutlineDiff:
+    """Compara dois outlines pela identidade estável dos capítulos.
+
+    Os capítulos são casados pelo ``chapter_id``; os que sobrarem são casados
+    pelo título, o que cobre outlines editados à mão sem os ids. Mudar só a
+    ordem dos capítulos não exige reescrevê-los.
+
+    Args:
+        previous: Outline salvo no BookState anterior
+        new: Outline editado
+
+    Returns:
+        OutlineDiff: Classificação dos capítulos e o novo outline reconciliado
+    """
+    previous_by_id = {outline.chapter_id: outline for outline in previous}
+    unmatched_by_title = {outline.title: outline for outline in previous}
+    matched: Dict[int, ChapterOutline] = {}
+
+    for idx, outline in enumerate(new):
+        match = previous_by_id.get(outline.chapter_id)
+        if match is not None:
+            matched[idx] = match
+            unmatched_by_title.pop(match.title, None)
+    for idx, outline in enumerate(new):
+        if idx in matched:
+            continue
+        match = unmatched_by_title.pop(outline.title, None)
+        if match is not None and match.chapter_id not in {m.chapter_id for m in matched.values()}:
+            matched[idx] = match
+
+    diff = OutlineDiff(outline=[])
+    for idx, outline in enumerate(new):
+        match = matched.get(idx)
+        if match is None:
+            diff.outline.append(outline)
+            diff.added.append(outline.chapter_id)
+            continue
+        reconciled = outline.model_copy(update={"chapter_id": match.chapter_id})
+        diff.outline.append(reconciled)
+        if _fingerprint(reconciled) == _fingerprint(match):
+            diff.unchanged.append(match.chapter_id)
+        else:
+            diff.changed.append(match.chapter_id)
+
+    kept = {m.chapter_id for m in matched.values()}
+    diff.removed = [outline.chapter_id for outline in previous if outline.chapter_id not in kept]
+    return diff
+
+def match_chapters(outline: List[ChapterOutline], chapters: List[Chapter]) -> Dict[str, Chapter]:
+    """Associa os capítulos escritos aos chapter_ids do outline.
+
+    Usa o ``chapter_id`` gravado no capítulo e, para estados antigos que não o
+    têm, a posição ou o título correspondente.
+    """
+    by_id: Dict[str, Chapter] = {}
+    for idx, chapter in enumerate(chapters):
+        chapter_id: Optional[str] = chapter.chapter_id
+        if chapter_id is None:
+            same_title = [o for o in outline if o.title == chapter.title]
+            if same_title:
+                chapter_id = same_title[0].chapter_id
+            elif idx < len(outline):
+                chapter_id = outline[idx].chapter_id
+        if chapter_id is not None:
+            by_id[chapter_id] = chapter
+    return by_id
@@ -0,0 +1,490 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from src.core.config.settings import settings
+from src.core.events.bus import Subscriber
+from src.core.events.models import (
+    BookEvent, ChapterFailed, ChapterFinished, ChapterReviewed, ChapterStarted, DeadlineExceeded, Degraded,
+    LlmRequest, OutlineReady, PdfRendered, RunFailed, RunStarted, SaveDone
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL DEFAULT '',
+    target_audience TEXT NOT NULL DEFAULT '',
+    book_type TEXT NOT NULL DEFAULT '',
+    mode TEXT NOT NULL DEFAULT 'generate',
+    model TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at REAL,
+    finished_at REAL,
+    duration REAL,
+    outline_time REAL,
+    chapters INTEGER NOT NULL DEFAULT 0,
+    degradations TEXT NOT NULL DEFAULT '[]',
+    error TEXT,
+    output_path TEXT,
+    pdf_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_topic ON runs(topic, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs(status, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs(model, started_at);
+CREATE TABLE IF NOT EXISTS chapters (
+    run_id TEXT NOT NULL,
+    chapter_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    position INTEGER,
+    description TEXT,
+    topics TEXT NOT NULL DEFAULT '[]',
+    expected_length TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    started_at REAL,
+    finished_at REAL,
+    generation_time REAL,
+    review_time REAL,
+    error TEXT,
+    PRIMARY KEY (run_id, chapter_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    chapter_id TEXT,
+    title TEXT NOT NULL,
+    model TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_requests_run ON requests(run_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_requests_model ON requests(model, started_at);
+CREATE INDEX IF NOT EXISTS idx_requests_started ON requests(started_at);
+"""
+
+# Versão 1: capítulos identificados pelo título, sem outline nem requisições
+SCHEMA_VERSION = 2
+
+class ChapterRecord(BaseModel):
+    """Capítulo de uma execução, com o seu outline e as métricas da sua geração."""
+    chapter_id: str
+    title: str
+    position: Optional[int] = None
+    description: Optional[str] = None
+    topics: List[str] = []
+    expected_length: Optional[str] = None
+    status: str
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    generation_time: Optional[float] = None
+    review_time: Optional[float] = None
+    error: Optional[str] = None
+
+class RequestRecord(BaseModel):
+    """Requisição ao modelo de linguagem feita durante uma execução."""
+    run_id: str
+    chapter_id: Optional[str] = None
+    title: str
+    model: str
+    started_at: datetime
+    duration: float  # segundos
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+class RunRecord(BaseModel):
+    """Resumo de uma execução do BookFlow."""
+    run_id: str
+    topic: str
+    target_audience: str
+    book_type: str
+    mode: str
+    model: Optional[str] = None
+    status: str
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration: Optional[float] = None  # segundos
+    outline_time: Optional[float] = None
+    chapters: int = 0
+    degradations: List[str] = []
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    pdf_path: Optional[str] = None
+
+class RunDetails(RunRecord):
+    """Execução com o outline, as métricas de cada capítulo e as requisições."""
+    chapter_records: List[ChapterRecord] = []
+    request_records: List[RequestRecord] = []
+
+class RunRepository:
+    """Repositório SQLite (WAL) das execuções, capítulos e métricas.
+
+    É alimentado pelos eventos do BookFlow: ``record`` aplica um lote de
+    eventos numa única transação. As consultas usam os índices por tema,
+    status, modelo e data de início; as requisições ao modelo de linguagem
+    são indexadas por modelo e data.
+    """
+
+    def __init__(self, db_path: Path):
+        """Inicializa o repositório.
+
+        Args:
+            db_path: Caminho do banco SQLite
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._handlers: Dict[type, Callable[[sqlite3.Connection, Any], None]] = {
+            RunStarted: self._run_started,
+            OutlineReady: self._outline_ready,
+            Degraded: self._degraded,
+            ChapterStarted: self._chapter_started,
+            ChapterFinished: self._chapter_finished,
+            ChapterFailed: self._chapter_failed,
+            ChapterReviewed: self._chapter_reviewed,
+            LlmRequest: self._llm_request,
+            SaveDone: self._save_done,
+            PdfRendered: self._pdf_rendered,
+            RunFailed: self._run_failed,
+            DeadlineExceeded: self._deadline_exceeded
+        }
+        with self._connection() as conn:
+            self._migrate(conn)
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna a conexão SQLite da thread atual."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Converte os capítulos de bancos da versão 1, identificados pelo título."""
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(chapters)")]
+        if not columns or "chapter_id" in columns:
+            return
+        logger.info("Migrando os capítulos do repositório de execuções")
+        conn.execute("ALTER TABLE chapters RENAME TO chapters_v1")
+        conn.executescript(SCHEMA)
+        conn.execute(
+            """INSERT INTO chapters (run_id, chapter_id, title, position, status, started_at, finished_at,
+                   generation_time, review_time, error)
+               SELECT run_id, title, title, position, status, started_at, finished_at,
+                   generation_time, review_time, error
+               FROM chapters_v1"""
+        )
+        conn.execute("DROP TABLE chapters_v1")
+
+    def handles(self, event: BookEvent) -> bool:
+        return type(event) in self._handlers
+
+    def record(self, events: Iterable[BookEvent]) -> None:
+        """Aplica um lote de eventos numa única transação."""
+        with self._write_lock:
+            with self._connection() as conn:
+                for event in events:
+                    handler = self._handlers.get(type(event))
+                    if handler:
+                        handler(conn, event)
+
+    # Eventos da execução
+
+    @staticmethod
+    def _run_started(conn: sqlite3.Connection, event: RunStarted) -> None:
+        conn.execute(
+            """INSERT INTO runs (run_id, topic, target_audience, book_type, mode, model, status, started_at)
+               VALUES (?, ?, ?, ?, ?, ?, 'running', ?)
+               ON CONFLICT(run_id) DO UPDATE SET topic = excluded.topic, target_audience = excluded.target_audience,
+                   book_type = excluded.book_type, mode = excluded.mode, model = excluded.model,
+                   status = 'running', started_at = excluded.started_at""",
+            (event.run_id, event.topic, event.target_audience, event.book_type, event.mode,
+             event.model or None, event.timestamp)
+        )
+
+    @staticmethod
+    def _outline_ready(conn: sqlite3.Connection, event: OutlineReady) -> None:
+        conn.execute(
+            "UPDATE runs SET chapters = ?, outline_time = ? - started_at WHERE run_id = ?",
+            (len(event.chapters) + event.reused, event.timestamp, event.run_id)
+        )
+        if event.outline:
+            rows = [
+                (event.run_id, outline.chapter_id, outline.title, position, outline.description,
+                 json.dumps(outline.topics, ensure_ascii=False), outline.expected_length.value)
+                for position, outline in enumerate(event.outline)
+            ]
+        else:
+            rows = [
+                (event.run_id, title, title, position, None, "[]", None)
+                for position, title in enumerate(event.chapters)
+            ]
+        conn.executemany(
+            """INSERT INTO chapters (run_id, chapter_id, title, position, description, topics, expected_length)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(run_id, chapter_id) DO UPDATE SET title = excluded.title, position = excluded.position,
+                   description = excluded.description, topics = excluded.topics,
+                   expected_length = excluded.expected_length""",
+            rows
+        )
+
+    @staticmethod
+    def _degraded(conn: sqlite3.Connection, event: Degraded) -> None:
+        conn.execute(
+            "UPDATE runs SET degradations = ?, model = COALESCE(?, model) WHERE run_id = ?",
+            (json.dumps(event.degradations, ensure_ascii=False), event.model, event.run_id)
+        )
+
+    def _finish_run(self, conn: sqlite3.Connection, event: BookEvent, status: str, **columns: Any) -> None:
+        assignments = "".join(f", {column} = ?" for column in columns)
+        conn.execute(
+            f"UPDATE runs SET status = ?, finished_at = ?, duration = ? - started_at{assignments} WHERE run_id = ?",
+            (status, event.timestamp, event.timestamp, *columns.values(), event.run_id)
+        )
+
+    def _save_done(self, conn: sqlite3.Connection, event: SaveDone) -> None:
+        self._finish_run(conn, event, "completed", output_path=event.output_path)
+
+    def _run_failed(self, conn: sqlite3.Connection, event: RunFailed) -> None:
+        self._finish_run(conn, event, "failed", error=event.error)
+
+    def _deadline_exceeded(self, conn: sqlite3.Connection, event: DeadlineExceeded) -> None:
+        self._finish_run(conn, event, "deadline_exceeded")
+
+    @staticmethod
+    def _pdf_rendered(conn: sqlite3.Connection, event: PdfRendered) -> None:
+        conn.execute("UPDATE runs SET pdf_path = ? WHERE run_id = ?", (event.output_path, event.run_id))
+
+    # Eventos dos capítulos
+
+    @staticmethod
+    def _upsert_chapter(conn: sqlite3.Connection, event: BookEvent, **columns: Any) -> None:
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns)
+        # Eventos sem chapter_id (outline sem identidade) usam o título, como o outline
+        conn.execute(
+            f"""INSERT INTO chapters (run_id, chapter_id, title, {names}) VALUES (?, ?, ?, {placeholders})
+                ON CONFLICT(run_id, chapter_id) DO UPDATE SET {updates}""",
+            (event.run_id, event.chapter_id or event.title, event.title, *columns.values())
+        )
+
+    def _chapter_started(self, conn: sqlite3.Connection, event: ChapterStarted) -> None:
+        self._upsert_chapter(conn, event, status="running", started_at=event.timestamp)
+
+    def _chapter_finished(self, conn: sqlite3.Connection, event: ChapterFinished) -> None:
+        self._upsert_chapter(
+            conn, event, status="finished", finished_at=event.timestamp, generation_time=event.generation_time
+        )
+
+    def _chapter_failed(self, conn: sqlite3.Connection, event: ChapterFailed) -> None:
+        self._upsert_chapter(conn, event, status="failed", finished_at=event.timestamp, error=event.error)
+
+    def _chapter_reviewed(self, conn: sqlite3.Connection, event: ChapterReviewed) -> None:
+        self._upsert_chapter(conn, event, status="reviewed", review_time=event.review_time)
+
+    @staticmethod
+    def _llm_request(conn: sqlite3.Connection, event: LlmRequest) -> None:
+        conn.execute(
+            """INSERT INTO requests (run_id, chapter_id, title, model, started_at, duration,
+                   prompt_tokens, completion_tokens, error)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (event.run_id, event.chapter_id, event.title, event.model, event.timestamp, event.duration,
+             event.prompt_tokens, event.completion_tokens, event.error)
+        )
+
+    # Consultas
+
+    def list_runs(
+        self,
+        topic: Optional[str] = None,
+        status: Optional[str] = None,
+        model: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        min_duration: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[RunRecord]:
+        """Lista as execuções mais recentes que atendem aos filtros.
+
+        Args:
+            topic: Tema exato do livro
+            status: running, completed, failed ou deadline_exceeded
+            model: Modelo usado na geração
+            since: Início a partir desta data
+            until: Início até esta data
+            min_duration: Duração mínima em segundos
+            limit: Número máximo de execuções
+            offset: Execuções a pular, para paginação
+        """
+        filters, params = [], []
+        for column, value in (("topic", topic), ("status", status), ("model", model)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            filters.append("started_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            filters.append("started_at <= ?")
+            params.append(until.timestamp())
+        if min_duration is not None:
+            filters.append("duration >= ?")
+            params.append(min_duration)
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return [self._run_record(RunRecord, row) for row in rows]
+
+    def get_run(self, run_id: str) -> Optional[RunDetails]:
+        """Retorna uma execução com seus capítulos e requisições, ou None se não existir."""
+        conn = self._connection()
+        row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        details = self._run_record(RunDetails, row)
+        details.chapter_records = [
+            ChapterRecord.model_validate({
+                **{key: chapter[key] for key in chapter.keys() if key != "run_id"},
+                "topics": json.loads(chapter["topics"])
+            })
+            for chapter in conn.execute(
+                "SELECT * FROM chapters WHERE run_id = ? ORDER BY position IS NULL, position, started_at",
+                (run_id,)
+            )
+        ]
+        details.request_records = [
+            RequestRecord.model_validate(dict(request))
+            for request in conn.execute(
+                "SELECT * FROM requests WHERE run_id = ? ORDER BY started_at", (run_id,)
+            )
+        ]
+        return details
+
+    def list_requests(
+        self,
+        model: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[RequestRecord]:
+        """Lista as requisições ao modelo de linguagem mais recentes.
+
+        Args:
+            model: Modelo da requisição
+            since: Início a partir desta data
+            until: Início até esta data
+            limit: Número máximo de requisições
+            offset: Requisições a pular, para paginação
+        """
+        filters, params = [], []
+        if model is not None:
+            filters.append("model = ?")
+            params.append(model)
+        if since is not None:
+            filters.append("started_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            filters.append("started_at <= ?")
+            params.append(until.timestamp())
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM requests {where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return [RequestRecord.model_validate(dict(row)) for row in rows]
+
+    @staticmethod
+    def _run_record(model: type, row: sqlite3.Row):
+        data = dict(row)
+        data["degradations"] = json.loads(data["degradations"])
+        return model.model_validate(data)
+
+class RunRecorder(Subscriber):
+    """Grava os eventos do barramento no repositório de execuções, em lotes.
+
+    Os eventos pendentes na fila são acumulados e gravados numa única
+    transação, fora do event loop, quando a fila esvazia ou o lote enche.
+    Nenhum evento é descartado: com a fila cheia, o lote e a fila são
+    gravados de forma síncrona, já que perder um ``SaveDone`` ou um
+    ``RunFailed`` deixaria a execução presa em ``running``.
+    """
+
+    def __init__(self, repository: RunRepository, batch_size: int = 200, buffer_size: int = 1000):
+        super().__init__(buffer_size)
+        self.repository = repository
+        self.batch_size = batch_size
+        self.sync_flushes = 0
+        self._batch: List[BookEvent] = []
+        # Uma única thread de escrita mantém os lotes na ordem de publicação
+        self._writer: Optional[ThreadPoolExecutor] = None
+
+    def accepts(self, event: BookEvent) -> bool:
+        return self.repository.handles(event)
+
+    async def handle(self, event: BookEvent) -> None:
+        self._batch.append(event)
+        if len(self._batch) >= self.batch_size or not self._queue:
+            await self.flush()
+
+    def overflow(self, event: BookEvent) -> None:
+        """Grava o lote, a fila e o evento de forma síncrona, sem descartar nada."""
+        batch = self._batch + list(self._queue) + [event]
+        self._batch = []
+        self._queue.clear()
+        self.sync_flushes += 1
+        logger.debug(f"RunRecorder: fila cheia, gravando {len(batch)} eventos de forma síncrona")
+        # Espera os lotes já enviados à thread de escrita para preservar a ordem
+        self._get_writer().submit(self.repository.record, batch).result()
+
+    async def flush(self) -> None:
+        """Grava o lote acumulado."""
+        batch, self._batch = self._batch, []
+        if batch:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._get_writer(), self.repository.record, batch)
+
+    def _get_writer(self) -> ThreadPoolExecutor:
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-recorder")
+        return self._writer
+
+    async def aclose_resources(self) -> None:
+        await self.flush()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+@lru_cache(maxsize=1)
+def get_run_repository() -> Optional[RunRepository]:
+    """Retorna o repositório de execuções do processo (None se desativado)."""
+    if not settings.RUNS_DB_PATH:
+        return None
+    return RunRepository(settings.RUNS_DB_PATH)
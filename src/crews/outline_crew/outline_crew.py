@@ -1,9 +1,10 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import SerperDevTool
 from langchain_openai import ChatOpenAI
 from src.models.book_models import BookOutline, OutputLanguage
 from src.core.config.settings import settings
+from src.tools.search_cache import get_search_cache
+from src.tools.search_tools import create_search_tool
 from src.core.parsers.markdown_parser import parse_markdown_to_book_outline
 from pathlib import Path
 import logging
@@ -41,7 +42,7 @@ class OutlineCrew:
 
     @agent
     def researcher(self) -> Agent:
-        search_tool = SerperDevTool(api_key=settings.SERPER_API_KEY)
+        search_tool = create_search_tool()
         return Agent(
             config=self.agents_config["researcher"],
             tools=[search_tool],
@@ -114,6 +115,8 @@ class OutlineCrew:
         self.topic = topic
         
         result = self.crew().kickoff()
+        cache_metrics = get_search_cache().metrics()
+        logger.info(f"Cache de pesquisa: taxa de acerto {cache_metrics.hit_rate:.0%} ({cache_metrics.hits} hits, {cache_metrics.misses} misses)")
         
         # Converter o markdown para dicionário
         if hasattr(result, 'raw'):
@@ -1,15 +1,18 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from langchain_openai import ChatOpenAI
+from src.interfaces.book_services import IChapterReviewer
 from src.models.book_models import Chapter
 from src.core.config.settings import settings
 from pathlib import Path
+from typing import Any, Dict, Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 @CrewBase
-class ReviewCrew:
+class ReviewCrew(IChapterReviewer):
     """Book Review Crew"""
 
     root_dir = Path(__file__).parent.parent.parent.parent
@@ -38,6 +41,8 @@ class ReviewCrew:
         if not self.llm.model == model_name:
             logger.error(f"Modelo configurado incorretamente: esperado={model_name}, atual={self.llm.model}")
             raise ValueError(f"Modelo configurado incorretamente: {self.llm.model}")
+        
+        self._pipeline_crew: Optional[Crew] = None
 
     def _validate_inputs(self, chapter_title: str, chapter_content: str) -> None:
         """Valida os inputs do capítulo."""
@@ -55,6 +60,14 @@ class ReviewCrew:
             verbose=True,
         )
 
+    @agent
+    def editor(self) -> Agent:
+        return Agent(
+            config=self.agents_config["editor"],
+            llm="gpt-4o",
+            verbose=True,
+        )
+
     @task
     def review_chapter(self) -> Task:
         task_description = self.tasks_config["review"]["description"].format(**self.inputs)
@@ -74,6 +87,65 @@ class ReviewCrew:
             verbose=True,
         )
 
+    def pipeline_crew(self) -> Crew:
+        """Cria o crew de revisão e melhoria usado pelo pipeline do livro.
+
+        As descrições das tarefas são mantidas como template e interpoladas
+        pelo CrewAI a cada kickoff; o crew é construído uma única vez e
+        copiado para cada capítulo.
+        """
+        if self._pipeline_crew is None:
+            reviewer = self.reviewer()
+            editor = self.editor()
+            review_task = Task(
+                description=self.tasks_config["review_chapter"]["description"],
+                expected_output=self.tasks_config["review_chapter"]["expected_output"],
+                agent=reviewer
+            )
+            improve_task = Task(
+                description=self.tasks_config["improve_chapter"]["description"],
+                expected_output=self.tasks_config["improve_chapter"]["expected_output"],
+                agent=editor,
+                context=[review_task]
+            )
+            self._pipeline_crew = Crew(
+                agents=[reviewer, editor],
+                tasks=[review_task, improve_task],
+                process=Process.sequential,
+                verbose=True,
+            )
+        return self._pipeline_crew
+
+    async def review(self, chapter: Chapter, context: Dict[str, Any]) -> Chapter:
+        """Revisa e melhora um capítulo, sem bloquear o event loop.
+
+        Args:
+            chapter: Capítulo escrito
+            context: Contexto do livro (goal, target_audience, book_type, outline)
+
+        Returns:
+            Chapter: Capítulo revisado
+        """
+        self._validate_inputs(chapter.title, chapter.content)
+        description = next(
+            (co["description"] for co in context.get("outline", []) if co["title"] == chapter.title),
+            ""
+        )
+        inputs = {
+            "chapter_title": chapter.title,
+            "chapter_content": chapter.content,
+            "chapter_description": description,
+            "target_audience": context.get("target_audience", ""),
+            "goal": context.get("goal", ""),
+            "book_type": context.get("book_type", "Guia Prático")
+        }
+
+        start_time = time.time()
+        result = await self.pipeline_crew().copy().kickoff_async(inputs=inputs)
+        content = result.raw if hasattr(result, 'raw') else str(result)
+        logger.info(f"Capítulo revisado: {chapter.title} em {time.time() - start_time:.1f}s")
+        return chapter.model_copy(update={"content": content})
+
     async def review_chapter_content(
         self,
         chapter_title: str,
@@ -1,12 +1,16 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from langchain_openai import ChatOpenAI
-from src.models.book_models import Chapter, ChapterOutline
+from src.models.book_models import Chapter, ChapterOutline, ResearchBundle
 from src.core.config.settings import settings
+from src.tools.search_cache import get_search_cache
+from src.tools.search_tools import create_search_tool
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
 import os
-from langchain.tools import SerperDevTool
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -52,9 +56,22 @@ class WriteChapterCrew:
         if not isinstance(chapter_topics, list) or len(chapter_topics) < 1:
             raise ValueError("chapter_topics deve ser uma lista com pelo menos um item")
 
+    def _chapter_inputs(self, outline: ChapterOutline, context: Dict[str, Any]) -> Dict[str, str]:
+        """Monta o conjunto de inputs de um capítulo para o kickoff do crew."""
+        self._validate_inputs(outline.title, context.get("topic", ""), outline.description, outline.topics)
+        return {
+            "chapter_title": outline.title,
+            "topic": context["topic"],
+            "chapter_description": outline.description,
+            "chapter_topics": ", ".join(outline.topics),
+            "book_type": context.get("book_type", "Guia Prático"),
+            "target_audience": context.get("target_audience", ""),
+            "goal": context.get("goal", "")
+        }
+
     @agent
     def researcher(self) -> Agent:
-        search_tool = SerperDevTool(api_key=settings.SERPER_API_KEY)
+        search_tool = create_search_tool()
         return Agent(
             config=self.agents_config["researcher"],
             tools=[search_tool],
@@ -89,6 +106,201 @@ class WriteChapterCrew:
             verbose=True,
         )
 
+    def batch_crew(self) -> Crew:
+        """Cria o crew de escrita em lote.
+
+        A descrição da tarefa é mantida como template; os placeholders são
+        interpolados pelo CrewAI a cada kickoff, então agentes e LLM são
+        construídos uma única vez para todos os capítulos.
+
+        O lote não faz pesquisa: só o escritor participa, com a mesma tarefa
+        ``write_chapter`` do crew padrão. Para pesquisar cada capítulo antes
+        de escrevê-lo, use ``write_chapters_pipelined``.
+        """
+        writer = self.writer()
+        return Crew(
+            agents=[writer],
+            tasks=[
+                Task(
+                    description=self.tasks_config["write_chapter"]["description"],
+                    agent=writer,
+                    expected_output="A well-written book chapter with detailed content."
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    async def write_chapters_batch(
+        self,
+        outlines: List[ChapterOutline],
+        context: Dict[str, Any],
+        max_concurrency: Optional[int] = None
+    ) -> List[Chapter]:
+        """Escreve vários capítulos com um único crew, em paralelo.
+
+        Equivale ao ``kickoff_for_each_async`` do CrewAI, porém com limite de
+        concorrência: cada capítulo roda numa cópia do crew base. Os capítulos
+        são escritos sem a etapa de pesquisa (veja ``batch_crew``).
+
+        Args:
+            outlines: Outlines dos capítulos, na ordem do livro
+            context: Contexto do livro (topic, goal, target_audience, book_type)
+            max_concurrency: Máximo de capítulos simultâneos
+                (padrão: settings.MAX_CONCURRENT_CHAPTERS)
+
+        Returns:
+            List[Chapter]: Capítulos na mesma ordem dos outlines
+        """
+        if not outlines:
+            return []
+
+        inputs = [self._chapter_inputs(outline, context) for outline in outlines]
+        base_crew = self.batch_crew()
+        semaphore = asyncio.Semaphore(max_concurrency or settings.MAX_CONCURRENT_CHAPTERS)
+        logger.info(f"Escrevendo {len(outlines)} capítulos em lote")
+
+        async def run(outline: ChapterOutline, chapter_inputs: Dict[str, str]) -> Chapter:
+            async with semaphore:
+                start_time = time.time()
+                result = await base_crew.copy().kickoff_async(inputs=chapter_inputs)
+                content = result.raw if hasattr(result, 'raw') else str(result)
+                return Chapter(
+                    title=outline.title,
+                    content=content,
+                    generation_time=time.time() - start_time,
+                    chapter_id=outline.chapter_id
+                )
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(run(outline, chapter_inputs))
+                for outline, chapter_inputs in zip(outlines, inputs)
+            ]
+
+        return [task.result() for task in tasks]
+
+    def research_crew(self) -> Crew:
+        """Cria o crew de pesquisa de capítulos (apenas o pesquisador)."""
+        researcher = self.researcher()
+        return Crew(
+            agents=[researcher],
+            tasks=[
+                Task(
+                    description=self.tasks_config["research_chapter"]["description"],
+                    agent=researcher,
+                    expected_output="Detailed research findings specific to the chapter."
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def research_writer_crew(self) -> Crew:
+        """Cria o crew de escrita que recebe a pesquisa pronta como input."""
+        writer = self.writer()
+        return Crew(
+            agents=[writer],
+            tasks=[
+                Task(
+                    description=self.tasks_config["write_chapter_from_research"]["description"],
+                    agent=writer,
+                    expected_output="A well-written book chapter with detailed content."
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    async def write_chapters_pipelined(
+        self,
+        outlines: List[ChapterOutline],
+        context: Dict[str, Any],
+        max_research: Optional[int] = None,
+        max_writers: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ) -> List[Chapter]:
+        """Escreve capítulos num pipeline de duas etapas: pesquisa -> escrita.
+
+        As pesquisas de todos os capítulos são independentes e disparadas
+        logo no início; os escritores consomem os resultados de uma fila
+        limitada conforme ficam prontos. Assim a latência das buscas se
+        sobrepõe à escrita em vez de somar a ela. Se o contexto trouxer a
+        pesquisa compartilhada do livro (``research``), o pesquisador não é
+        acionado e cada escritor recebe apenas a fatia do seu capítulo.
+
+        Args:
+            outlines: Outlines dos capítulos, na ordem do livro
+            context: Contexto do livro (topic, goal, target_audience, book_type)
+            max_research: Pesquisas simultâneas (padrão: settings.MAX_CONCURRENT_RESEARCH)
+            max_writers: Escritores simultâneos (padrão: settings.MAX_CONCURRENT_CHAPTERS)
+            queue_size: Capacidade da fila entre as etapas (padrão: settings.PIPELINE_QUEUE_SIZE)
+
+        Returns:
+            List[Chapter]: Capítulos na mesma ordem dos outlines
+        """
+        if not outlines:
+            return []
+
+        inputs = [self._chapter_inputs(outline, context) for outline in outlines]
+        research_base = None if context.get("research") else self.research_crew()
+        writer_base = self.research_writer_crew()
+        research_semaphore = asyncio.Semaphore(max_research or settings.MAX_CONCURRENT_RESEARCH)
+        writers = max_writers or settings.MAX_CONCURRENT_CHAPTERS
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or settings.PIPELINE_QUEUE_SIZE)
+        chapters: List[Optional[Chapter]] = [None] * len(outlines)
+        logger.info(f"Pipeline de {len(outlines)} capítulos: pesquisa -> escrita ({writers} escritores)")
+
+        research_bundle: Optional[ResearchBundle] = context.get("research")
+
+        async def research(idx: int) -> None:
+            if research_bundle:
+                # Pesquisa compartilhada do livro: usa apenas a fatia do capítulo
+                start_time = time.time()
+                findings = research_bundle.slice_for(outlines[idx].chapter_id)
+                await queue.put((idx, findings, start_time))
+                return
+            async with research_semaphore:
+                start_time = time.time()
+                result = await research_base.copy().kickoff_async(inputs=inputs[idx])
+            findings = result.raw if hasattr(result, 'raw') else str(result)
+            logger.info(f"Pesquisa concluída: {outlines[idx].title}")
+            await queue.put((idx, findings, start_time))
+
+        async def research_all() -> None:
+            async with asyncio.TaskGroup() as research_tg:
+                for idx in range(len(outlines)):
+                    research_tg.create_task(research(idx))
+            for _ in range(writers):
+                await queue.put(None)
+
+        async def write() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                idx, findings, start_time = item
+                result = await writer_base.copy().kickoff_async(
+                    inputs={**inputs[idx], "research": findings}
+                )
+                content = result.raw if hasattr(result, 'raw') else str(result)
+                chapters[idx] = Chapter(
+                    title=outlines[idx].title,
+                    content=content,
+                    generation_time=time.time() - start_time,
+                    chapter_id=outlines[idx].chapter_id
+                )
+                logger.info(f"Capítulo concluído: {outlines[idx].title}")
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(research_all())
+            for _ in range(writers):
+                tg.create_task(write())
+
+        cache_metrics = get_search_cache().metrics()
+        logger.info(f"Cache de pesquisa: taxa de acerto {cache_metrics.hit_rate:.0%} ({cache_metrics.hits} hits, {cache_metrics.misses} misses)")
+        return chapters
+
     async def write_chapter_content(
         self,
         chapter_title: str,
@@ -1,10 +1,12 @@
 from pathlib import Path
-from src.services.book_services import OpenAIService, BookSaver
+from src.services.book_services import OpenAIService, BookSaver, BookResearcher
+from src.crews.review_crew.review_crew import ReviewCrew
 from dependency_injector import containers, providers
 from src.config import Config
 from src.flows.book_flow import BookFlow
 from src.core.config.settings import settings
 from src.core.config.llm_config import get_llm
+from src.core.events import create_event_bus
 from langchain_openai import ChatOpenAI
 
 class BookContainer(containers.DeclarativeContainer):
@@ -22,7 +24,15 @@ class BookContainer(containers.DeclarativeContainer):
         llm=llm
     )
     
-    book_saver = providers.Factory(
+    researcher = providers.Singleton(BookResearcher)
+    
+    reviewer = providers.Singleton(ReviewCrew)
+    
+    # Eventos de progresso (console, JSONL, métricas e webhook)
+    event_bus = providers.Singleton(create_event_bus)
+    
+    # Singleton: o pool de renderização de PDF é compartilhado entre os livros
+    book_saver = providers.Singleton(
         BookSaver,
         output_dir=settings.OUTPUT_DIR
     )
@@ -32,5 +42,8 @@ class BookContainer(containers.DeclarativeContainer):
         BookFlow,
         outline_generator=openai_service,
         chapter_writer=openai_service,
-        book_saver=book_saver
+        book_saver=book_saver,
+        researcher=researcher,
+        reviewer=reviewer,
+        event_bus=event_bus
     ) 
\ No newline at end of file
@@ -1,54 +1,69 @@
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Optional, Set
+import asyncio
 import re
 import time
 from datetime import datetime, timedelta
 from src.core.config.settings import settings
-from src.interfaces.book_services import IBookOutlineGenerator, IChapterWriter, IBookSaver
-from src.models.book_models import BookState, Chapter, ChapterLength
+from src.interfaces.book_services import IBookOutlineGenerator, IChapterWriter, IBookSaver, IBookResearcher, IChapterReviewer
+from src.models.book_models import BookState, Chapter, ChapterLength, ChapterOutline, ResearchBundle
+from src.core.outline_diff import OutlineDiff, diff_outlines, match_chapters
+from src.core.events import (
+    CallbackSubscriber, ChapterFailed, ChapterFinished, ChapterReviewed, ChapterStarted, ChapterToken,
+    ConsoleRenderer, DeadlineExceeded, Degraded, EventBus, LlmRequest, OutlineReady, PdfRendered, RunFailed,
+    RunStarted, SaveDone
+)
 from src.services.book_services import OpenAIService
+from src.flows.run_context import RunContext
+
+# Do maior para o menor: cada passo de degradação desce um nível
+LENGTH_STEPS = [ChapterLength.MUITO_LONGO, ChapterLength.LONGO, ChapterLength.MEDIO, ChapterLength.CURTO]
 
 class BookFlow:
-    """Orquestrador do fluxo de geração do livro."""
+    """Orquestrador do fluxo de geração do livro.
+
+    A instância não guarda estado de execução: cada chamada de ``execute``
+    cria um RunContext próprio, então o mesmo flow pode gerar vários livros
+    em paralelo compartilhando os serviços injetados. O progresso é publicado
+    como eventos tipados no barramento ``event_bus``.
+    """
 
     def __init__(
         self,
         outline_generator: IBookOutlineGenerator,
         chapter_writer: IChapterWriter,
-        book_saver: IBookSaver
+        book_saver: IBookSaver,
+        researcher: Optional[IBookResearcher] = None,
+        reviewer: Optional[IChapterReviewer] = None,
+        event_bus: Optional[EventBus] = None
     ):
         self.outline_generator = outline_generator
         self.chapter_writer = chapter_writer
         self.book_saver = book_saver
+        self.researcher = researcher
+        self.reviewer = reviewer
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(logging.INFO)
-        self._state: Optional[BookState] = None
-
-    def _print_separator(self):
-        """Imprime uma linha separadora para melhor visualização dos logs."""
-        self.logger.info("="*50)
-
-    def _print_status(self, message: str, is_step: bool = False):
-        """Imprime uma mensagem de status formatada."""
-        if is_step:
-            self._print_separator()
-            self.logger.info(f"🔄 ETAPA: {message}")
-            self._print_separator()
-        else:
-            self.logger.info(f"📝 {message}")
+        self.event_bus = event_bus or EventBus([ConsoleRenderer(self.logger)])
+        self._runs: Dict[str, RunContext] = {}
+        self._renders: Set[asyncio.Task] = set()
 
-    def _print_success(self, message: str):
-        """Imprime uma mensagem de sucesso."""
-        self.logger.info(f"✅ {message}")
+    @property
+    def active_runs(self) -> Dict[str, RunContext]:
+        """Execuções em andamento, por run_id."""
+        return dict(self._runs)
 
-    def _print_warning(self, message: str):
-        """Imprime um aviso."""
-        self.logger.warning(f"⚠️ {message}")
+    async def wait_for_renders(self) -> None:
+        """Aguarda as conversões para PDF ainda em andamento."""
+        if self._renders:
+            await asyncio.gather(*self._renders, return_exceptions=True)
 
-    def _print_error(self, message: str):
-        """Imprime uma mensagem de erro."""
-        self.logger.error(f"❌ {message}")
+    async def aclose(self) -> None:
+        """Conclui os PDFs pendentes, encerra o saver e esvazia o barramento de eventos."""
+        await self.wait_for_renders()
+        await self.book_saver.aclose()
+        await self.event_bus.aclose()
 
     def _estimate_chapter_time(self, length: ChapterLength) -> float:
         """Estima o tempo de geração de um capítulo baseado no tamanho."""
@@ -72,164 +87,655 @@ class BookFlow:
         else:
             return f"{seconds}s"
 
-    def _estimate_total_time(self) -> float:
-        """Estima o tempo total de geração baseado no outline."""
-        if not self._state.book_outline:
-            return 0
-        
-        outline_time = 60  # 1 minuto para outline
+    def _estimate_chapters_time(self, outlines: List[ChapterOutline], speedup: float = 1.0) -> float:
+        """Estima o tempo de escrita dos capítulos, considerando o paralelismo."""
         chapter_times = sum(
             self._estimate_chapter_time(outline.expected_length)
-            for outline in self._state.book_outline
+            for outline in outlines
         )
         
         # Ajusta para processamento paralelo
-        parallel_factor = min(len(self._state.book_outline), settings.MAX_CONCURRENT_CHAPTERS)
+        parallel_factor = min(len(outlines), settings.MAX_CONCURRENT_CHAPTERS)
         adjusted_chapter_time = chapter_times / parallel_factor if parallel_factor > 0 else chapter_times
         
-        return outline_time + adjusted_chapter_time
+        return adjusted_chapter_time / speedup
+
+    def _estimate_total_time(self, state: BookState) -> float:
+        """Estima o tempo total de geração baseado no outline."""
+        if not state.book_outline:
+            return 0
+        
+        outline_time = 60  # 1 minuto para outline
+        return outline_time + self._estimate_chapters_time(state.book_outline)
+
+    def _fit_to_deadline(
+        self,
+        ctx: RunContext,
+        book_context: Dict[str, Any],
+        outlines: List[ChapterOutline]
+    ) -> List[ChapterOutline]:
+        """Degrada a escrita dos capítulos pendentes até a estimativa caber no prazo restante.
+
+        Os ajustes são aplicados em ordem, parando no primeiro que basta:
+        reduzir o tamanho dos capítulos, trocar para o modelo mais rápido e
+        omitir os capítulos opcionais. Só os ``outlines`` a escrever são
+        alterados; capítulos reaproveitados de uma geração anterior ficam
+        como estão.
+
+        Returns:
+            List[ChapterOutline]: Capítulos que ainda devem ser escritos
+        """
+        remaining = ctx.remaining()
+        if remaining is None:
+            return outlines
+        state = ctx.state
+        speedup = 1.0
+
+        def fits() -> bool:
+            return self._estimate_chapters_time(outlines, speedup) <= remaining
+
+        levels = 0
+        while not fits():
+            shrinkable = [o for o in outlines if o.expected_length != ChapterLength.CURTO]
+            if not shrinkable:
+                break
+            for outline in shrinkable:
+                outline.expected_length = LENGTH_STEPS[LENGTH_STEPS.index(outline.expected_length) + 1]
+            levels += 1
+        if levels:
+            state.degradations.append(f"Tamanho dos capítulos reduzido em {levels} nível(is)")
+
+        if not fits() and settings.FALLBACK_MODEL_NAME:
+            speedup = settings.FALLBACK_MODEL_SPEEDUP
+            book_context["model"] = settings.FALLBACK_MODEL_NAME
+            state.degradations.append(f"Modelo alterado para {settings.FALLBACK_MODEL_NAME}")
+
+        if not fits():
+            optional = {o.chapter_id for o in outlines if o.title in settings.OPTIONAL_CHAPTER_TITLES}
+            if optional:
+                state.degradations.append(
+                    f"Capítulos omitidos: {', '.join(o.title for o in outlines if o.chapter_id in optional)}"
+                )
+                outlines = [o for o in outlines if o.chapter_id not in optional]
+                state.book_outline = [o for o in state.book_outline if o.chapter_id not in optional]
+
+        book_context["outline"] = [co.model_dump() for co in state.book_outline]
+        if state.degradations:
+            for degradation in state.degradations:
+                ctx.warning(f"Prazo curto: {degradation}")
+            ctx.emit(Degraded(degradations=list(state.degradations), model=book_context.get("model")))
+        if not fits():
+            ctx.warning(
+                f"A estimativa ({self._format_time(self._estimate_chapters_time(outlines, speedup))}) "
+                f"ainda excede o prazo restante ({self._format_time(remaining)})"
+            )
+        return outlines
 
     async def execute(
         self, 
         topic: str, 
         target_audience: str, 
-        book_type: str
+        book_type: str,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        run_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
     ) -> BookState:
-        """Executa o fluxo completo de geração do livro."""
-        start_time = time.time()
-        self._print_status("INICIANDO GERAÇÃO DO EBOOK", True)
-        self._print_status(f"Tema: {topic}")
-        self._print_status(f"Público-alvo: {target_audience}")
-        self._print_status(f"Tipo: {book_type}")
+        """Executa o fluxo completo de geração do livro.
         
-        try:
-            # Inicializa o estado
-            self._state = BookState(
+        Args:
+            topic: Tema do livro
+            target_audience: Público-alvo
+            book_type: Tipo do livro
+            progress_callback: Recebe (evento, dados) a cada etapa concluída
+            run_id: Identificador da execução (gerado se omitido)
+            deadline_seconds: Prazo para concluir o livro (padrão: BOOK_DEADLINE_SECONDS)
+        """
+        ctx = RunContext(
+            state=BookState(
                 title=topic,
                 topic=topic,
                 goal=f"Criar um {book_type} sobre {topic} para {target_audience}",
                 target_audience=target_audience
-            )
+            ),
+            bus=self.event_bus,
+            run_id=run_id,
+            deadline_seconds=deadline_seconds or settings.BOOK_DEADLINE_SECONDS
+        )
+        return await self._run(ctx, self._execute(ctx, book_type), progress_callback)
 
+    async def regenerate(
+        self,
+        previous: BookState,
+        new_outline: List[ChapterOutline],
+        book_type: str = "Guia Prático",
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        run_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ) -> BookState:
+        """Regenera um livro já gerado a partir de um outline editado.
+
+        Só os capítulos novos ou alterados são escritos; os demais reaproveitam
+        o conteúdo do estado anterior.
+        
+        Args:
+            previous: Estado salvo da geração anterior
+            new_outline: Outline editado
+            book_type: Tipo do livro
+            progress_callback: Recebe (evento, dados) a cada etapa concluída
+            run_id: Identificador da execução (gerado se omitido)
+            deadline_seconds: Prazo para concluir o livro (padrão: BOOK_DEADLINE_SECONDS)
+        """
+        diff = diff_outlines(previous.book_outline or [], new_outline)
+        ctx = RunContext(
+            state=BookState(
+                title=previous.title,
+                topic=previous.topic,
+                goal=previous.goal,
+                target_audience=previous.target_audience,
+                language=previous.language,
+                book_outline=diff.outline,
+                research=previous.research
+            ),
+            bus=self.event_bus,
+            run_id=run_id,
+            deadline_seconds=deadline_seconds or settings.BOOK_DEADLINE_SECONDS
+        )
+        return await self._run(ctx, self._regenerate(ctx, book_type, diff, previous), progress_callback)
+
+    async def _run(
+        self,
+        ctx: RunContext,
+        steps: Coroutine[Any, Any, BookState],
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> BookState:
+        """Registra a execução e repassa seus eventos ao callback, se houver."""
+        subscriber = None
+        if progress_callback:
+            subscriber = CallbackSubscriber(progress_callback, ctx.run_id, settings.EVENT_SUBSCRIBER_BUFFER)
+            self.event_bus.subscribe(subscriber)
+        self._runs[ctx.run_id] = ctx
+        try:
+            return await steps
+        finally:
+            self._runs.pop(ctx.run_id, None)
+            for writer in (ctx.book_writer, ctx.backup_writer, ctx.epub_writer):
+                if writer and not writer.committed:
+                    await writer.abort()
+            if subscriber:
+                # Entrega os eventos pendentes antes de retornar ao chamador
+                await self.event_bus.unsubscribe(subscriber)
+
+    async def _execute(self, ctx: RunContext, book_type: str) -> BookState:
+        """Executa as etapas do fluxo para uma execução."""
+        state = ctx.state
+        start_time = time.time()
+        ctx.emit(RunStarted(
+            topic=state.topic,
+            target_audience=state.target_audience,
+            book_type=book_type,
+            model=settings.MODEL_NAME
+        ))
+        ctx.step("INICIANDO GERAÇÃO DO EBOOK")
+        ctx.info(f"Tema: {state.topic}")
+        ctx.info(f"Público-alvo: {state.target_audience}")
+        ctx.info(f"Tipo: {book_type}")
+        if ctx.deadline is not None:
+            ctx.info(f"Prazo: {self._format_time(ctx.remaining())}")
+        
+        try:
             # Gera o outline
-            self._print_status("GERANDO ESTRUTURA DO EBOOK", True)
-            self._print_status("Analisando tema e definindo capítulos...")
+            ctx.step("GERANDO ESTRUTURA DO EBOOK")
+            ctx.info("Analisando tema e definindo capítulos...")
             
             outline_start = time.time()
-            outline = await self.outline_generator.generate_outline(
-                topic=self._state.topic,
-                goal=self._state.goal,
-                target_audience=target_audience
-            )
-            self._state.book_outline = outline
+            async with asyncio.timeout(ctx.timeout_for(settings.OUTLINE_TIMEOUT_SECONDS)):
+                outline = await self.outline_generator.generate_outline(
+                    topic=state.topic,
+                    goal=state.goal,
+                    target_audience=state.target_audience
+                )
+            state.book_outline = outline
             outline_time = time.time() - outline_start
-            self._state.time_metrics.outline_generation_time = outline_time
+            ctx.metrics.outline_generation_time = outline_time
+            
+            ctx.emit(OutlineReady(chapters=[chapter.title for chapter in outline], outline=outline))
             
             # Mostra estrutura gerada
-            self._print_success(f"Estrutura gerada com {len(outline)} capítulos em {self._format_time(outline_time)}")
+            ctx.success(f"Estrutura gerada com {len(outline)} capítulos em {self._format_time(outline_time)}")
             for idx, chapter in enumerate(outline, 1):
-                self._print_status(f"Capítulo {idx}: {chapter.title}")
-                self._print_status(f"   Descrição: {chapter.description}")
-                self._print_status(f"   Tamanho esperado: {chapter.expected_length}")
+                ctx.info(f"Capítulo {idx}: {chapter.title}")
+                ctx.info(f"   Descrição: {chapter.description}")
+                ctx.info(f"   Tamanho esperado: {chapter.expected_length}")
+            
+            # Pesquisa compartilhada entre os capítulos
+            if self.researcher and settings.SHARED_RESEARCH_ENABLED:
+                ctx.step("PESQUISANDO FONTES DO LIVRO")
+                research_start = time.time()
+                async with asyncio.timeout(ctx.remaining()):
+                    state.research = await self.researcher.research_book(
+                        outline,
+                        {"topic": state.topic, "goal": state.goal}
+                    )
+                ctx.success(
+                    f"{len(state.research.sources)} fontes reunidas em "
+                    f"{self._format_time(time.time() - research_start)}"
+                )
+            
+            # Ajusta a geração ao prazo restante
+            book_context = self._book_context(state, book_type)
+            self._fit_to_deadline(ctx, book_context, state.book_outline)
+            book_context["timeout"] = self._chapter_timeout(ctx)
             
             # Calcula e mostra estimativa
-            total_estimated_time = self._estimate_total_time()
+            total_estimated_time = self._estimate_total_time(state)
             estimated_completion = datetime.now() + timedelta(seconds=total_estimated_time)
-            self._state.time_metrics.estimated_completion_time = estimated_completion
+            ctx.metrics.estimated_completion_time = estimated_completion
             
-            self._print_separator()
-            self._print_status("PREVISÃO DE TEMPO", True)
-            self._print_status(f"Tempo estimado total: {self._format_time(total_estimated_time)}")
-            self._print_status(f"Previsão de conclusão: {estimated_completion.strftime('%H:%M:%S')}")
-            self._print_status(f"Gerando {settings.MAX_CONCURRENT_CHAPTERS} capítulos simultaneamente")
+            ctx.step("PREVISÃO DE TEMPO")
+            ctx.info(f"Tempo estimado total: {self._format_time(total_estimated_time)}")
+            ctx.info(f"Previsão de conclusão: {estimated_completion.strftime('%H:%M:%S')}")
+            ctx.info(f"Gerando {settings.MAX_CONCURRENT_CHAPTERS} capítulos simultaneamente")
 
             # Escreve os capítulos em paralelo
-            self._print_status("GERANDO CONTEÚDO DOS CAPÍTULOS", True)
-            chapters = await self._write_chapters_parallel()
-            self._state.book = chapters
+            ctx.step("GERANDO CONTEÚDO DOS CAPÍTULOS")
+            await self._open_book(ctx)
+            # Ao fim do prazo as tasks pendentes são canceladas pelo TaskGroup
+            async with asyncio.timeout(ctx.remaining()):
+                chapters = await self._write_chapters(ctx, book_context, state.book_outline)
+            state.book = chapters
 
-            # Finaliza métricas de tempo
-            total_time = time.time() - start_time
-            self._state.time_metrics.total_generation_time = total_time
-            
-            self._print_status("RESUMO DA GERAÇÃO", True)
-            self._print_success(f"Tempo total de geração: {self._format_time(total_time)}")
-            self._print_status("Tempo por capítulo:")
-            for title, time_taken in self._state.time_metrics.chapter_generation_times.items():
-                self._print_status(f"- {title}: {self._format_time(time_taken)}")
-
-            # Salva o livro
-            self._print_status("SALVANDO EBOOK", True)
-            self._print_status("Convertendo para PDF...")
-            await self._save_book()
-            self._print_success("Ebook gerado e salvo com sucesso!")
-            
-            # Resumo final
-            self._print_status("RESUMO FINAL", True)
-            self._print_status(f"Título: {self._state.title}")
-            self._print_status(f"Total de capítulos: {len(self._state.book)}")
-            self._print_status(f"Tempo total: {self._format_time(total_time)}")
-            if self._state.output_path:
-                self._print_status(f"Arquivo salvo em: {self._state.output_path}")
+            return await self._finish(ctx, start_time)
 
-            return self._state
+        except TimeoutError:
+            raise self._timed_out(ctx, "Falha na geração do livro")
 
         except Exception as e:
-            self._print_error(f"Erro fatal no fluxo do livro: {str(e)}")
+            ctx.error(f"Erro fatal no fluxo do livro: {str(e)}")
+            ctx.emit(RunFailed(error=str(e)))
             raise RuntimeError(f"Falha na geração do livro: {str(e)}")
 
-    async def _write_chapters_parallel(self) -> list[Chapter]:
-        """Escreve todos os capítulos do livro em paralelo."""
-        book_context = {
-            "goal": self._state.goal,
-            "topic": self._state.topic,
-            "target_audience": self._state.target_audience,
-            "outline": [co.model_dump() for co in self._state.book_outline]
+    async def _regenerate(self, ctx: RunContext, book_type: str, diff: OutlineDiff, previous: BookState) -> BookState:
+        """Executa a regeneração incremental de um livro."""
+        state = ctx.state
+        start_time = time.time()
+        ctx.emit(RunStarted(
+            topic=state.topic,
+            target_audience=state.target_audience,
+            book_type=book_type,
+            model=settings.MODEL_NAME,
+            mode="regenerate"
+        ))
+        ctx.step("REGENERANDO EBOOK")
+        ctx.info(f"Tema: {state.topic}")
+
+        # Capítulos inalterados sem conteúdo salvo também precisam ser escritos
+        reused = match_chapters(previous.book_outline or [], previous.book or [])
+        pending = [
+            outline for outline in state.book_outline
+            if outline.chapter_id not in diff.unchanged or outline.chapter_id not in reused
+        ]
+        ctx.info(
+            f"{len(diff.added)} novos, {len(diff.changed)} alterados, "
+            f"{len(diff.unchanged)} inalterados, {len(diff.removed)} removidos"
+        )
+        ctx.emit(OutlineReady(
+            chapters=[outline.title for outline in pending],
+            outline=pending,
+            reused=len(state.book_outline) - len(pending),
+            removed=len(diff.removed)
+        ))
+
+        try:
+            if pending and self.researcher and settings.SHARED_RESEARCH_ENABLED:
+                ctx.step("PESQUISANDO FONTES DOS CAPÍTULOS ALTERADOS")
+                async with asyncio.timeout(ctx.remaining()):
+                    research = await self.researcher.research_book(
+                        pending,
+                        {"topic": state.topic, "goal": state.goal}
+                    )
+                state.research = self._merge_research(state.research, research, state.book_outline)
+
+            book_context = self._book_context(state, book_type)
+            pending = self._fit_to_deadline(ctx, book_context, pending)
+            book_context["timeout"] = self._chapter_timeout(ctx)
+
+            await self._open_book(ctx)
+            pending_ids = {outline.chapter_id for outline in pending}
+            for outline in state.book_outline:
+                if outline.chapter_id not in pending_ids:
+                    await self._stream_chapter(
+                        ctx, reused[outline.chapter_id].model_copy(update={"chapter_id": outline.chapter_id})
+                    )
+
+            written: Dict[str, Chapter] = {}
+            if pending:
+                ctx.step("GERANDO CONTEÚDO DOS CAPÍTULOS")
+                async with asyncio.timeout(ctx.remaining()):
+                    chapters = await self._write_chapters(ctx, book_context, pending)
+                written = {chapter.chapter_id: chapter for chapter in chapters}
+
+            state.book = [
+                written.get(outline.chapter_id)
+                or reused[outline.chapter_id].model_copy(update={"chapter_id": outline.chapter_id})
+                for outline in state.book_outline
+            ]
+            return await self._finish(ctx, start_time)
+
+        except TimeoutError:
+            raise self._timed_out(ctx, "Falha na regeneração do livro")
+
+        except Exception as e:
+            ctx.error(f"Erro fatal na regeneração do livro: {str(e)}")
+            ctx.emit(RunFailed(error=str(e)))
+            raise RuntimeError(f"Falha na regeneração do livro: {str(e)}")
+
+    @staticmethod
+    def _chapter_timeout(ctx: RunContext) -> Callable[[], float]:
+        """Tempo máximo de cada requisição de capítulo, recalculado quando ela começa."""
+        return lambda: ctx.timeout_for(settings.CHAPTER_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def _timed_out(ctx: RunContext, failure: str) -> RuntimeError:
+        """Registra um TimeoutError: fim do prazo da execução ou limite de uma etapa."""
+        if ctx.expired():
+            ctx.error("Prazo de geração esgotado; tarefas pendentes canceladas")
+            ctx.emit(DeadlineExceeded())
+            return RuntimeError(f"{failure}: prazo esgotado")
+        # Uma etapa (outline, pesquisa ou requisição) excedeu o próprio limite
+        ctx.error("Tempo limite de uma etapa esgotado")
+        ctx.emit(RunFailed(error="tempo limite de etapa esgotado"))
+        return RuntimeError(f"{failure}: tempo limite de etapa esgotado")
+
+    @staticmethod
+    def _merge_research(
+        previous: Optional[ResearchBundle],
+        update: ResearchBundle,
+        outline: List[ChapterOutline]
+    ) -> ResearchBundle:
+        """Combina a pesquisa anterior com a dos capítulos regenerados."""
+        if previous is None:
+            return update
+        chapter_ids = {chapter.chapter_id for chapter in outline}
+        chapter_sources = {
+            chapter_id: source_ids
+            for chapter_id, source_ids in {**previous.chapter_sources, **update.chapter_sources}.items()
+            if chapter_id in chapter_ids
+        }
+        used = {source_id for source_ids in chapter_sources.values() for source_id in source_ids}
+        sources = {
+            source_id: source
+            for source_id, source in {**previous.sources, **update.sources}.items()
+            if source_id in used
         }
+        return ResearchBundle(topic=previous.topic, sources=sources, chapter_sources=chapter_sources)
+
+    async def _finish(self, ctx: RunContext, start_time: float) -> BookState:
+        """Registra as métricas finais e salva o livro."""
+        state = ctx.state
+        # Finaliza métricas de tempo
+        total_time = time.time() - start_time
+        ctx.metrics.total_generation_time = total_time
+        
+        ctx.step("RESUMO DA GERAÇÃO")
+        ctx.success(f"Tempo total de geração: {self._format_time(total_time)}")
+        ctx.info("Tempo por capítulo:")
+        for title, time_taken in ctx.metrics.chapter_generation_times.items():
+            ctx.info(f"- {title}: {self._format_time(time_taken)}")
+        if ctx.metrics.chapter_review_times:
+            ctx.info("Tempo de revisão por capítulo:")
+            for title, time_taken in ctx.metrics.chapter_review_times.items():
+                ctx.info(f"- {title}: {self._format_time(time_taken)}")
+
+        # Salva o livro
+        ctx.step("SALVANDO EBOOK")
+        ctx.info("Convertendo para PDF...")
+        await self._save_book(ctx)
+        ctx.success("Ebook gerado e salvo com sucesso!")
+        ctx.emit(SaveDone(output_path=state.output_path))
+        
+        # Resumo final
+        ctx.step("RESUMO FINAL")
+        ctx.info(f"Título: {state.title}")
+        ctx.info(f"Total de capítulos: {len(state.book)}")
+        ctx.info(f"Tempo total: {self._format_time(total_time)}")
+        if state.output_path:
+            ctx.info(f"Arquivo salvo em: {state.output_path}")
+
+        return state
+
+    @staticmethod
+    def _book_context(state: BookState, book_type: str) -> Dict[str, Any]:
+        """Contexto do livro repassado a cada capítulo."""
+        return {
+            "goal": state.goal,
+            "topic": state.topic,
+            "target_audience": state.target_audience,
+            "book_type": book_type,
+            "outline": [co.model_dump() for co in state.book_outline],
+            "research": state.research
+        }
+
+    async def _write_chapters(
+        self,
+        ctx: RunContext,
+        book_context: Dict[str, Any],
+        outlines: List[ChapterOutline]
+    ) -> list[Chapter]:
+        """Escreve os capítulos informados, com revisão em pipeline se habilitada."""
+        if self.reviewer and settings.ENABLE_REVIEW:
+            return await self._write_and_review_chapters(ctx, book_context, outlines)
+        return await self._write_chapters_parallel(
+            ctx,
+            book_context,
+            outlines,
+            on_chapter=lambda chapter: self._stream_chapter(ctx, chapter)
+        )
 
-        total_chapters = len(self._state.book_outline)
-        self._print_status(f"Iniciando geração de {total_chapters} capítulos")
-        self._print_status(f"Processando {settings.MAX_CONCURRENT_CHAPTERS} capítulos simultaneamente")
+    async def _open_book(self, ctx: RunContext) -> None:
+        """Abre o livro, o EPUB e o backup para gravar os capítulos à medida que ficam prontos."""
+        state = ctx.state
+        filename = self._output_name(ctx)
+        keys = [outline.chapter_id for outline in state.book_outline]
+        ctx.book_writer = await self.book_saver.open_book(state.title, filename, keys)
+        if settings.EXPORT_EPUB:
+            ctx.epub_writer = await self.book_saver.open_epub(state.title, filename, keys, state.language.value)
+        ctx.backup_writer = await self.book_saver.open_backup(filename, keys)
+
+    @staticmethod
+    async def _stream_chapter(ctx: RunContext, chapter: Chapter) -> None:
+        """Grava a versão final de um capítulo no livro, no EPUB e no backup, se abertos."""
+        if ctx.book_writer:
+            await ctx.book_writer.add(chapter.chapter_id, chapter.content)
+        if ctx.epub_writer:
+            await ctx.epub_writer.add(chapter.chapter_id, chapter)
+        if ctx.backup_writer:
+            await ctx.backup_writer.add(chapter.chapter_id, chapter)
+
+    async def _write_chapters_parallel(
+        self,
+        ctx: RunContext,
+        book_context: Dict[str, Any],
+        outlines: List[ChapterOutline],
+        on_chapter: Optional[Callable[[Chapter], Awaitable[None]]] = None
+    ) -> list[Chapter]:
+        """Escreve os capítulos informados em paralelo.
+
+        ``on_chapter`` é aguardado a cada capítulo concluído; se ele bloquear,
+        a entrega do próximo capítulo espera.
+        """
+        total_chapters = len(outlines)
+        ctx.info(f"Iniciando geração de {total_chapters} capítulos")
+        ctx.info(f"Processando {settings.MAX_CONCURRENT_CHAPTERS} capítulos simultaneamente")
+        book_context = {**book_context, "on_request": lambda **metrics: ctx.emit(LlmRequest(**metrics))}
+        if settings.STREAM_CHAPTERS:
+            book_context["on_token"] = lambda title, text: ctx.emit(ChapterToken(title=title, text=text))
         
         try:
             if isinstance(self.chapter_writer, OpenAIService):
                 start_time = time.time()
                 chapters = await self.chapter_writer.write_chapters_parallel(
-                    self._state.book_outline,
-                    book_context
+                    outlines,
+                    book_context,
+                    on_chapter=lambda chapter: self._chapter_written(ctx, chapter, on_chapter),
+                    on_start=lambda outline: ctx.emit(ChapterStarted(title=outline.title, chapter_id=outline.chapter_id)),
+                    on_error=lambda outline, e: ctx.emit(
+                        ChapterFailed(title=outline.title, chapter_id=outline.chapter_id, error=str(e))
+                    )
                 )
-                for chapter in chapters:
+                for outline, chapter in zip(outlines, chapters):
+                    chapter.chapter_id = outline.chapter_id
                     if hasattr(chapter, 'generation_time'):
-                        self._state.time_metrics.chapter_generation_times[chapter.title] = chapter.generation_time
-                        self._print_success(f"Capítulo concluído: {chapter.title} ({self._format_time(chapter.generation_time)})")
+                        ctx.metrics.chapter_generation_times[chapter.title] = chapter.generation_time
+                        ctx.success(f"Capítulo concluído: {chapter.title} ({self._format_time(chapter.generation_time)})")
             else:
                 chapters = []
-                for idx, outline in enumerate(self._state.book_outline, 1):
-                    self._print_status(f"Gerando capítulo {idx}/{total_chapters}: {outline.title}")
+                for idx, outline in enumerate(outlines, 1):
+                    ctx.info(f"Gerando capítulo {idx}/{total_chapters}: {outline.title}")
+                    ctx.emit(ChapterStarted(title=outline.title, chapter_id=outline.chapter_id))
                     start_time = time.time()
-                    chapter = await self.chapter_writer.write_chapter(outline, book_context)
+                    try:
+                        chapter = await self.chapter_writer.write_chapter(outline, book_context)
+                    except Exception as e:
+                        ctx.emit(ChapterFailed(title=outline.title, chapter_id=outline.chapter_id, error=str(e)))
+                        raise
                     generation_time = time.time() - start_time
                     chapter.generation_time = generation_time
-                    self._state.time_metrics.chapter_generation_times[chapter.title] = generation_time
-                    self._print_success(f"Capítulo {idx} concluído em {self._format_time(generation_time)}")
+                    chapter.chapter_id = outline.chapter_id
+                    ctx.metrics.chapter_generation_times[chapter.title] = generation_time
+                    ctx.success(f"Capítulo {idx} concluído em {self._format_time(generation_time)}")
+                    await self._chapter_written(ctx, chapter, on_chapter)
                     chapters.append(chapter)
             
             return chapters
             
         except Exception as e:
-            self._print_error(f"Erro na geração dos capítulos: {str(e)}")
+            ctx.error(f"Erro na geração dos capítulos: {str(e)}")
             raise
 
-    async def _save_book(self) -> None:
+    async def _chapter_written(
+        self,
+        ctx: RunContext,
+        chapter: Chapter,
+        on_chapter: Optional[Callable[[Chapter], Awaitable[None]]] = None
+    ) -> None:
+        """Notifica a conclusão de um capítulo e o repassa à próxima etapa."""
+        ctx.emit(ChapterFinished(
+            title=chapter.title, chapter_id=chapter.chapter_id, generation_time=chapter.generation_time
+        ))
+        if on_chapter:
+            await on_chapter(chapter)
+
+    async def _write_and_review_chapters(
+        self,
+        ctx: RunContext,
+        book_context: Dict[str, Any],
+        outlines: List[ChapterOutline]
+    ) -> list[Chapter]:
+        """Escreve e revisa os capítulos em pipeline.
+
+        Cada capítulo entra numa fila limitada assim que é escrito e é revisado
+        por workers próprios enquanto a escrita continua. Se a fila enche, a
+        entrega dos capítulos seguintes aguarda os revisores.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.REVIEW_QUEUE_SIZE)
+        reviewed: Dict[str, Chapter] = {}
+        workers = settings.MAX_CONCURRENT_REVIEWS
+        ctx.info(f"Revisando até {workers} capítulos simultaneamente")
+
+        async def review_worker() -> None:
+            while True:
+                chapter = await queue.get()
+                if chapter is None:
+                    return
+                result = await self._review_chapter(ctx, chapter, book_context)
+                reviewed[chapter.chapter_id] = result
+                await self._stream_chapter(ctx, result.model_copy(update={"chapter_id": chapter.chapter_id}))
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(workers):
+                tg.create_task(review_worker())
+            written = await self._write_chapters_parallel(ctx, book_context, outlines, on_chapter=queue.put)
+            for _ in range(workers):
+                await queue.put(None)
+
+        return [
+            reviewed.get(chapter.chapter_id, chapter).model_copy(update={"chapter_id": chapter.chapter_id})
+            for chapter in written
+        ]
+
+    async def _review_chapter(self, ctx: RunContext, chapter: Chapter, book_context: Dict[str, Any]) -> Chapter:
+        """Revisa um capítulo; em caso de falha mantém a versão escrita."""
+        start_time = time.time()
+        try:
+            reviewed = await self.reviewer.review(chapter, book_context)
+        except Exception as e:
+            ctx.warning(f"Revisão de '{chapter.title}' falhou, mantendo a versão original: {str(e)}")
+            return chapter
+        review_time = time.time() - start_time
+        ctx.metrics.chapter_review_times[chapter.title] = review_time
+        ctx.success(f"Capítulo revisado: {chapter.title} ({self._format_time(review_time)})")
+        ctx.emit(ChapterReviewed(title=chapter.title, chapter_id=chapter.chapter_id, review_time=review_time))
+        return reviewed
+
+    async def _save_book(self, ctx: RunContext) -> None:
         """Salva o livro em PDF e faz backup do estado."""
-        filename = self._sanitize_filename(self._state.topic)
+        state = ctx.state
+        filename = self._output_name(ctx)
         try:
-            await self.book_saver.save_pdf(self._state, filename)
-            await self.book_saver.save_backup(self._state, filename)
+            if ctx.book_writer:
+                state.output_path = str(await ctx.book_writer.commit())
+                ctx.info(f"Arquivo markdown salvo em: {state.output_path}")
+                self._schedule_pdf(ctx)
+            else:
+                await self.book_saver.save_pdf(state, filename)
+            if ctx.epub_writer:
+                state.epub_path = str(await ctx.epub_writer.commit())
+                ctx.info(f"EPUB salvo em: {state.epub_path}")
+            if ctx.backup_writer:
+                await ctx.backup_writer.commit(state)
+            else:
+                await self.book_saver.save_backup(state, filename)
+            if state.research:
+                await self.book_saver.save_research(state.research, filename)
+            await self.book_saver.save_state(state, filename)
         except Exception as e:
-            self.logger.error(f"Erro ao salvar livro: {str(e)}")
+            ctx.error(f"Erro ao salvar livro: {str(e)}")
             raise
 
+    def _schedule_pdf(self, ctx: RunContext) -> None:
+        """Converte o livro para PDF em segundo plano.
+
+        A renderização roda no pool de processos do saver e não bloqueia o
+        retorno da execução, então o próximo livro começa enquanto o PDF é gerado.
+        """
+        if not settings.RENDER_PDF:
+            return
+        ctx.info("Convertendo para PDF em segundo plano...")
+        task = asyncio.create_task(self._render_pdf(ctx), name=f"pdf-{ctx.run_id}")
+        self._renders.add(task)
+        task.add_done_callback(self._renders.discard)
+
+    async def _render_pdf(self, ctx: RunContext) -> None:
+        try:
+            pdf_path = await self.book_saver.render_pdf(ctx.state)
+        except Exception as e:
+            ctx.warning(f"Falha ao gerar o PDF de '{ctx.state.title}': {str(e)}")
+            return
+        if pdf_path is None:
+            # O saver não gera PDF
+            return
+        ctx.success(f"PDF salvo em: {pdf_path}")
+        ctx.emit(PdfRendered(output_path=str(pdf_path)))
+
+    @classmethod
+    def _output_name(cls, ctx: RunContext) -> str:
+        """Nome dos arquivos da execução: o tema seguido do run_id.
+
+        O run_id evita que execuções simultâneas sobre o mesmo tema (pelo
+        servidor ou em lote) sobrescrevam os arquivos umas das outras.
+        """
+        return cls._sanitize_filename(f"{ctx.state.topic} {ctx.run_id}")
+
     @staticmethod
     def _sanitize_filename(filename: str) -> str:
         """Sanitiza o nome do arquivo removendo caracteres especiais."""
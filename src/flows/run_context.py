@@ -0,0 +1,73 @@
+import time
+import uuid
+from typing import Optional
+
+from src.core.events import BookEvent, EventBus, StatusMessage
+from src.core.export.backup_archive import BackupArchiveWriter
+from src.core.export.epub_writer import StreamingEpubWriter
+from src.core.export.streaming_writer import StreamingBookWriter
+from src.models.book_models import BookState, TimeMetrics
+
+class RunContext:
+    """Contexto de uma execução do BookFlow.
+
+    Reúne tudo o que pertence a um único livro — estado, métricas, prazo e
+    arquivos abertos — para que uma mesma instância de BookFlow possa
+    atender vários livros ao mesmo tempo. O progresso é publicado como
+    eventos no barramento, marcados com o run_id. Para cancelar uma
+    execução, cancele a task que aguarda ``BookFlow.execute``.
+    """
+
+    def __init__(
+        self,
+        state: BookState,
+        bus: EventBus,
+        run_id: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
+    ):
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self.state = state
+        self.bus = bus
+        self.book_writer: Optional[StreamingBookWriter] = None  # markdown gravado durante a geração
+        self.backup_writer: Optional[BackupArchiveWriter] = None  # backup gravado durante a geração
+        self.epub_writer: Optional[StreamingEpubWriter] = None  # EPUB gravado durante a geração
+
+    @property
+    def metrics(self) -> TimeMetrics:
+        return self.state.time_metrics
+
+    def remaining(self) -> Optional[float]:
+        """Segundos restantes até o prazo (None se a execução não tem prazo)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self) -> bool:
+        """Indica se o prazo da execução já passou."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def timeout_for(self, phase_timeout: float) -> float:
+        """Tempo máximo de uma etapa, limitado pelo prazo restante."""
+        remaining = self.remaining()
+        return phase_timeout if remaining is None else min(phase_timeout, remaining)
+
+    def emit(self, event: BookEvent) -> None:
+        """Publica um evento da execução sem bloquear."""
+        event.run_id = self.run_id
+        self.bus.publish(event)
+
+    def step(self, message: str) -> None:
+        self.emit(StatusMessage(level="step", message=message))
+
+    def info(self, message: str) -> None:
+        self.emit(StatusMessage(level="info", message=message))
+
+    def success(self, message: str) -> None:
+        self.emit(StatusMessage(level="success", message=message))
+
+    def warning(self, message: str) -> None:
+        self.emit(StatusMessage(level="warning", message=message))
+
+    def error(self, message: str) -> None:
+        self.emit(StatusMessage(level="error", message=message))
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from src.models.book_models import Chapter, ChapterOutline
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from src.models.book_models import Chapter, ChapterOutline, ResearchBundle
 
 class IBookOutlineGenerator(ABC):
     """Interface para geração de outline do livro."""
@@ -27,6 +28,30 @@ class IChapterWriter(ABC):
         """Escreve um capítulo do livro."""
         pass
 
+class IChapterReviewer(ABC):
+    """Interface para revisão de capítulos."""
+    
+    @abstractmethod
+    async def review(
+        self,
+        chapter: Chapter,
+        context: Dict[str, Any]
+    ) -> Chapter:
+        """Revisa um capítulo e retorna a versão melhorada."""
+        pass
+
+class IBookResearcher(ABC):
+    """Interface para a pesquisa compartilhada do livro."""
+    
+    @abstractmethod
+    async def research_book(
+        self,
+        outline: List[ChapterOutline],
+        context: Dict[str, Any]
+    ) -> ResearchBundle:
+        """Pesquisa as fontes de todos os capítulos do livro."""
+        pass
+
 class IBookSaver(ABC):
     """Interface para salvar o livro."""
     
@@ -37,5 +62,40 @@ class IBookSaver(ABC):
     
     @abstractmethod
     async def save_backup(self, state: Any, filename: str) -> None:
-        """Salva um backup do estado em formato markdown."""
-        pass
\ No newline at end of file
+        """Salva um backup do estado do livro."""
+        pass
+    
+    @abstractmethod
+    async def save_research(self, research: ResearchBundle, filename: str) -> Any:
+        """Salva a pesquisa compartilhada do livro."""
+        pass
+    
+    @abstractmethod
+    async def save_state(self, state: Any, filename: str) -> Any:
+        """Salva o estado completo do livro, para regenerações futuras."""
+        pass
+    
+    @abstractmethod
+    async def load_state(self, filename: str) -> Any:
+        """Carrega o estado salvo por ``save_state``."""
+        pass
+    
+    async def open_book(self, title: str, filename: str, keys: List[str]) -> Optional[Any]:
+        """Abre o markdown do livro para gravação incremental (None se não suportado)."""
+        return None
+    
+    async def open_epub(self, title: str, filename: str, keys: List[str], language: str) -> Optional[Any]:
+        """Abre o EPUB do livro para gravação incremental (None se não suportado)."""
+        return None
+    
+    async def open_backup(self, filename: str, keys: List[str]) -> Optional[Any]:
+        """Abre o backup do livro para gravação incremental (None se não suportado)."""
+        return None
+    
+    async def render_pdf(self, state: Any) -> Optional[Path]:
+        """Converte o livro salvo em PDF (None se não suportado)."""
+        return None
+    
+    async def aclose(self) -> None:
+        """Libera os recursos do saver."""
+        pass
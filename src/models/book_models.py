@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from enum import Enum
 from datetime import datetime
+import uuid
 from src.core.config.settings import OutputLanguage
 
 class ChapterLength(str, Enum):
@@ -13,6 +14,7 @@ class ChapterLength(str, Enum):
 
 class ChapterOutline(BaseModel):
     """Estrutura do outline de um capítulo."""
+    chapter_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:12])  # identidade estável entre edições
     title: str
     description: str
     topics: List[str]
@@ -23,12 +25,14 @@ class Chapter(BaseModel):
     title: str
     content: str
     generation_time: Optional[float] = None  # tempo em segundos
+    chapter_id: Optional[str] = None  # chapter_id do outline que originou o capítulo
 
 class TimeMetrics(BaseModel):
     """Métricas de tempo do processo de geração."""
     start_time: datetime
     outline_generation_time: Optional[float] = None
     chapter_generation_times: Dict[str, float] = {}  # título do capítulo -> tempo em segundos
+    chapter_review_times: Dict[str, float] = {}  # título do capítulo -> tempo de revisão em segundos
     total_generation_time: Optional[float] = None
     estimated_completion_time: Optional[datetime] = None
 
@@ -38,6 +42,27 @@ class Book(BaseModel):
     chapters: List[Chapter]
     language: OutputLanguage = OutputLanguage.PORTUGUESE
 
+class ResearchSource(BaseModel):
+    """Fonte encontrada na pesquisa do livro."""
+    source_id: str
+    title: str
+    url: str
+    snippet: str = ""
+
+class ResearchBundle(BaseModel):
+    """Pesquisa compartilhada do livro, com as fontes de cada capítulo."""
+    topic: str
+    sources: Dict[str, ResearchSource] = {}  # id da fonte -> fonte
+    chapter_sources: Dict[str, List[str]] = {}  # chapter_id do outline -> ids das fontes
+
+    def slice_for(self, chapter_id: str) -> str:
+        """Retorna o trecho compacto da pesquisa usado por um capítulo."""
+        lines = []
+        for idx, source_id in enumerate(self.chapter_sources.get(chapter_id, []), 1):
+            source = self.sources[source_id]
+            lines.append(f"[{idx}] {source.title} — {source.snippet} ({source.url})")
+        return "\n".join(lines)
+
 class BookState(BaseModel):
     """Estado do livro durante o processo de geração."""
     title: str
@@ -47,5 +72,9 @@ class BookState(BaseModel):
     language: OutputLanguage = OutputLanguage.PORTUGUESE
     book_outline: Optional[List[ChapterOutline]] = None
     book: Optional[List[Chapter]] = None
+    research: Optional[ResearchBundle] = None
+    degradations: List[str] = []  # ajustes aplicados para cumprir o prazo
     output_path: Optional[str] = None
-    time_metrics: TimeMetrics = TimeMetrics(start_time=datetime.now())
+    pdf_path: Optional[str] = None
+    epub_path: Optional[str] = None
+    time_metrics: TimeMetrics = Field(default_factory=lambda: TimeMetrics(start_time=datetime.now()))
@@ -0,0 +1,6 @@
+"""Pacote do servidor HTTP de jobs de geração de livros."""
+
+from .app import create_app
+from .jobs import Job, JobManager, JobRequest, JobStatus
+
+__all__ = ['Job', 'JobManager', 'JobRequest', 'JobStatus', 'create_app']
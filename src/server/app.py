@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import web
+from pydantic import ValidationError
+
+from src.core.run_repository import RunRepository
+from src.server.jobs import FINAL_STATUSES, JobFinishedError, JobManager, JobRequest, JobStatus, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+MANAGER_KEY = web.AppKey("job_manager", JobManager)
+RUNS_KEY = web.AppKey("run_repository", RunRepository)
+MAX_RUNS_PAGE = 500
+
+def _job_or_404(request: web.Request):
+    job = request.app[MANAGER_KEY].get(request.match_info["job_id"])
+    if not job:
+        raise web.HTTPNotFound(text="Job não encontrado")
+    return job
+
+async def submit_job(request: web.Request) -> web.Response:
+    """POST /jobs — enfileira a geração de um livro."""
+    try:
+        job_request = JobRequest.model_validate(await request.json())
+    except (ValidationError, ValueError) as e:
+        raise web.HTTPBadRequest(text=str(e))
+    try:
+        job = request.app[MANAGER_KEY].submit(job_request)
+    except QueueFullError as e:
+        raise web.HTTPServiceUnavailable(text=str(e))
+    return web.json_response(job.model_dump(mode="json"), status=202)
+
+async def get_job(request: web.Request) -> web.Response:
+    """GET /jobs/{job_id} — status do job."""
+    return web.json_response(_job_or_404(request).model_dump(mode="json"))
+
+async def cancel_job(request: web.Request) -> web.Response:
+    """DELETE /jobs/{job_id} — cancela o job."""
+    try:
+        job = request.app[MANAGER_KEY].cancel(request.match_info["job_id"])
+    except JobFinishedError as e:
+        raise web.HTTPConflict(text=str(e))
+    if not job:
+        raise web.HTTPNotFound(text="Job não encontrado")
+    return web.json_response(job.model_dump(mode="json"))
+
+async def download_job(request: web.Request) -> web.StreamResponse:
+    """GET /jobs/{job_id}/download — arquivo gerado."""
+    job = _job_or_404(request)
+    if job.status != JobStatus.COMPLETED or not job.output_path:
+        raise web.HTTPConflict(text=f"Job ainda não concluído (status: {job.status.value})")
+    path = Path(job.output_path)
+    if not path.exists():
+        raise web.HTTPGone(text="Arquivo gerado não está mais disponível")
+    return web.FileResponse(path, headers={"Content-Disposition": f'attachment; filename="{path.name}"'})
+
+async def stream_events(request: web.Request) -> web.StreamResponse:
+    """GET /jobs/{job_id}/events — progresso do job via server-sent events."""
+    job = _job_or_404(request)
+    manager = request.app[MANAGER_KEY]
+    response = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    await response.prepare(request)
+
+    queue = manager.subscribe(job.job_id)
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=15)
+            except asyncio.TimeoutError:
+                if job.status in FINAL_STATUSES and queue.empty():
+                    break
+                await response.write(b": keep-alive\n\n")
+                continue
+            await response.write(f"event: {event.event}\ndata: {event.model_dump_json()}\n\n".encode("utf-8"))
+            if event.event in {status.value for status in FINAL_STATUSES}:
+                break
+    except ConnectionResetError:
+        logger.debug(f"Cliente SSE desconectado do job {job.job_id}")
+    finally:
+        manager.unsubscribe(job.job_id, queue)
+    return response
+
+async def list_runs(request: web.Request) -> web.Response:
+    """GET /runs — histórico de execuções, com filtros por query string."""
+    query = request.query
+    try:
+        filters = {
+            "topic": query.get("topic"),
+            "status": query.get("status"),
+            "model": query.get("model"),
+            "since": datetime.fromisoformat(query["since"]) if "since" in query else None,
+            "until": datetime.fromisoformat(query["until"]) if "until" in query else None,
+            "min_duration": float(query["min_duration"]) if "min_duration" in query else None,
+            "limit": min(int(query.get("limit", 50)), MAX_RUNS_PAGE),
+            "offset": int(query.get("offset", 0))
+        }
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    runs = await asyncio.to_thread(request.app[RUNS_KEY].list_runs, **filters)
+    return web.json_response([run.model_dump(mode="json") for run in runs])
+
+async def list_requests(request: web.Request) -> web.Response:
+    """GET /requests — requisições ao modelo de linguagem, por modelo e data."""
+    query = request.query
+    try:
+        filters = {
+            "model": query.get("model"),
+            "since": datetime.fromisoformat(query["since"]) if "since" in query else None,
+            "until": datetime.fromisoformat(query["until"]) if "until" in query else None,
+            "limit": min(int(query.get("limit", 50)), MAX_RUNS_PAGE),
+            "offset": int(query.get("offset", 0))
+        }
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    requests = await asyncio.to_thread(request.app[RUNS_KEY].list_requests, **filters)
+    return web.json_response([record.model_dump(mode="json") for record in requests])
+
+async def get_run(request: web.Request) -> web.Response:
+    """GET /runs/{run_id} — execução com outline, métricas dos capítulos e requisições."""
+    run = await asyncio.to_thread(request.app[RUNS_KEY].get_run, request.match_info["run_id"])
+    if not run:
+        raise web.HTTPNotFound(text="Execução não encontrada")
+    return web.json_response(run.model_dump(mode="json"))
+
+def create_app(manager: JobManager, runs: Optional[RunRepository] = None) -> web.Application:
+    """Cria a aplicação aiohttp do servidor de jobs.
+
+    Com um repositório de execuções, expõe também as consultas em ``/runs``
+    e ``/requests``.
+    """
+    app = web.Application()
+    app[MANAGER_KEY] = manager
+
+    async def on_startup(_: web.Application) -> None:
+        await manager.start()
+
+    async def on_cleanup(_: web.Application) -> None:
+        await manager.stop()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.add_routes([
+        web.post("/jobs", submit_job),
+        web.get("/jobs/{job_id}", get_job),
+        web.delete("/jobs/{job_id}", cancel_job),
+        web.get("/jobs/{job_id}/events", stream_events),
+        web.get("/jobs/{job_id}/download", download_job),
+    ])
+    if runs is not None:
+        app[RUNS_KEY] = runs
+        app.add_routes([
+            web.get("/runs", list_runs),
+            web.get("/runs/{run_id}", get_run),
+            web.get("/requests", list_requests),
+        ])
+    return app
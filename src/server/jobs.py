@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from src.flows.book_flow import BookFlow
+
+logger = logging.getLogger(__name__)
+
+class JobStatus(str, Enum):
+    """Estados possíveis de um job de geração."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+FINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+class JobRequest(BaseModel):
+    """Dados de entrada de um job."""
+    topic: str = Field(..., min_length=3)
+    target_audience: str = Field(..., min_length=3)
+    book_type: str = Field(default="Guia Prático", min_length=3)
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+
+class Job(BaseModel):
+    """Job de geração de um livro."""
+    job_id: str
+    request: JobRequest
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    total_chapters: Optional[int] = None
+    completed_chapters: int = 0
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+
+class JobEvent(BaseModel):
+    """Evento de progresso de um job, transmitido via SSE."""
+    job_id: str
+    event: str
+    data: Dict[str, Any] = {}
+    timestamp: float = Field(default_factory=time.time)
+
+class QueueFullError(Exception):
+    """A fila de jobs atingiu a capacidade máxima."""
+
+class JobFinishedError(Exception):
+    """O job já terminou e não pode mais ser cancelado."""
+
+class JobManager:
+    """Fila assíncrona de jobs consumida por um pool de workers.
+
+    Cada worker executa um BookFlow por vez; o progresso de cada job é
+    mantido em um histórico e repassado aos assinantes SSE sem bloquear
+    a geração (assinantes lentos perdem eventos em vez de atrasá-la).
+    Jobs concluídos ficam consultáveis por ``finished_ttl`` segundos, até
+    no máximo ``max_finished_jobs``; depois são esquecidos com o histórico.
+    """
+
+    def __init__(
+        self,
+        flow_factory: Callable[[], BookFlow],
+        workers: int,
+        max_queue_size: int,
+        subscriber_buffer: int = 100,
+        max_finished_jobs: int = 1000,
+        finished_ttl: Optional[float] = 3600
+    ):
+        """Inicializa o gerenciador.
+
+        Args:
+            flow_factory: Retorna o BookFlow que executa os jobs
+            workers: Número de jobs executados simultaneamente
+            max_queue_size: Capacidade da fila de espera
+            subscriber_buffer: Eventos pendentes por assinante antes de descartar
+            max_finished_jobs: Jobs concluídos mantidos em memória
+            finished_ttl: Segundos que um job concluído permanece consultável (None: sem prazo)
+        """
+        self.flow_factory = flow_factory
+        self.workers = workers
+        self.subscriber_buffer = subscriber_buffer
+        self.max_finished_jobs = max_finished_jobs
+        self.finished_ttl = finished_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._history: Dict[str, List[JobEvent]] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._finished: Dict[str, float] = {}  # job_id -> instante da conclusão, em ordem
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Inicia os workers."""
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(idx), name=f"book-worker-{idx}")
+            for idx in range(self.workers)
+        ]
+        logger.info(f"Servidor de jobs iniciado com {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Cancela os jobs em execução e encerra os workers."""
+        for task in self._running.values():
+            task.cancel()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+
+    def submit(self, request: JobRequest) -> Job:
+        """Enfileira um novo job."""
+        self._evict_finished()
+        job = Job(job_id=uuid.uuid4().hex, request=request)
+        try:
+            self._queue.put_nowait(job.job_id)
+        except asyncio.QueueFull:
+            raise QueueFullError("Fila de jobs cheia")
+        self.jobs[job.job_id] = job
+        self._history[job.job_id] = []
+        self._publish(job, "queued", {"position": self._queue.qsize()})
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancela um job na fila ou em execução.
+
+        Returns:
+            Optional[Job]: O job, ou None se ele não existir
+
+        Raises:
+            JobFinishedError: Se o job já terminou
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        if job.status in FINAL_STATUSES:
+            raise JobFinishedError(f"Job já concluído (status: {job.status.value})")
+        task = self._running.get(job_id)
+        if task is not None:
+            # O worker marca o job como cancelado quando a tarefa termina
+            task.cancel()
+        else:
+            # O worker descarta jobs cancelados ao retirá-los da fila
+            self._finish(job, JobStatus.CANCELLED)
+        return job
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Registra um assinante SSE e reenvia o histórico do job."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_buffer)
+        for event in self._history.get(job_id, [])[-self.subscriber_buffer:]:
+            queue.put_nowait(event)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        self._subscribers.get(job_id, set()).discard(queue)
+
+    def _publish(self, job: Job, event: str, data: Dict[str, Any], record: bool = True) -> None:
+        job_event = JobEvent(job_id=job.job_id, event=event, data=data)
+        if record:
+            self._history[job.job_id].append(job_event)
+        for queue in self._subscribers.get(job.job_id, set()):
+            try:
+                queue.put_nowait(job_event)
+            except asyncio.QueueFull:
+                logger.debug(f"Assinante lento: evento {event} descartado para o job {job.job_id}")
+
+    def _finish(self, job: Job, status: JobStatus, **data: Any) -> None:
+        job.status = status
+        job.finished_at = datetime.now()
+        self._publish(job, status.value, data)
+        self._finished[job.job_id] = time.monotonic()
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        """Esquece os jobs concluídos mais antigos que o prazo ou além do limite."""
+        now = time.monotonic()
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            expired = self.finished_ttl is not None and now - finished_at > self.finished_ttl
+            if not expired and len(self._finished) <= self.max_finished_jobs:
+                break
+            del self._finished[job_id]
+            self.jobs.pop(job_id, None)
+            self._history.pop(job_id, None)
+            self._subscribers.pop(job_id, None)
+
+    def _on_progress(self, job: Job, event: str, data: Dict[str, Any]) -> None:
+        """Atualiza o job com os eventos do BookFlow."""
+        if event == "outline_ready":
+            job.total_chapters = len(data["chapters"])
+        elif event == "chapter_finished":
+            job.completed_chapters += 1
+            data = {**data, "completed": job.completed_chapters, "total": job.total_chapters}
+        # Trechos de streaming vão só para os assinantes conectados, sem histórico
+        self._publish(job, event, data, record=event != "chapter_token")
+
+    async def _worker(self, idx: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.jobs.get(job_id)
+                if job is None or job.status != JobStatus.QUEUED:
+                    # Cancelado na fila (e talvez já esquecido)
+                    continue
+                task = asyncio.create_task(self._run(job))
+                self._running[job_id] = task
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    # O próprio worker cancelado (stop) precisa encerrar
+                    if not task.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                    self._finish(job, JobStatus.CANCELLED)
+                finally:
+                    self._running.pop(job_id, None)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        if job.status != JobStatus.QUEUED:
+            # Cancelado entre a retirada da fila e o início da tarefa
+            return
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        self._publish(job, "running", {})
+        try:
+            state = await self.flow_factory().execute(
+                job.request.topic,
+                job.request.target_audience,
+                job.request.book_type,
+                progress_callback=lambda event, data: self._on_progress(job, event, data),
+                run_id=job.job_id,
+                deadline_seconds=job.request.deadline_seconds
+            )
+        except Exception as e:
+            logger.error(f"Job {job.job_id} falhou: {str(e)}")
+            job.error = str(e)
+            self._finish(job, JobStatus.FAILED, error=str(e))
+            return
+        job.output_path = state.output_path
+        self._finish(job, JobStatus.COMPLETED, output_path=state.output_path)
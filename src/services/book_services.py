@@ -1,17 +1,29 @@
 import os
 import logging
 import asyncio
+import hashlib
+import inspect
+import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
 import aiofiles
 import markdown
 from weasyprint import HTML
-from openai import AsyncOpenAI, OpenAIError
+from openai import NOT_GIVEN, AsyncOpenAI, OpenAIError
 import time
 
-from src.models.book_models import Chapter, ChapterOutline, ChapterLength, Book, BookState
-from src.interfaces.book_services import IBookOutlineGenerator, IChapterWriter, IBookSaver
+from urllib.parse import urlsplit, urlunsplit
+
+from src.models.book_models import Chapter, ChapterOutline, ChapterLength, Book, BookState, ResearchBundle, ResearchSource
+from src.interfaces.book_services import IBookOutlineGenerator, IChapterWriter, IBookSaver, IBookResearcher
 from src.core.config.settings import settings
+from src.core.export.backup_archive import BackupArchive, BackupArchiveWriter
+from src.core.export.book_exporter import EXPORT_FORMATS
+from src.core.export.bounded_export import BoundedExporter, BoundedExportReport
+from src.core.export.chapter_store import ChapterStore
+from src.core.export.epub_writer import StreamingEpubWriter
+from src.core.export.pdf_renderer import PdfRenderer
+from src.core.export.streaming_writer import StreamingBookWriter
 
 # Configuração do logger
 logger = logging.getLogger(__name__)
@@ -142,12 +154,24 @@ Responda em formato JSON seguindo este exemplo:
     async def write_chapters_parallel(
         self,
         outlines: List[ChapterOutline],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        on_chapter: Optional[Callable[[Chapter], Union[None, Awaitable[None]]]] = None,
+        on_start: Optional[Callable[[ChapterOutline], None]] = None,
+        on_error: Optional[Callable[[ChapterOutline, Exception], None]] = None
     ) -> List[Chapter]:
-        """Escreve múltiplos capítulos em paralelo."""
+        """Escreve múltiplos capítulos em paralelo.
+        
+        Args:
+            outlines: Outlines dos capítulos
+            context: Contexto do livro
+            on_chapter: Callback (síncrono ou assíncrono) chamado a cada
+                capítulo concluído, fora do semáforo de escrita
+            on_start: Callback chamado quando a escrita de um capítulo começa
+            on_error: Callback chamado quando a escrita de um capítulo falha
+        """
         async with asyncio.TaskGroup() as tg:
             tasks = [
-                tg.create_task(self._write_chapter_with_semaphore(outline, context))
+                tg.create_task(self._write_chapter_with_semaphore(outline, context, on_chapter, on_start, on_error))
                 for outline in outlines
             ]
         
@@ -161,29 +185,71 @@ Responda em formato JSON seguindo este exemplo:
     async def _write_chapter_with_semaphore(
         self,
         outline: ChapterOutline,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        on_chapter: Optional[Callable[[Chapter], Union[None, Awaitable[None]]]] = None,
+        on_start: Optional[Callable[[ChapterOutline], None]] = None,
+        on_error: Optional[Callable[[ChapterOutline, Exception], None]] = None
     ) -> Chapter:
         """Escreve um capítulo usando um semáforo para controle de concorrência."""
         async with self.semaphore:
             logger.info(f"Iniciando geração do capítulo: {outline.title}")
+            if on_start:
+                on_start(outline)
             start_time = time.time()
-            chapter = await self.generate_chapter(outline, context)
+            try:
+                chapter = await self.generate_chapter(outline, context)
+            except Exception as e:
+                if on_error:
+                    on_error(outline, e)
+                raise
             generation_time = time.time() - start_time
             chapter.generation_time = generation_time
             logger.info(f"Capítulo concluído: {outline.title} em {generation_time:.1f}s")
-            return chapter
+        if on_chapter:
+            result = on_chapter(chapter)
+            if inspect.isawaitable(result):
+                await result
+        return chapter
 
     async def write_chapter(self, outline: ChapterOutline, context: Dict[str, Any]) -> Chapter:
         """Escreve um único capítulo do livro."""
         return await self.generate_chapter(outline, context)
 
+    @staticmethod
+    def _request_timeout(context: Dict[str, Any]) -> Any:
+        """Tempo máximo da requisição de um capítulo (NOT_GIVEN se ausente)."""
+        timeout = context.get("timeout", NOT_GIVEN)
+        return timeout() if callable(timeout) else timeout
+
+    @staticmethod
+    def _research_section(outline: ChapterOutline, context: Dict[str, Any]) -> str:
+        """Retorna a seção do prompt com as fontes pesquisadas para o capítulo."""
+        research: Optional[ResearchBundle] = context.get("research")
+        if not research:
+            return ""
+        research_slice = research.slice_for(outline.chapter_id)
+        if not research_slice:
+            return ""
+        return f"""
+Fontes Pesquisadas (use e cite quando relevante):
+{research_slice}
+"""
+
     async def generate_chapter(
         self,
         outline: ChapterOutline,
         context: Dict[str, Any]
     ) -> Chapter:
-        """Gera o conteúdo de um capítulo."""
-        logger.info(f"Gerando capítulo '{outline.title}' usando modelo: {self.model}")
+        """Gera o conteúdo de um capítulo.
+
+        O contexto pode sobrescrever o modelo (``model``), limitar a duração
+        da requisição (``timeout``, em segundos ou uma função que os calcula
+        no início da requisição), receber o texto em streaming
+        (``on_token``, chamado com título e trecho) e as métricas da
+        requisição (``on_request``, chamado com os campos de ``LlmRequest``).
+        """
+        model = context.get("model") or self.model
+        logger.info(f"Gerando capítulo '{outline.title}' usando modelo: {model}")
         max_tokens = {
             ChapterLength.CURTO: 2000,
             ChapterLength.MEDIO: 3000,
@@ -260,7 +326,7 @@ Tópicos Principais: {', '.join(outline.topics)}
 
 Contexto do Livro:
 - Objetivo: {context['goal']}
-
+{self._research_section(outline, context)}
 DIRETRIZES DE QUALIDADE:
 1. Mantenha o mais alto padrão de qualidade e profundidade
 2. Use exemplos práticos e relevantes
@@ -278,79 +344,305 @@ IMPORTANTE:
 - Estruture o conteúdo de forma clara e organizada
 """
 
+        on_request = context.get("on_request")
+        usage = None
+        start_time = time.time()
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            request = dict(
+                model=model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=self.temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                timeout=self._request_timeout(context)
             )
+            on_token = context.get("on_token")
+            if on_token:
+                parts = []
+                stream = await self.client.chat.completions.create(
+                    **request, stream=True, stream_options={"include_usage": True}
+                )
+                async for chunk in stream:
+                    # O último trecho traz só o consumo de tokens, sem choices
+                    usage = getattr(chunk, "usage", None) or usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        on_token(outline.title, delta)
+                content = "".join(parts)
+            else:
+                response = await self.client.chat.completions.create(**request)
+                usage = response.usage
+                content = response.choices[0].message.content
             
-            content = response.choices[0].message.content
-            
+            if on_request:
+                on_request(**self._request_metrics(outline, model, start_time, usage))
             return Chapter(
                 title=outline.title,
                 content=content,
+                chapter_id=outline.chapter_id,
                 topics=outline.topics,
                 expected_length=outline.expected_length
             )
             
         except Exception as e:
             logger.error(f"Erro ao gerar capítulo: {str(e)}")
+            if on_request:
+                on_request(**self._request_metrics(outline, model, start_time, usage), error=str(e))
             raise
 
+    @staticmethod
+    def _request_metrics(outline: ChapterOutline, model: str, start_time: float, usage: Any) -> Dict[str, Any]:
+        """Métricas de uma requisição de capítulo, repassadas a ``on_request``."""
+        return {
+            "title": outline.title,
+            "chapter_id": outline.chapter_id,
+            "model": model,
+            "timestamp": start_time,
+            "duration": time.time() - start_time,
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None)
+        }
+
+class BookResearcher(IBookResearcher):
+    """Pesquisa única do livro, compartilhada por todos os capítulos."""
+
+    def __init__(self, search_tool=None):
+        """Inicializa o serviço de pesquisa.
+        
+        Args:
+            search_tool: Ferramenta de busca com a interface do SerperDevTool
+        """
+        if search_tool is None:
+            from src.tools.search_tools import create_search_tool
+            search_tool = create_search_tool()
+        self.search_tool = search_tool
+        self.semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_RESEARCH)
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Normaliza a URL para deduplicação das fontes."""
+        parts = urlsplit(url.strip())
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+    @staticmethod
+    def _queries_for(outline: ChapterOutline, topic: str) -> List[str]:
+        """Monta as consultas de busca de um capítulo."""
+        queries = [f"{topic} {outline.title}"]
+        queries.extend(f"{topic} {chapter_topic}" for chapter_topic in outline.topics[:2])
+        return queries
+
+    async def _search(self, query: str) -> List[Dict[str, Any]]:
+        """Executa uma busca fora do event loop e retorna os resultados orgânicos."""
+        async with self.semaphore:
+            try:
+                result = await asyncio.to_thread(self.search_tool.run, search_query=query)
+            except Exception as e:
+                logger.warning(f"Falha na pesquisa '{query}': {str(e)}")
+                return []
+        if isinstance(result, str):
+            try:
+                result = json.loads(result)
+            except json.JSONDecodeError:
+                return []
+        return result.get("organic", []) if isinstance(result, dict) else []
+
+    async def research_book(
+        self,
+        outline: List[ChapterOutline],
+        context: Dict[str, Any]
+    ) -> ResearchBundle:
+        """Pesquisa as fontes de todos os capítulos em paralelo e deduplica por URL."""
+        topic = context["topic"]
+        queries = [self._queries_for(chapter, topic) for chapter in outline]
+        async with asyncio.TaskGroup() as tg:
+            tasks = [[tg.create_task(self._search(query)) for query in chapter_queries] for chapter_queries in queries]
+
+        bundle = ResearchBundle(topic=topic)
+        for chapter, chapter_tasks in zip(outline, tasks):
+            source_ids: List[str] = []
+            for task in chapter_tasks:
+                for item in task.result():
+                    url = item.get("link")
+                    if not url:
+                        continue
+                    source_id = hashlib.sha1(self._normalize_url(url).encode("utf-8")).hexdigest()[:12]
+                    if source_id not in bundle.sources:
+                        bundle.sources[source_id] = ResearchSource(
+                            source_id=source_id,
+                            title=item.get("title", ""),
+                            url=url,
+                            snippet=(item.get("snippet") or "")[:settings.RESEARCH_SNIPPET_CHARS]
+                        )
+                    if source_id not in source_ids:
+                        source_ids.append(source_id)
+            bundle.chapter_sources[chapter.chapter_id] = source_ids[:settings.RESEARCH_SOURCES_PER_CHAPTER]
+
+        # Mantém apenas as fontes usadas por algum capítulo
+        used = {source_id for ids in bundle.chapter_sources.values() for source_id in ids}
+        bundle.sources = {source_id: source for source_id, source in bundle.sources.items() if source_id in used}
+        logger.info(
+            f"Pesquisa do livro concluída: {len(bundle.sources)} fontes únicas "
+            f"para {len(outline)} capítulos ({sum(len(q) for q in queries)} buscas)"
+        )
+        return bundle
+
 class BookSaver(IBookSaver):
-    """Serviço para salvar o livro em markdown."""
+    """Serviço para salvar o livro em markdown e PDF."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, pdf_renderer: Optional[PdfRenderer] = None):
         """Inicializa o serviço de salvamento.
         
         Args:
             output_dir: Diretório onde os arquivos serão salvos
+            pdf_renderer: Renderizador de PDF (padrão: pool com PDF_RENDER_WORKERS processos)
         """
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.chapter_store = ChapterStore(
+            self.output_dir / "store",
+            grace_seconds=settings.CHAPTER_STORE_GC_GRACE_SECONDS
+        )
+        self.pdf_renderer = pdf_renderer or PdfRenderer(settings.PDF_RENDER_WORKERS)
+
+    async def open_book(self, title: str, filename: str, keys: List[str]) -> StreamingBookWriter:
+        """Abre o markdown do livro para gravação incremental dos capítulos.
+
+        Args:
+            title: Título do livro
+            filename: Nome base do arquivo
+            keys: Identificadores dos capítulos, na ordem do livro
+        """
+        return await StreamingBookWriter(self.output_dir / f"{filename}.md", title, keys).open()
+
+    async def open_epub(self, title: str, filename: str, keys: List[str], language: str) -> StreamingEpubWriter:
+        """Abre o EPUB do livro para gravação incremental dos capítulos.
+
+        Args:
+            title: Título do livro
+            filename: Nome base do arquivo
+            keys: Identificadores dos capítulos, na ordem do livro
+            language: Idioma do livro
+        """
+        return await StreamingEpubWriter(self.output_dir / f"{filename}.epub", title, keys, language).open()
 
     async def save_pdf(self, book_state: BookState, filename: str) -> None:
-        """Salva o livro em markdown."""
+        """Salva o livro em markdown e o converte para PDF."""
         try:
-            # Salva em markdown
-            markdown_path = self.output_dir / f"{filename}.md"
-            content = f"# {book_state.title}\n\n"
-            
-            # Adiciona os capítulos
-            for chapter in book_state.book:
-                content += f"\n{chapter.content}\n"
-            
-            # Salva o arquivo markdown
-            async with aiofiles.open(markdown_path, 'w', encoding='utf-8') as f:
-                await f.write(content)
+            keys = [str(idx) for idx in range(len(book_state.book))]
+            async with StreamingBookWriter(self.output_dir / f"{filename}.md", book_state.title, keys) as writer:
+                for key, chapter in zip(keys, book_state.book):
+                    await writer.add(key, chapter.content)
+                markdown_path = await writer.commit()
             
             book_state.output_path = str(markdown_path)
             logger.info(f"Arquivo markdown salvo em: {markdown_path}")
+            if settings.RENDER_PDF:
+                await self.render_pdf(book_state)
             
         except Exception as e:
             logger.error(f"Erro ao salvar arquivo: {str(e)}")
             raise
 
+    async def render_pdf(self, book_state: BookState) -> Path:
+        """Converte o markdown salvo do livro em PDF, num processo do pool.
+
+        O event loop fica livre durante a renderização; o caminho do PDF é
+        registrado em ``book_state.pdf_path``.
+        """
+        if not book_state.output_path:
+            raise ValueError("O livro precisa ser salvo em markdown antes da conversão para PDF")
+        pdf_path = Path(await self.pdf_renderer.submit(Path(book_state.output_path)))
+        book_state.pdf_path = str(pdf_path)
+        logger.info(f"PDF salvo em: {pdf_path}")
+        return pdf_path
+
+    async def aclose(self) -> None:
+        """Aguarda as conversões para PDF pendentes e encerra o pool de processos."""
+        await self.pdf_renderer.aclose()
+
+    async def save_research(self, research: ResearchBundle, filename: str) -> Path:
+        """Salva a pesquisa compartilhada do livro em JSON."""
+        research_dir = self.output_dir / "research"
+        research_dir.mkdir(exist_ok=True)
+        research_path = research_dir / f"{filename}.json"
+        async with aiofiles.open(research_path, 'w', encoding='utf-8') as f:
+            await f.write(research.model_dump_json())
+        logger.info(f"Pesquisa do livro salva em: {research_path}")
+        return research_path
+
+    async def save_state(self, book_state: BookState, filename: str) -> Path:
+        """Salva o estado completo do livro em JSON, para regenerações futuras."""
+        state_dir = self.output_dir / "state"
+        state_dir.mkdir(exist_ok=True)
+        state_path = state_dir / f"{filename}.json"
+        async with aiofiles.open(state_path, 'w', encoding='utf-8') as f:
+            await f.write(book_state.model_dump_json())
+        logger.info(f"Estado do livro salvo em: {state_path}")
+        return state_path
+
+    async def load_state(self, filename: str) -> BookState:
+        """Carrega o estado salvo por ``save_state``."""
+        state_path = self.output_dir / "state" / f"{filename}.json"
+        if not state_path.exists():
+            raise ValueError(f"Estado do livro não encontrado: {state_path}")
+        async with aiofiles.open(state_path, 'r', encoding='utf-8') as f:
+            return BookState.model_validate_json(await f.read())
+
+    async def open_backup(self, filename: str, keys: List[str]) -> BackupArchiveWriter:
+        """Abre o backup do livro para gravação dos capítulos durante a geração.
+
+        Args:
+            filename: Nome base do arquivo
+            keys: Identificadores dos capítulos, na ordem do livro
+        """
+        return await BackupArchiveWriter(self._backup_path(filename), keys, self.chapter_store).open()
+
     async def save_backup(self, book_state: BookState, filename: str) -> None:
-        """Salva um backup do livro em formato markdown."""
+        """Salva um backup do livro num único arquivo zip com índice dos capítulos."""
         try:
-            backup_dir = self.output_dir / "backup"
-            backup_dir.mkdir(exist_ok=True)
-            
-            # Salva cada capítulo separadamente
-            for i, chapter in enumerate(book_state.book, 1):
-                chapter_file = backup_dir / f"{filename}_chapter_{i}.md"
-                async with aiofiles.open(chapter_file, 'w', encoding='utf-8') as f:
-                    await f.write(chapter.content)
-            
-            # Salva metadados
-            meta_file = backup_dir / f"{filename}_metadata.txt"
-            async with aiofiles.open(meta_file, 'w', encoding='utf-8') as f:
-                await f.write(f"Title: {book_state.title}\n")
-                await f.write(f"Language: {book_state.language}\n")
+            keys = [chapter.chapter_id or str(idx) for idx, chapter in enumerate(book_state.book)]
+            async with BackupArchiveWriter(self._backup_path(filename), keys, self.chapter_store) as writer:
+                for key, chapter in zip(keys, book_state.book):
+                    await writer.add(key, chapter)
+                backup_path = await writer.commit(book_state)
+            logger.info(f"Backup salvo em: {backup_path}")
                 
         except Exception as e:
             logger.error(f"Erro ao salvar backup: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def load_backup(self, filename: str) -> BookState:
+        """Carrega o estado completo de um backup."""
+        return await asyncio.to_thread(BackupArchive(self._backup_path(filename), self.chapter_store).load_state)
+
+    async def read_backup_chapter(self, filename: str, key: str) -> Chapter:
+        """Lê um único capítulo do backup, sem descomprimir os demais."""
+        return await asyncio.to_thread(
+            BackupArchive(self._backup_path(filename), self.chapter_store).read_chapter, key
+        )
+
+    async def export_backup(
+        self,
+        filename: str,
+        formats: Sequence[str] = tuple(EXPORT_FORMATS)
+    ) -> BoundedExportReport:
+        """Exporta um livro a partir do backup, com memória limitada.
+
+        Os arquivos vão para ``output/export``; o relatório traz o tempo e o
+        pico de memória de cada etapa.
+        """
+        exporter = BoundedExporter(
+            BackupArchive(self._backup_path(filename), self.chapter_store),
+            theme=self.pdf_renderer.theme
+        )
+        report = await asyncio.to_thread(exporter.export, self.output_dir / "export" / filename, formats)
+        logger.info(f"Livro exportado de {filename}: {', '.join(report.paths.values())}")
+        return report
+
+    async def collect_garbage(self) -> int:
+        """Remove do repositório os textos que nenhum backup referencia."""
+        return await asyncio.to_thread(self.chapter_store.collect_garbage, True)
+
+    def _backup_path(self, filename: str) -> Path:
+        return self.output_dir / "backup" / f"{filename}.zip"
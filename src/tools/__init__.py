@@ -0,0 +1,16 @@
+"""Pacote que contém as ferramentas usadas pelos agentes."""
+
+from .local_search import BM25Index, LocalSearchTool, get_local_index
+from .search_cache import CachedSerperDevTool, SearchCache, SearchCacheMetrics, get_search_cache
+from .search_tools import create_search_tool
+
+__all__ = [
+    'BM25Index',
+    'CachedSerperDevTool',
+    'LocalSearchTool',
+    'SearchCache',
+    'SearchCacheMetrics',
+    'create_search_tool',
+    'get_local_index',
+    'get_search_cache'
+]
@@ -0,0 +1,248 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "no", "na", "nos", "nas",
+    "um", "uma", "para", "por", "com", "que", "se", "ao", "the", "of", "and", "to", "in", "is",
+    "for", "on", "with", "an", "be", "are", "this", "that"
+}
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_path ON docs(path);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(terms, tokenize='unicode61');
+"""
+
+# Tabelas do índice invertido anterior ao FTS5, descartadas na migração
+LEGACY_TABLES = ("postings", "terms", "meta", "docs", "files")
+
+def tokenize(text: str) -> List[str]:
+    """Normaliza (minúsculas, sem acentos) e divide o texto em termos."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return [token for token in re.findall(r"\w+", text) if len(token) > 1 and token not in STOPWORDS]
+
+def split_passages(text: str, max_words: int = 300) -> Iterable[Tuple[str, str]]:
+    """Divide um markdown em passagens (título, texto) pelos cabeçalhos."""
+    title = ""
+    buffer: List[str] = []
+
+    def flush():
+        words = " ".join(buffer).split()
+        for start in range(0, len(words), max_words):
+            yield title, " ".join(words[start:start + max_words])
+
+    for line in text.splitlines():
+        heading = re.match(r"^#{1,6}\s+(.*)", line)
+        if heading:
+            yield from flush()
+            buffer = []
+            title = heading.group(1).strip()
+        else:
+            buffer.append(line)
+    yield from flush()
+
+class BM25Index:
+    """Índice BM25 persistido em SQLite (FTS5).
+
+    Cada arquivo do corpus é dividido em passagens, que são os documentos
+    do índice. Os termos já normalizados por ``tokenize`` vão para uma
+    tabela FTS5, e a ordenação (``bm25``), o corte dos k melhores e a
+    leitura das passagens acontecem numa única consulta SQL. As
+    atualizações são incrementais: só arquivos novos, alterados ou
+    removidos desde a última varredura são reindexados.
+    """
+
+    def __init__(self, index_path: Path):
+        """Inicializa o índice.
+
+        Args:
+            index_path: Caminho do banco SQLite do índice
+        """
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # O índice é derivado dos arquivos: formatos antigos são reconstruídos
+                for table in LEGACY_TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna a conexão SQLite da thread atual."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remove_file(self, conn: sqlite3.Connection, path: str) -> None:
+        conn.execute("DELETE FROM passages WHERE rowid IN (SELECT doc_id FROM docs WHERE path = ?)", (path,))
+        conn.execute("DELETE FROM docs WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _add_file(self, conn: sqlite3.Connection, path: Path, mtime: float, size: int) -> int:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        added = 0
+        for title, passage in split_passages(text):
+            tokens = tokenize(f"{title} {passage}")
+            if not tokens:
+                continue
+            cursor = conn.execute(
+                "INSERT INTO docs (path, title, snippet) VALUES (?, ?, ?)",
+                (str(path), title or path.stem, passage[:300])
+            )
+            conn.execute(
+                "INSERT INTO passages (rowid, terms) VALUES (?, ?)",
+                (cursor.lastrowid, " ".join(tokens))
+            )
+            added += 1
+        conn.execute("INSERT OR REPLACE INTO files (path, mtime, size) VALUES (?, ?, ?)", (str(path), mtime, size))
+        return added
+
+    def update(self, roots: Iterable[Path], patterns: Tuple[str, ...] = ("*.md", "*.txt")) -> Dict[str, int]:
+        """Sincroniza o índice com os arquivos dos diretórios informados.
+
+        Returns:
+            Dict[str, int]: Quantidade de arquivos adicionados, atualizados e removidos
+        """
+        current: Dict[str, Tuple[Path, float, int]] = {}
+        for root in roots:
+            root = Path(root).resolve()
+            if not root.exists():
+                continue
+            for pattern in patterns:
+                for path in root.rglob(pattern):
+                    stat = path.stat()
+                    current[str(path)] = (path, stat.st_mtime, stat.st_size)
+
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        with self._write_lock:
+            conn = self._connection()
+            indexed = {row[0]: (row[1], row[2]) for row in conn.execute("SELECT path, mtime, size FROM files")}
+            with conn:
+                for path in indexed.keys() - current.keys():
+                    self._remove_file(conn, path)
+                    stats["removed"] += 1
+                for key, (path, mtime, size) in current.items():
+                    previous = indexed.get(key)
+                    if previous == (mtime, size):
+                        continue
+                    if previous:
+                        self._remove_file(conn, key)
+                        stats["updated"] += 1
+                    else:
+                        stats["added"] += 1
+                    self._add_file(conn, path, mtime, size)
+        if any(stats.values()):
+            logger.info(f"Índice local atualizado: {stats}")
+        return stats
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Retorna as passagens mais relevantes para a consulta (BM25)."""
+        terms = dict.fromkeys(tokenize(query))
+        if not terms:
+            return []
+        # Termos entre aspas: a consulta do usuário nunca é lida como sintaxe FTS5
+        match = " OR ".join(f'"{term}"' for term in terms)
+        rows = self._connection().execute(
+            """
+            SELECT d.path, d.title, d.snippet, best.rank
+            FROM (
+                SELECT rowid, rank FROM passages WHERE passages MATCH ? ORDER BY rank LIMIT ?
+            ) AS best
+            JOIN docs d ON d.doc_id = best.rowid
+            ORDER BY best.rank
+            """,
+            (match, limit)
+        )
+        return [
+            {
+                "title": title,
+                "link": Path(path).as_uri(),
+                "snippet": snippet,
+                "position": position,
+                # bm25() do FTS5 é negativo: quanto menor, mais relevante
+                "score": round(-rank, 4)
+            }
+            for position, (path, title, snippet, rank) in enumerate(rows, 1)
+        ]
+
+class LocalSearchIndex:
+    """Índice BM25 do corpus local e dos livros gerados, com atualização periódica."""
+
+    def __init__(self, index: BM25Index, roots: List[Path], refresh_interval: float):
+        self.index = index
+        self.roots = roots
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reindexa arquivos novos ou alterados, no máximo uma vez por intervalo."""
+        if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+            return
+        with self._refresh_lock:
+            if not force and time.monotonic() - self._last_refresh < self.refresh_interval:
+                return
+            self.index.update(self.roots)
+            self._last_refresh = time.monotonic()
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        self.refresh()
+        return self.index.search(query, limit)
+
+@lru_cache(maxsize=1)
+def get_local_index() -> LocalSearchIndex:
+    """Retorna o índice local compartilhado pelo processo."""
+    return LocalSearchIndex(
+        index=BM25Index(settings.LOCAL_SEARCH_INDEX_PATH),
+        roots=[*settings.LOCAL_SEARCH_CORPUS_DIRS, settings.OUTPUT_DIR],
+        refresh_interval=settings.LOCAL_SEARCH_REFRESH_SECONDS
+    )
+
+class LocalSearchToolSchema(BaseModel):
+    """Input do LocalSearchTool."""
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the local corpus")
+
+class LocalSearchTool(BaseTool):
+    """Busca BM25 offline com a mesma interface do SerperDevTool."""
+
+    name: str = "Search the local knowledge base"
+    description: str = "A tool that can be used to search the local document corpus and previously generated books with a search query."
+    args_schema: Type[BaseModel] = LocalSearchToolSchema
+    n_results: int = 10
+
+    def _run(self, **kwargs: Any) -> Any:
+        search_query = kwargs.get("search_query") or kwargs.get("query")
+        return {
+            "searchParameters": {"q": search_query, "type": "local"},
+            "organic": get_local_index().search(search_query, self.n_results)
+        }
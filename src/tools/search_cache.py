@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from crewai_tools import SerperDevTool
+from pydantic import BaseModel
+
+from src.core.config.settings import settings
+from src.core.disk_lru import DiskLru
+
+logger = logging.getLogger(__name__)
+
+class SearchCacheMetrics(BaseModel):
+    """Métricas de uso do cache de pesquisas."""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # chamadas que aguardaram uma pesquisa idêntica em andamento
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fração das chamadas atendidas sem nova requisição."""
+        total = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+class SearchCache:
+    """Cache em disco, com TTL e single-flight, para resultados de pesquisa.
+
+    As entradas são arquivos JSON nomeados pelo hash da consulta normalizada
+    e dos parâmetros. Quando o tamanho total passa do limite, as entradas
+    menos recentemente usadas são removidas.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float, max_bytes: int):
+        """Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório de persistência
+            ttl: Validade das entradas em segundos
+            max_bytes: Tamanho máximo do cache em disco
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._metrics = SearchCacheMetrics()
+        self._lru = DiskLru(self.cache_dir, "*/*.json", max_bytes, name="Cache de pesquisa")
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Gera a chave do cache a partir da consulta normalizada e dos parâmetros."""
+        normalized = re.sub(r"\s+", " ", (query or "").strip().lower())
+        payload = json.dumps(
+            {"q": normalized, "params": {k: v for k, v in (params or {}).items() if v is not None}},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna o valor em cache ou None se ausente ou expirado."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry["created_at"] > self.ttl:
+            self._lru.remove(path)
+            return None
+
+        if not self._lru.touch(path):
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        """Grava um valor no cache de forma atômica e aplica o limite de tamanho."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps({"created_at": time.time(), "value": value}, ensure_ascii=False)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+        self._lru.add(path, path.stat().st_size)
+
+    def get_or_fetch(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any]
+    ) -> Any:
+        """Retorna o resultado em cache ou executa a pesquisa.
+
+        Chamadas concorrentes com a mesma chave compartilham uma única
+        execução de ``fetch``.
+        """
+        key = self.make_key(query, params)
+        cached = self.get(key)
+        if cached is not None:
+            with self._lock:
+                self._metrics.hits += 1
+            logger.debug(f"Cache de pesquisa (hit): {query}")
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self._metrics.misses += 1
+            else:
+                self._metrics.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def metrics(self) -> SearchCacheMetrics:
+        """Retorna uma cópia das métricas atuais."""
+        entries, size_bytes = self._lru.usage()
+        with self._lock:
+            return self._metrics.model_copy(update={
+                "evictions": self._lru.evictions,
+                "entries": entries,
+                "size_bytes": size_bytes
+            })
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> SearchCache:
+    """Retorna o cache de pesquisas compartilhado pelo processo."""
+    return SearchCache(
+        cache_dir=settings.SEARCH_CACHE_DIR,
+        ttl=settings.SEARCH_CACHE_TTL,
+        max_bytes=settings.SEARCH_CACHE_MAX_MB * 1024 * 1024
+    )
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool com cache em disco e single-flight."""
+
+    def _run(self, **kwargs: Any) -> Any:
+        query = kwargs.get("search_query") or kwargs.get("query")
+        params = {
+            "search_type": kwargs.get("search_type", self.search_type),
+            "n_results": self.n_results,
+            "country": self.country,
+            "location": self.location,
+            "locale": self.locale
+        }
+        return get_search_cache().get_or_fetch(
+            query,
+            params,
+            lambda: super(CachedSerperDevTool, self)._run(**kwargs)
+        )
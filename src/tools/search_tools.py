@@ -0,0 +1,12 @@
+from crewai.tools import BaseTool
+
+from src.core.config.settings import settings
+
+def create_search_tool() -> BaseTool:
+    """Cria a ferramenta de pesquisa dos agentes conforme settings.SEARCH_BACKEND."""
+    if settings.SEARCH_BACKEND == "local":
+        from src.tools.local_search import LocalSearchTool
+        return LocalSearchTool()
+
+    from src.tools.search_cache import CachedSerperDevTool
+    return CachedSerperDevTool(api_key=settings.SERPER_API_KEY)
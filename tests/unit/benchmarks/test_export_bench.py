@@ -0,0 +1,60 @@
+import tracemalloc
+from benchmarks.export_bench import BenchResult, compare, run_benchmarks
+from benchmarks.synthetic import synthetic_book
+
+def result(target="md", chapters=10, seconds=1.0, peak=1000, size=500):
+    return BenchResult(
+        target=target, chapters=chapters, seconds=seconds,
+        traced_peak_bytes=peak, output_bytes=size
+    )
+
+def test_synthetic_book_is_deterministic():
+    """Testa se a mesma semente gera o mesmo livro, com código e tabelas"""
+    book = synthetic_book(3)
+    assert book.book == synthetic_book(3).book
+    assert [c.title for c in book.book] == ["Capítulo 1", "Capítulo 2", "Capítulo 3"]
+    content = book.book[0].content
+    assert "```python" in content
+    assert "| --- | --- | --- |" in content
+    assert synthetic_book(3, seed=1).book[0].content != content
+
+def test_compare_flags_regressions_above_threshold():
+    """Testa se só os aumentos acima do limite contam como regressão"""
+    comparisons = compare(
+        [result(seconds=1.5, peak=1100), result("pdf", 50)],
+        [result(seconds=1.0, peak=1000)],
+        threshold=0.2
+    )
+
+    by_metric = {c.metric: c for c in comparisons}
+    assert set(by_metric) == {"seconds", "traced_peak_bytes", "output_bytes"}  # pdf sem baseline
+    assert by_metric["seconds"].regression and round(by_metric["seconds"].change, 2) == 0.5
+    assert not by_metric["traced_peak_bytes"].regression
+    assert not by_metric["output_bytes"].regression
+
+def test_run_benchmarks_measures_each_case(tmp_path):
+    """Testa se cada formato e tamanho gera um resultado com o tamanho da saída"""
+    def fake_export(target, state, output_base):
+        path = output_base.with_suffix(f".{target}")
+        path.write_text("x" * len(state.book), encoding="utf-8")
+        return path
+
+    results = run_benchmarks([5, 2], ["md", "epub"], export=fake_export)
+    assert [(r.chapters, r.target, r.output_bytes) for r in results] == [
+        (2, "md", 2), (2, "epub", 2), (5, "md", 5), (5, "epub", 5)
+    ]
+    assert all(r.traced_peak_bytes > 0 for r in results)
+
+def test_time_is_measured_without_tracemalloc(tmp_path):
+    """Testa se o tempo vem de uma exportação separada, sem o tracemalloc"""
+    tracing = []
+
+    def fake_export(target, state, output_base):
+        tracing.append(tracemalloc.is_tracing())
+        path = output_base.with_suffix(f".{target}")
+        path.write_text("x", encoding="utf-8")
+        return path
+
+    [result] = run_benchmarks([2], ["md"], export=fake_export)
+    assert tracing == [True, False]
+    assert result.traced_peak_bytes > 0
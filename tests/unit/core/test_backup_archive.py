@@ -0,0 +1,51 @@
+import zipfile
+import pytest
+from src.core.export.backup_archive import BackupArchive, BackupArchiveWriter
+from src.models.book_models import BookState, Chapter
+
+def make_state(n):
+    return BookState(title="Livro", topic="Livro", goal="Objetivo", target_audience="Todos", book=[
+        Chapter(title=f"Capítulo {i}", content=f"Texto {i}", chapter_id=f"c{i}") for i in range(n)
+    ])
+
+@pytest.mark.asyncio
+async def test_chapters_added_out_of_order_keep_book_order(tmp_path):
+    """Testa se o índice segue a ordem do livro mesmo com capítulos fora de ordem"""
+    state = make_state(3)
+    path = tmp_path / "livro.zip"
+    async with BackupArchiveWriter(path, ["c0", "c1", "c2"]) as writer:
+        for chapter in reversed(state.book):
+            await writer.add(chapter.chapter_id, chapter)
+        await writer.commit(state)
+
+    archive = BackupArchive(path)
+    assert [item["key"] for item in archive.index()["chapters"]] == ["c0", "c1", "c2"]
+    assert archive.load_state().book == state.book
+
+@pytest.mark.asyncio
+async def test_chapter_read_without_other_entries(tmp_path):
+    """Testa se um capítulo é lido pela sua própria entrada comprimida"""
+    state = make_state(3)
+    path = tmp_path / "livro.zip"
+    async with BackupArchiveWriter(path, ["c0", "c1", "c2"]) as writer:
+        for chapter in state.book:
+            await writer.add(chapter.chapter_id, chapter)
+        await writer.commit(state)
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.getinfo("chapters/c1.md").compress_type == zipfile.ZIP_DEFLATED
+    assert BackupArchive(path).read_chapter("c1").content == "Texto 1"
+    with pytest.raises(ValueError):
+        BackupArchive(path).read_chapter("c9")
+
+@pytest.mark.asyncio
+async def test_incomplete_backup_is_discarded(tmp_path):
+    """Testa se um backup incompleto não substitui o anterior"""
+    state = make_state(2)
+    path = tmp_path / "livro.zip"
+    with pytest.raises(RuntimeError):
+        async with BackupArchiveWriter(path, ["c0", "c1"]) as writer:
+            await writer.add("c0", state.book[0])
+            await writer.commit(state)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,76 @@
+import asyncio
+import io
+import pytest
+from ebooklib import epub
+from pypdf import PdfReader, PdfWriter
+from src.core.export.backup_archive import BackupArchive, BackupArchiveWriter
+from src.core.export.bounded_export import BoundedExporter, MemoryProfiler
+from src.core.export.chapter_store import ChapterStore
+from src.models.book_models import BookState, Chapter
+
+def fake_render(document, theme=None):
+    """Renderização falsa: uma página por capítulo, uma por página numerada"""
+    writer = PdfWriter()
+    for _ in range(max(1, document.count("<div></div>"))):
+        writer.add_blank_page(width=595, height=842)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def make_archive(tmp_path, chapters, chapter_size=200):
+    """Grava o backup de um livro sintético com o repositório de capítulos"""
+    state = BookState(title="Livro", topic="Livro", goal="Objetivo", target_audience="Todos", book=[
+        Chapter(title=f"Capítulo {i}", content=f"# Capítulo {i}\n\n" + f"Texto {i} " * chapter_size, chapter_id=f"c{i}")
+        for i in range(chapters)
+    ])
+    store = ChapterStore(tmp_path / "store")
+    path = tmp_path / f"livro-{chapters}.zip"
+
+    async def write():
+        async with BackupArchiveWriter(path, [c.chapter_id for c in state.book], store) as writer:
+            for chapter in state.book:
+                await writer.add(chapter.chapter_id, chapter)
+            await writer.commit(state)
+
+    asyncio.run(write())
+    return state, BackupArchive(path, store)
+
+def test_exports_all_formats_from_backup(tmp_path):
+    """Testa a exportação dos três formatos a partir do backup"""
+    state, archive = make_archive(tmp_path, 3)
+    report = BoundedExporter(archive, render=fake_render).export(tmp_path / "export" / "livro")
+
+    markdown = (tmp_path / "export" / "livro.md").read_text(encoding="utf-8")
+    assert markdown == "# Livro\n\n" + "\n\n".join(c.content for c in state.book) + "\n"
+
+    book = epub.read_epub(report.paths["epub"])
+    assert [idref for idref, _ in book.spine] == ["nav", "chapter_1", "chapter_2", "chapter_3"]
+
+    reader = PdfReader(report.paths["pdf"])
+    assert len(reader.pages) == 4
+    assert [item.title for item in reader.outline] == [c.title for c in state.book]
+    assert not list((tmp_path / "export").glob(".*"))
+
+    assert [phase.phase for phase in report.phases] == ["md", "pdf:capitulos", "pdf:montagem", "epub"]
+    assert all(phase.traced_peak_bytes and phase.rss_bytes for phase in report.phases)
+
+def test_unknown_format(tmp_path):
+    """Testa o erro para formatos não suportados"""
+    _, archive = make_archive(tmp_path, 1)
+    with pytest.raises(ValueError):
+        BoundedExporter(archive).export(tmp_path / "livro", formats=["docx"])
+
+def test_peak_memory_does_not_grow_with_book_length(tmp_path):
+    """Testa se o pico de memória de cada etapa independe do número de capítulos"""
+    peaks = {}
+    for chapters in (10, 100):
+        _, archive = make_archive(tmp_path, chapters, chapter_size=2000)
+        exporter = BoundedExporter(archive, render=fake_render, profiler=MemoryProfiler())
+        report = exporter.export(tmp_path / f"livro-{chapters}", formats=["md", "pdf", "epub"])
+        peaks[chapters] = {phase.phase: phase.traced_peak_bytes for phase in report.phases}
+
+    chapter_size = len("Texto 00 ") * 2000
+    for phase in ("md", "pdf:capitulos", "pdf:montagem", "epub"):
+        # Só o índice dos capítulos cresce com o livro, não o texto
+        assert peaks[100][phase] < 100 * chapter_size / 2
+        assert peaks[100][phase] - peaks[10][phase] < 90 * chapter_size / 10
@@ -0,0 +1,99 @@
+import json
+import os
+import pytest
+from src.core.export.chapter_store import ChapterStore
+
+def test_identical_content_stored_once(tmp_path):
+    """Testa se o mesmo texto gera um único arquivo, sem regravação"""
+    store = ChapterStore(tmp_path)
+    digest = store.put("# Capítulo\n\nTexto")
+    blob = next(p for p in store.objects_dir.glob("*/*"))
+    inode = blob.stat().st_ino
+
+    assert store.put("# Capítulo\n\nTexto") == digest
+    assert list(store.objects_dir.glob("*/*")) == [blob]
+    assert blob.stat().st_ino == inode
+    assert store.get(digest) == "# Capítulo\n\nTexto"
+
+def test_put_rewrites_blob_collected_concurrently(tmp_path, monkeypatch):
+    """Testa se um texto removido pela coleta durante o put é gravado de novo"""
+    store = ChapterStore(tmp_path)
+    digest = store.put("Texto")
+    real_utime = os.utime
+
+    def collected_utime(path, *args):
+        os.unlink(path)  # a coleta de outro processo remove o arquivo antes da renovação
+        real_utime(path, *args)
+
+    monkeypatch.setattr("src.core.export.chapter_store.os.utime", collected_utime)
+    assert store.put("Texto") == digest
+    assert store.get(digest) == "Texto"
+
+def test_missing_digest(tmp_path):
+    """Testa o erro ao ler um texto inexistente"""
+    with pytest.raises(ValueError):
+        ChapterStore(tmp_path).get("0" * 64)
+
+def test_refcounts_survive_reload(tmp_path):
+    """Testa se as referências são persistidas entre instâncias"""
+    store = ChapterStore(tmp_path)
+    shared = store.put("comum")
+    store.set_refs("a.zip", [shared, store.put("só a")])
+    store.set_refs("b.zip", [shared])
+
+    reloaded = ChapterStore(tmp_path)
+    assert reloaded.refcount(shared) == 2
+    reloaded.set_refs("a.zip", [])
+    assert reloaded.refcount(shared) == 1
+
+def test_garbage_collection_respects_refs_and_grace(tmp_path):
+    """Testa se a coleta remove apenas textos sem referências e fora da carência"""
+    store = ChapterStore(tmp_path, grace_seconds=60)
+    kept, released = store.put("mantido"), store.put("liberado")
+    store.set_refs("livro.zip", [kept, released])
+    store.set_refs("livro.zip", [kept])
+
+    assert store.collect_garbage() == 0  # ainda dentro da carência
+    old = store._path(released).stat().st_mtime - 120
+    os.utime(store._path(released), (old, old))
+    assert store.collect_garbage() == 1
+    assert store.get(kept) == "mantido"
+    with pytest.raises(ValueError):
+        store.get(released)
+
+def test_full_collection_removes_orphans(tmp_path):
+    """Testa se a coleta completa remove textos que nunca foram referenciados"""
+    store = ChapterStore(tmp_path, grace_seconds=0)
+    orphan = store.put("órfão")
+    assert store.collect_garbage() == 0
+    assert store.collect_garbage(full=True) == 1
+    with pytest.raises(ValueError):
+        store.get(orphan)
+
+def test_concurrent_instances_keep_each_others_refs(tmp_path):
+    """Testa se instâncias distintas não sobrescrevem as referências uma da outra"""
+    first = ChapterStore(tmp_path, grace_seconds=0)
+    second = ChapterStore(tmp_path, grace_seconds=0)
+    shared = first.put("comum")
+    assert first.refcount(shared) == 0
+
+    second.set_refs("b.zip", [shared])
+    first.set_refs("a.zip", [first.put("só a")])
+    first.collect_garbage(full=True)
+
+    assert first.refcount(shared) == 1
+    assert ChapterStore(tmp_path).refcount(shared) == 1
+    assert first.get(shared) == "comum"
+
+def test_legacy_refs_json_is_migrated(tmp_path):
+    """Testa se as referências do antigo refs.json são importadas"""
+    store = ChapterStore(tmp_path, grace_seconds=0)
+    kept = store.put("mantido")
+    (tmp_path / "refs.json").write_text(
+        json.dumps({"refs": {"livro.zip": [kept]}, "released": []}), encoding="utf-8"
+    )
+
+    migrated = ChapterStore(tmp_path, grace_seconds=0)
+    assert migrated.refcount(kept) == 1
+    assert not (tmp_path / "refs.json").exists()
+    assert migrated.collect_garbage(full=True) == 0
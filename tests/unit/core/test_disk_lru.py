@@ -0,0 +1,44 @@
+import os
+from src.core.disk_lru import DiskLru
+
+def write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+def test_evicts_least_recently_used(tmp_path):
+    """Testa se o limite remove os arquivos acessados há mais tempo"""
+    lru = DiskLru(tmp_path, "*/*.bin", max_bytes=20)
+    first, second = write(tmp_path / "a" / "1.bin", 10), write(tmp_path / "a" / "2.bin", 10)
+    lru.add(first, 10)
+    lru.add(second, 10)
+    lru.touch(first)
+    lru.add(write(tmp_path / "a" / "3.bin", 10), 10)
+
+    assert first.exists()
+    assert not second.exists()
+    assert lru.evictions == 1
+    assert lru.usage() == (2, 20)
+
+def test_index_rebuilt_from_modification_times(tmp_path):
+    """Testa se o índice remontado respeita a ordem dos acessos anteriores"""
+    old, recent = write(tmp_path / "a" / "1.bin", 10), write(tmp_path / "a" / "2.bin", 10)
+    os.utime(old, (0, 0))
+
+    lru = DiskLru(tmp_path, "*/*.bin", max_bytes=10)
+    assert lru.usage() == (2, 20)
+    assert lru.evict() == 1
+    assert not old.exists()
+    assert recent.exists()
+
+def test_touch_evicted_file_is_a_miss(tmp_path):
+    """Testa se tocar um arquivo já removido não falha nem o devolve ao índice"""
+    lru = DiskLru(tmp_path, "*/*.bin", max_bytes=10)
+    first = write(tmp_path / "a" / "1.bin", 10)
+    lru.add(first, 10)
+    lru.add(write(tmp_path / "a" / "2.bin", 10), 10)
+    assert not first.exists()
+
+    assert lru.touch(first) is False
+    assert lru.touch(first, 10) is False
+    assert lru.usage() == (1, 10)
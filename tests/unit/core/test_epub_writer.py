@@ -0,0 +1,58 @@
+import zipfile
+import pytest
+from ebooklib import epub
+from src.core.export.epub_writer import EpubBuilder, StreamingEpubWriter
+from src.models.book_models import Chapter
+
+def test_chapters_written_as_they_arrive(tmp_path):
+    """Testa se cada capítulo entra no zip na entrega e o EPUB só aparece no commit"""
+    path = tmp_path / "livro.epub"
+    with EpubBuilder(path, "Livro", ["a", "b"], "pt-BR") as builder:
+        builder.add("b", "Fim", "<h1>Fim</h1>")
+        assert "EPUB/chapter_2.xhtml" in builder._zip.namelist()
+        assert not path.exists()
+        builder.add("a", "Início & meio", "<h1>Início</h1><p>texto</p>")
+        builder.commit()
+
+    with zipfile.ZipFile(path) as archive:
+        first = archive.infolist()[0]
+        assert (first.filename, first.compress_type) == ("mimetype", zipfile.ZIP_STORED)
+        assert archive.read("mimetype") == b"application/epub+zip"
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    book = epub.read_epub(str(path))
+    assert book.title == "Livro"
+    assert book.get_metadata("DC", "language")[0][0] == "pt-BR"
+    spine = [book.get_item_with_id(idref).file_name for idref, _ in book.spine]
+    assert spine == ["nav.xhtml", "chapter_1.xhtml", "chapter_2.xhtml"]
+    assert "<p>texto</p>" in book.get_item_with_href("chapter_1.xhtml").get_content().decode("utf-8")
+
+def test_rejects_unknown_and_repeated_chapters(tmp_path):
+    """Testa os erros para capítulos desconhecidos ou repetidos"""
+    with EpubBuilder(tmp_path / "livro.epub", "Livro", ["a"]) as builder:
+        with pytest.raises(ValueError):
+            builder.add("x", "X", "")
+        builder.add("a", "A", "")
+        with pytest.raises(ValueError):
+            builder.add("a", "A", "")
+
+def test_incomplete_book_is_discarded(tmp_path):
+    """Testa se um EPUB incompleto não é publicado"""
+    path = tmp_path / "livro.epub"
+    with EpubBuilder(path, "Livro", ["a", "b"]) as builder:
+        builder.add("a", "A", "")
+        with pytest.raises(RuntimeError):
+            builder.commit()
+
+    assert not path.exists()
+    assert not list(tmp_path.iterdir())
+
+@pytest.mark.asyncio
+async def test_streaming_writer_converts_markdown(tmp_path):
+    """Testa se o writer assíncrono converte o markdown dos capítulos"""
+    async with StreamingEpubWriter(tmp_path / "livro.epub", "Livro", ["1"], "en-US") as writer:
+        await writer.add("1", Chapter(title="Um", content="# Um\n\n*texto*"))
+        path = await writer.commit()
+
+    content = epub.read_epub(str(path)).get_item_with_href("chapter_1.xhtml").get_content().decode("utf-8")
+    assert "<em>texto</em>" in content
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import pytest
+from src.core.events import (
+    BookEvent, CallbackSubscriber, ChapterFinished, ChapterToken, CoalescibleEvent, ConsoleRenderer,
+    EventBus, JsonlSubscriber, MetricsSubscriber, RunStarted, StatusMessage, Subscriber
+)
+
+class SlowSubscriber(Subscriber):
+    """Assinante que demora para processar cada evento"""
+
+    def __init__(self, delay=0.05, buffer_size=1000):
+        super().__init__(buffer_size)
+        self.delay = delay
+        self.received = []
+
+    async def handle(self, event):
+        await asyncio.sleep(self.delay)
+        self.received.append(event)
+
+class FailingSubscriber(Subscriber):
+    async def handle(self, event):
+        raise RuntimeError("falha")
+
+@pytest.mark.asyncio
+async def test_publish_does_not_wait_for_slow_subscriber():
+    """Testa se publicar não aguarda o processamento dos assinantes"""
+    slow = SlowSubscriber(delay=0.5)
+    bus = EventBus([slow])
+
+    start = asyncio.get_running_loop().time()
+    for idx in range(10):
+        bus.publish(RunStarted(run_id="r1", topic=f"Tema {idx}"))
+    assert asyncio.get_running_loop().time() - start < 0.05
+
+    slow.delay = 0
+    await bus.aclose()
+    assert [e.topic for e in slow.received] == [f"Tema {idx}" for idx in range(10)]
+
+@pytest.mark.asyncio
+async def test_tokens_are_coalesced_for_slow_subscriber():
+    """Testa se tokens pendentes do mesmo capítulo são combinados"""
+    slow = SlowSubscriber(delay=0.05)
+    fast = SlowSubscriber(delay=0)
+    bus = EventBus([slow, fast])
+
+    for word in ["Era ", "uma ", "vez"]:
+        bus.publish(ChapterToken(run_id="r1", title="Cap 1", text=word))
+    await bus.aclose()
+
+    assert "".join(e.text for e in slow.received) == "Era uma vez"
+    assert len(slow.received) < 3
+    assert slow.coalesced > 0
+    # A combinação não altera os eventos entregues aos outros assinantes
+    assert "".join(e.text for e in fast.received) == "Era uma vez"
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_events():
+    """Testa o descarte de eventos quando a fila do assinante enche"""
+    slow = SlowSubscriber(delay=0, buffer_size=3)
+    bus = EventBus([slow])
+    for idx in range(5):
+        bus.publish(ChapterFinished(run_id="r1", title=f"Cap {idx}"))
+    await bus.aclose()
+
+    assert len(slow.received) == 3
+    assert slow.dropped == 2
+
+@pytest.mark.asyncio
+async def test_failing_subscriber_does_not_affect_others():
+    """Testa se a falha de um assinante não interrompe os demais"""
+    ok = SlowSubscriber(delay=0)
+    bus = EventBus([FailingSubscriber(), ok])
+    bus.publish(RunStarted(run_id="r1", topic="Python"))
+    bus.publish(RunStarted(run_id="r1", topic="Rust"))
+    await bus.aclose()
+
+    assert len(ok.received) == 2
+
+@pytest.mark.asyncio
+async def test_jsonl_subscriber_writes_structured_events(tmp_path):
+    """Testa se o JSONL registra um evento por linha, sem os tokens"""
+    path = tmp_path / "events.jsonl"
+    bus = EventBus([JsonlSubscriber(path)])
+    bus.publish(RunStarted(run_id="r1", topic="Python"))
+    bus.publish(ChapterToken(run_id="r1", title="Cap 1", text="texto"))
+    bus.publish(ChapterFinished(run_id="r1", title="Cap 1", generation_time=1.5))
+    await bus.aclose()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["event"] for line in lines] == ["run_started", "chapter_finished"]
+    assert lines[1]["generation_time"] == 1.5
+    assert all(line["run_id"] == "r1" for line in lines)
+
+@pytest.mark.asyncio
+async def test_callback_subscriber_filters_by_run():
+    """Testa se o callback recebe só os eventos estruturados da sua execução"""
+    received = []
+    bus = EventBus([CallbackSubscriber(lambda event, data: received.append((event, data)), run_id="r1")])
+    bus.publish(RunStarted(run_id="r1", topic="Python"))
+    bus.publish(RunStarted(run_id="r2", topic="Rust"))
+    bus.publish(StatusMessage(run_id="r1", message="Gerando"))
+    await bus.aclose()
+
+    assert [(event, data["run_id"], data["topic"]) for event, data in received] == [("run_started", "r1", "Python")]
+
+@pytest.mark.asyncio
+async def test_console_renderer_formats_status(caplog):
+    """Testa a formatação das mensagens de status no log"""
+    bus = EventBus([ConsoleRenderer(logging.getLogger("teste.console"))])
+    with caplog.at_level(logging.INFO, logger="teste.console"):
+        bus.publish(StatusMessage(run_id="r1", level="step", message="GERANDO"))
+        bus.publish(StatusMessage(run_id="r1", level="warning", message="Prazo curto"))
+        await bus.aclose()
+
+    assert "[r1] 🔄 ETAPA: GERANDO" in caplog.messages
+    assert "[r1] ⚠️ Prazo curto" in caplog.messages
+
+@pytest.mark.asyncio
+async def test_metrics_subscriber_snapshot():
+    """Testa a agregação de métricas a partir dos eventos"""
+    metrics = MetricsSubscriber()
+    bus = EventBus([metrics])
+    bus.publish(RunStarted(run_id="r1", topic="Python"))
+    bus.publish(ChapterToken(run_id="r1", title="Cap 1", text="abc"))
+    bus.publish(ChapterFinished(run_id="r1", title="Cap 1", generation_time=2.0))
+    bus.publish(ChapterFinished(run_id="r1", title="Cap 2", generation_time=4.0))
+    await bus.aclose()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["runs_started"] == 1
+    assert snapshot["chapters_finished"] == 2
+    assert snapshot["streamed_chars"] == 3
+    assert snapshot["avg_chapter_time"] == 3.0
+
+def test_coalescible_event_contract_checked_at_definition():
+    """Testa se eventos combináveis incompletos falham já na definição da classe"""
+    with pytest.raises(TypeError, match="merge"):
+        class NoMerge(CoalescibleEvent):
+            def coalesce_key(self):
+                return self.name
+
+    with pytest.raises(TypeError, match="CoalescibleEvent"):
+        class KeyOnly(BookEvent):
+            def coalesce_key(self):
+                return self.name
+
+    assert ChapterFinished(title="A").coalesce_key() is None
@@ -1,7 +1,8 @@
 import pytest
 from pathlib import Path
 from src.core.export.book_exporter import BookExporter
-from src.models.book_models import BookState, Chapter, ChapterOutline
+from src.core.export.html_cache import HtmlFragmentCache
+from src.models.book_models import BookState, Chapter, ChapterLength, ChapterOutline
 
 @pytest.fixture
 def sample_book_state():
@@ -40,11 +41,15 @@ Cada tipo tem suas próprias características e métodos que nos ajudam a manipu
         book_outline=[
             ChapterOutline(
                 title="Introdução ao Python",
-                description="Uma introdução à linguagem"
+                description="Uma introdução à linguagem",
+                topics=["História", "Instalação"],
+                expected_length=ChapterLength.CURTO
             ),
             ChapterOutline(
                 title="Variáveis e Tipos",
-                description="Conceitos básicos de variáveis"
+                description="Conceitos básicos de variáveis",
+                topics=["Números", "Textos"],
+                expected_length=ChapterLength.MEDIO
             )
         ]
     )
@@ -74,6 +79,19 @@ def test_export_to_pdf(sample_book_state, tmp_path):
     assert output_file.exists()
     assert output_file.stat().st_size > 0
 
+def test_export_to_pdf_parallel(sample_book_state, tmp_path):
+    """Testa a exportação para PDF com um processo por capítulo"""
+    from pypdf import PdfReader
+
+    exporter = BookExporter(sample_book_state)
+    output_file = tmp_path / "book.pdf"
+
+    exporter.export_pdf(output_file, parallel=True, workers=2)
+
+    reader = PdfReader(output_file)
+    assert [item.title for item in reader.outline] == ["Introdução ao Python", "Variáveis e Tipos"]
+    assert "Sumário" in reader.pages[0].extract_text()
+
 def test_export_to_epub(sample_book_state, tmp_path):
     """Testa a exportação para EPUB"""
     exporter = BookExporter(sample_book_state)
@@ -84,6 +102,52 @@ def test_export_to_epub(sample_book_state, tmp_path):
     assert output_file.exists()
     assert output_file.stat().st_size > 0
 
+@pytest.mark.asyncio
+async def test_export_all(sample_book_state, tmp_path):
+    """Testa a exportação simultânea dos formatos com tempos por formato"""
+    cache = HtmlFragmentCache()
+    exporter = BookExporter(sample_book_state, html_cache=cache)
+
+    report = await exporter.export_all(tmp_path / "livro")
+
+    assert set(report.paths) == {"md", "pdf", "epub"}
+    assert set(report.timings) == {"md", "pdf", "epub"}
+    for path in report.paths.values():
+        assert Path(path).stat().st_size > 0
+    assert Path(report.paths["epub"]).name == "livro.epub"
+    # Cada capítulo convertido para HTML uma única vez
+    assert cache.metrics().misses == len(sample_book_state.book)
+
+@pytest.mark.asyncio
+async def test_export_all_reuses_process_pool(sample_book_state, tmp_path, monkeypatch):
+    """Testa se exportações seguidas usam o mesmo pool de processos"""
+    from src.core.export import process_pool
+
+    created = []
+    pool_class = process_pool.ProcessPoolExecutor
+
+    def tracking_pool(**kwargs):
+        pool = pool_class(**kwargs)
+        created.append(pool)
+        return pool
+
+    monkeypatch.setattr(process_pool, "_pools", {})
+    monkeypatch.setattr(process_pool, "ProcessPoolExecutor", tracking_pool)
+    exporter = BookExporter(sample_book_state)
+
+    await exporter.export_all(tmp_path / "primeiro", formats=["pdf"])
+    await exporter.export_all(tmp_path / "segundo", formats=["pdf"])
+
+    assert len(created) == 1
+    assert (tmp_path / "segundo.pdf").stat().st_size > 0
+    process_pool.shutdown_process_pools()
+
+@pytest.mark.asyncio
+async def test_export_all_rejects_unknown_format(sample_book_state, tmp_path):
+    """Testa o erro para formatos não suportados"""
+    with pytest.raises(ValueError):
+        await BookExporter(sample_book_state).export_all(tmp_path / "livro", formats=["md", "docx"])
+
 def test_export_with_custom_template(sample_book_state, tmp_path):
     """Testa a exportação com template personalizado"""
     template = """
@@ -0,0 +1,66 @@
+import pytest
+from src.core.export import html_cache as html_cache_module
+from src.core.export.html_cache import HtmlFragmentCache, convert_markdown
+
+@pytest.fixture
+def conversions(monkeypatch):
+    """Conta as conversões reais de markdown"""
+    calls = []
+
+    def counting_convert(text, extensions=()):
+        calls.append(text)
+        return convert_markdown(text, extensions)
+
+    monkeypatch.setattr(html_cache_module, "convert_markdown", counting_convert)
+    return calls
+
+def test_each_chapter_converted_once(conversions):
+    """Testa se vários formatos reutilizam o fragmento já convertido"""
+    cache = HtmlFragmentCache()
+    chapters = ["# Um\n\nTexto", "# Dois\n\n*ênfase*"]
+
+    for _ in range(3):  # markdown, PDF e EPUB
+        fragments = [cache.render(content) for content in chapters]
+
+    assert conversions == chapters
+    assert fragments[1] == "<h1>Dois</h1>\n<p><em>ênfase</em></p>"
+    metrics = cache.metrics()
+    assert (metrics.misses, metrics.hits, metrics.entries) == (2, 4, 2)
+
+def test_extensions_are_part_of_the_key(conversions):
+    """Testa se o mesmo texto com outras extensões é convertido de novo"""
+    cache = HtmlFragmentCache()
+    plain = cache.render("\"aspas\"")
+    smart = cache.render("\"aspas\"", ["smarty"])
+
+    assert len(conversions) == 2
+    assert plain != smart
+    assert "&ldquo;" in smart
+
+def test_lru_evicts_oldest(conversions):
+    """Testa se o nível em memória descarta o fragmento menos usado"""
+    cache = HtmlFragmentCache(max_entries=2)
+    cache.render("a")
+    cache.render("b")
+    cache.render("a")
+    cache.render("c")
+
+    cache.render("a")
+    assert conversions == ["a", "b", "c"]
+    cache.render("b")
+    assert conversions == ["a", "b", "c", "b"]
+
+def test_disk_tier_shared_between_instances(tmp_path, conversions):
+    """Testa se os fragmentos gravados em disco evitam nova conversão"""
+    HtmlFragmentCache(cache_dir=tmp_path).render("# Capítulo")
+    cache = HtmlFragmentCache(cache_dir=tmp_path)
+
+    assert cache.render("# Capítulo") == "<h1>Capítulo</h1>"
+    assert len(conversions) == 1
+    assert cache.metrics().disk_hits == 1
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+def test_engine_reset_between_conversions():
+    """Testa se a instância reutilizada não carrega estado entre conversões"""
+    convert_markdown("[ref]: http://exemplo.com\n\n[link][ref]", ["extra"])
+    assert convert_markdown("[link][ref]", ["extra"]) == "<p>[link][ref]</p>"
@@ -0,0 +1,67 @@
+import pytest
+from src.core.outline_diff import diff_outlines, match_chapters
+from src.models.book_models import Chapter, ChapterLength, ChapterOutline
+
+def make_outline(title, description="Descrição", chapter_id=None):
+    data = dict(title=title, description=description, topics=["A"], expected_length=ChapterLength.MEDIO)
+    if chapter_id:
+        data["chapter_id"] = chapter_id
+    return ChapterOutline(**data)
+
+@pytest.fixture
+def previous():
+    return [make_outline("Introdução"), make_outline("Conceitos"), make_outline("Conclusão")]
+
+def test_identical_outline_has_no_changes(previous):
+    """Testa se o mesmo outline não gera mudanças"""
+    diff = diff_outlines(previous, [o.model_copy() for o in previous])
+
+    assert not diff.has_changes
+    assert diff.to_generate == []
+    assert diff.unchanged == [o.chapter_id for o in previous]
+
+def test_changed_description_is_detected(previous):
+    """Testa se editar a descrição marca só aquele capítulo como alterado"""
+    new = [o.model_copy() for o in previous]
+    new[1] = new[1].model_copy(update={"description": "Nova descrição"})
+    diff = diff_outlines(previous, new)
+
+    assert diff.changed == [previous[1].chapter_id]
+    assert [o.title for o in diff.to_generate] == ["Conceitos"]
+
+def test_added_removed_and_reordered(previous):
+    """Testa capítulos adicionados, removidos e reordenados"""
+    new = [previous[2].model_copy(), make_outline("Exercícios"), previous[0].model_copy()]
+    diff = diff_outlines(previous, new)
+
+    assert diff.added == [new[1].chapter_id]
+    assert diff.removed == [previous[1].chapter_id]
+    assert set(diff.unchanged) == {previous[0].chapter_id, previous[2].chapter_id}
+    assert [o.title for o in diff.outline] == ["Conclusão", "Exercícios", "Introdução"]
+
+def test_outline_without_ids_matches_by_title(previous):
+    """Testa se um outline editado à mão, sem ids, é casado pelo título"""
+    new = [make_outline("Introdução"), make_outline("Conceitos", "Outra descrição"), make_outline("Conclusão")]
+    diff = diff_outlines(previous, new)
+
+    assert [o.chapter_id for o in diff.outline] == [o.chapter_id for o in previous]
+    assert diff.changed == [previous[1].chapter_id]
+    assert diff.added == []
+
+def test_renamed_chapter_keeps_identity(previous):
+    """Testa se renomear um capítulo com o mesmo id o marca como alterado"""
+    new = [o.model_copy() for o in previous]
+    new[0] = new[0].model_copy(update={"title": "Apresentação"})
+    diff = diff_outlines(previous, new)
+
+    assert diff.changed == [previous[0].chapter_id]
+    assert diff.added == [] and diff.removed == []
+
+def test_match_chapters_falls_back_to_title(previous):
+    """Testa a associação de capítulos antigos, sem chapter_id"""
+    chapters = [Chapter(title=o.title, content=f"# {o.title}") for o in previous]
+    chapters[1].chapter_id = previous[1].chapter_id
+
+    matched = match_chapters(previous, chapters)
+
+    assert {cid: c.title for cid, c in matched.items()} == {o.chapter_id: o.title for o in previous}
@@ -0,0 +1,31 @@
+from src.core.export.pdf_cache import PdfPartCache
+
+def test_key_depends_on_theme_and_content():
+    """Testa se tema, título e conteúdo compõem a chave"""
+    key = PdfPartCache.make_key("tema", "Capítulo", "<p>a</p>")
+    assert key == PdfPartCache.make_key("tema", "Capítulo", "<p>a</p>")
+    assert key != PdfPartCache.make_key("outro", "Capítulo", "<p>a</p>")
+    assert key != PdfPartCache.make_key("tema", "Capítulo", "<p>b</p>")
+    assert key != PdfPartCache.make_key("tema", "Outro", "<p>a</p>")
+
+def test_roundtrip_and_reload(tmp_path):
+    """Testa a leitura de um PDF gravado por outra instância"""
+    PdfPartCache(tmp_path, max_bytes=1024).set("ab" * 32, b"%PDF-1")
+    cache = PdfPartCache(tmp_path, max_bytes=1024)
+
+    assert cache.get("ab" * 32) == b"%PDF-1"
+    assert cache.get("cd" * 32) is None
+    metrics = cache.metrics()
+    assert (metrics.hits, metrics.misses, metrics.entries) == (1, 1, 1)
+
+def test_evicts_least_recently_used(tmp_path):
+    """Testa se o limite de tamanho remove os PDFs menos usados"""
+    cache = PdfPartCache(tmp_path, max_bytes=20)
+    cache.set("aa" * 32, b"x" * 10)
+    cache.set("bb" * 32, b"y" * 10)
+    cache.get("bb" * 32)
+    cache.set("cc" * 32, b"z" * 10)
+
+    assert cache.get("aa" * 32) is None
+    assert cache.get("bb" * 32) == b"y" * 10
+    assert cache.metrics().evictions == 1
@@ -0,0 +1,161 @@
+import io
+import os
+import pytest
+from pypdf import PdfReader, PdfWriter
+from src.core.export.pdf_cache import PdfPartCache
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from src.core.export.pdf_renderer import (
+    PdfRenderer, markdown_to_html, merge_pdf_parts, page_number_documents, render_book_parallel, toc_html
+)
+
+def fake_render(input_path, output_path, theme=None):
+    """Renderização falsa: registra o processo que executou a conversão"""
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f"{os.getpid()}\n{open(input_path, encoding='utf-8').read()}")
+    return output_path
+
+def fake_html_render(document, theme=None):
+    """Renderização falsa: uma página por parágrafo (ou por página numerada), sumário longo ocupa duas"""
+    pages = max(1, document.count("<p>") + document.count("<div></div>"))
+    if document.count("<li>") > 2:
+        pages += 1
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def numbered_pdf(numbers):
+    """PDF com uma página por número, escrito no rodapé com uma fonte padrão"""
+    writer = PdfWriter()
+    for number in numbers:
+        page = writer.add_blank_page(width=595, height=842)
+        page[NameObject("/Resources")] = DictionaryObject({NameObject("/Font"): DictionaryObject({
+            NameObject("/F1"): DictionaryObject({
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica")
+            })
+        })})
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 9 Tf 290 20 Td ({number}) Tj ET".encode())
+        page.replace_contents(content)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+def test_markdown_to_html_leaves_style_to_theme():
+    """Testa se o HTML gerado traz o conteúdo convertido, sem CSS embutido"""
+    html = markdown_to_html("# Título\n\nTexto com *ênfase*")
+    assert "<h1>Título</h1>" in html
+    assert "<em>ênfase</em>" in html
+    assert "<style>" not in html
+
+@pytest.mark.asyncio
+async def test_render_runs_in_worker_process(tmp_path):
+    """Testa se a renderização roda fora do processo do event loop"""
+    markdown_path = tmp_path / "livro.md"
+    markdown_path.write_text("# Livro", encoding="utf-8")
+    renderer = PdfRenderer(workers=1, render=fake_render)
+    try:
+        pdf_path = await renderer.submit(markdown_path)
+    finally:
+        await renderer.aclose()
+
+    pid, content = open(pdf_path, encoding="utf-8").read().split("\n", 1)
+    assert pdf_path == str(tmp_path / "livro.pdf")
+    assert int(pid) != os.getpid()
+    assert content == "# Livro"
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_pending_renders(tmp_path):
+    """Testa se o encerramento aguarda as renderizações agendadas"""
+    renderer = PdfRenderer(workers=2, render=fake_render)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.md").write_text(name, encoding="utf-8")
+        renderer.submit(tmp_path / f"{name}.md")
+    await renderer.aclose()
+
+    assert renderer.pending == 0
+    assert sorted(p.name for p in tmp_path.glob("*.pdf")) == ["a.pdf", "b.pdf", "c.pdf"]
+
+def test_toc_lists_chapter_start_pages():
+    """Testa se o sumário traz o título escapado e a página de cada capítulo"""
+    toc = toc_html("Livro <1>", [("Introdução", 2), ("Fim", 5)])
+    assert "Livro &lt;1&gt;" in toc
+    assert '<span class="toc-title">Introdução</span> <span class="toc-page">2</span>' in toc
+
+def test_page_number_documents_continue_across_parts():
+    """Testa se a numeração de cada parte começa onde a anterior terminou"""
+    documents = list(page_number_documents([2, 3]))
+    assert [document.count("<div></div>") for document in documents] == [2, 3]
+    assert 'content: "2"' in documents[0] and 'content: "3"' not in documents[0]
+    assert 'content: "3"' in documents[1] and 'content: "5"' in documents[1]
+
+def test_merge_stamps_each_part_with_its_overlay(tmp_path):
+    """Testa a união em disco com a numeração de cada parte sobreposta às suas páginas"""
+    parts = [(None, numbered_pdf(["abertura"])), ("Capítulo 1", numbered_pdf(["a", "b"])), ("Capítulo 2", numbered_pdf(["c"]))]
+    overlays = (numbered_pdf([f"pagina{n}" for n in numbers]) for numbers in ([1], [2, 3], [4]))
+    output_file = tmp_path / "livro.pdf"
+
+    assert merge_pdf_parts(parts, output_file=output_file, overlays=overlays) is None
+
+    reader = PdfReader(output_file, strict=True)
+    texts = [page.extract_text() for page in reader.pages]
+    assert [("abertura a b c".split()[idx] in text, f"pagina{idx + 1}" in text) for idx, text in enumerate(texts)] == [(True, True)] * 4
+    assert [item.title for item in reader.outline] == ["Capítulo 1", "Capítulo 2"]
+    assert [reader.get_destination_page_number(item) for item in reader.outline] == [1, 3]
+
+@pytest.mark.parametrize("chapters, bookmarks", [
+    (2, [1, 3]),         # sumário curto: uma página de abertura
+    (3, [2, 4, 7]),      # sumário longo: duas páginas deslocam os capítulos
+])
+def test_parallel_book_merges_parts_with_bookmarks(chapters, bookmarks):
+    """Testa a união das partes, os marcadores e o deslocamento causado pelo sumário"""
+    paragraphs = [2, 3, 1][:chapters]
+    pdf = render_book_parallel(
+        "Livro",
+        [(f"Capítulo {i}", "<p>texto</p>" * n) for i, n in enumerate(paragraphs, 1)],
+        workers=2,
+        render=fake_html_render
+    )
+
+    reader = PdfReader(io.BytesIO(pdf))
+    assert len(reader.pages) == bookmarks[0] + sum(paragraphs)
+    assert [item.title for item in reader.outline] == [f"Capítulo {i}" for i in range(1, chapters + 1)]
+    assert [reader.get_destination_page_number(item) for item in reader.outline] == bookmarks
+
+def test_parallel_book_rerenders_only_changed_chapters(tmp_path):
+    """Testa se a reexportação reaproveita os capítulos inalterados do cache"""
+    cache = PdfPartCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    chapters = [(f"Capítulo {i}", "<p>texto</p>" * i) for i in range(1, 4)]
+    first = render_book_parallel("Livro", chapters, theme="padrao", workers=2, render=fake_html_render, cache=cache)
+    assert (cache.metrics().hits, cache.metrics().misses) == (0, 3)
+
+    chapters[1] = ("Capítulo 2", "<p>revisado</p>")
+    second = render_book_parallel("Livro", chapters, theme="padrao", workers=2, render=fake_html_render, cache=cache)
+
+    assert (cache.metrics().hits, cache.metrics().misses) == (2, 4)
+    assert len(PdfReader(io.BytesIO(second)).pages) == len(PdfReader(io.BytesIO(first)).pages) - 1
+
+    render_book_parallel("Livro", chapters, theme="simples", workers=2, render=fake_html_render, cache=cache)
+    assert cache.metrics().misses == 7  # outro tema invalida todos os capítulos
+
+@pytest.mark.asyncio
+async def test_renderers_share_long_lived_pool(tmp_path):
+    """Testa se o renderizador e o livro paralelo reaproveitam o mesmo pool entre chamadas"""
+    from src.core.export.process_pool import get_process_pool
+
+    pool = get_process_pool(2)
+    markdown_path = tmp_path / "livro.md"
+    markdown_path.write_text("# Livro", encoding="utf-8")
+    renderer = PdfRenderer(workers=2, render=fake_render)
+    first_pid = int(open(await renderer.submit(markdown_path), encoding="utf-8").readline())
+    await renderer.aclose()
+    render_book_parallel("Livro", [("Cap", "<p>a</p>")], workers=2, render=fake_html_render)
+    second_pid = int(open(await renderer.submit(markdown_path), encoding="utf-8").readline())
+    await renderer.aclose()
+
+    assert get_process_pool(2) is pool
+    assert {first_pid, second_pid} <= set(pool._processes)
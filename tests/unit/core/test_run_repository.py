@@ -0,0 +1,147 @@
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from src.core.events import (
+    ChapterFinished, ChapterStarted, Degraded, EventBus, LlmRequest, OutlineReady, RunFailed, RunStarted, SaveDone
+)
+from src.core.run_repository import RunRecorder, RunRepository
+from src.models.book_models import ChapterLength, ChapterOutline
+
+def run_events(run_id, topic, start, duration, model="gpt-4o", failed=False):
+    events = [
+        RunStarted(run_id=run_id, timestamp=start, topic=topic, target_audience="Todos", book_type="Guia", model=model),
+        OutlineReady(run_id=run_id, timestamp=start + 1, chapters=["Introdução", "Conclusão"]),
+    ]
+    for offset, title in enumerate(["Conclusão", "Introdução"], 2):
+        events.append(ChapterStarted(run_id=run_id, timestamp=start + offset, title=title))
+        events.append(ChapterFinished(run_id=run_id, timestamp=start + offset + 1, title=title, generation_time=1.0))
+    if failed:
+        events.append(RunFailed(run_id=run_id, timestamp=start + duration, error="falha"))
+    else:
+        events.append(SaveDone(run_id=run_id, timestamp=start + duration, output_path=f"{topic}.md"))
+    return events
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = RunRepository(tmp_path / "runs.db")
+    now = datetime.now().timestamp()
+    repository.record(run_events("r1", "Python", now - 3 * 86400, 1800))
+    repository.record(run_events("r2", "Python", now - 2 * 86400, 600, model="gpt-4o-mini"))
+    repository.record(run_events("r3", "Rust", now - 20 * 86400, 2400))
+    repository.record(run_events("r4", "Rust", now - 3600, 60, failed=True))
+    return repository
+
+def test_list_runs_filters(repository):
+    """Testa os filtros por modelo, data, duração, tema e status"""
+    last_week = datetime.now() - timedelta(days=7)
+    slow = repository.list_runs(model="gpt-4o", since=last_week, min_duration=1200)
+    assert [run.run_id for run in slow] == ["r1"]
+    assert [run.run_id for run in repository.list_runs(topic="Rust")] == ["r4", "r3"]
+    assert [run.run_id for run in repository.list_runs(status="failed")] == ["r4"]
+    assert [run.run_id for run in repository.list_runs(limit=2, offset=1)] == ["r2", "r1"]
+
+def test_get_run_details(repository):
+    """Testa o detalhe de uma execução com o outline e as métricas dos capítulos"""
+    run = repository.get_run("r1")
+    assert run.status == "completed"
+    assert run.duration == pytest.approx(1800)
+    assert run.outline_time == pytest.approx(1)
+    assert run.chapters == 2
+    assert [(c.title, c.status, c.generation_time) for c in run.chapter_records] == [
+        ("Introdução", "finished", 1.0), ("Conclusão", "finished", 1.0)
+    ]
+    assert repository.get_run("inexistente") is None
+
+def test_degradation_records_fallback_model(tmp_path):
+    """Testa se a troca de modelo por prazo atualiza a execução"""
+    repository = RunRepository(tmp_path / "runs.db")
+    repository.record([
+        RunStarted(run_id="r1", topic="Python", model="gpt-4o"),
+        Degraded(run_id="r1", degradations=["Modelo alterado para gpt-4o-mini"], model="gpt-4o-mini")
+    ])
+    run = repository.get_run("r1")
+    assert run.model == "gpt-4o-mini"
+    assert run.degradations == ["Modelo alterado para gpt-4o-mini"]
+
+def test_outline_chapters_and_requests_by_chapter_id(tmp_path):
+    """Testa se capítulos com o mesmo título ficam separados, com outline e requisições"""
+    repository = RunRepository(tmp_path / "runs.db")
+    outline = [
+        ChapterOutline(title="Exercícios", description=f"Parte {i}", topics=["A", "B"], expected_length=ChapterLength.CURTO)
+        for i in (1, 2)
+    ]
+    first, second = (o.chapter_id for o in outline)
+    repository.record([
+        RunStarted(run_id="r1", timestamp=1000.0, topic="Python", model="gpt-4o"),
+        OutlineReady(run_id="r1", timestamp=1001.0, chapters=[o.title for o in outline], outline=outline),
+        ChapterFinished(run_id="r1", timestamp=1010.0, title="Exercícios", chapter_id=second, generation_time=9.0),
+        LlmRequest(run_id="r1", timestamp=1001.5, title="Exercícios", chapter_id=second, model="gpt-4o",
+                   duration=8.5, prompt_tokens=100, completion_tokens=900),
+        LlmRequest(run_id="r1", timestamp=1002.0, title="Exercícios", chapter_id=first, model="gpt-4o-mini",
+                   duration=3.0, error="timeout"),
+    ])
+
+    run = repository.get_run("r1")
+    assert [(c.chapter_id, c.description, c.status) for c in run.chapter_records] == [
+        (first, "Parte 1", "pending"), (second, "Parte 2", "finished")
+    ]
+    assert run.chapter_records[0].topics == ["A", "B"]
+    assert run.chapter_records[0].expected_length == "curto"
+    assert [(r.chapter_id, r.completion_tokens, r.error) for r in run.request_records] == [
+        (second, 900, None), (first, None, "timeout")
+    ]
+    assert [r.duration for r in repository.list_requests(model="gpt-4o")] == [8.5]
+    assert repository.list_requests(since=datetime.fromtimestamp(1001.8))[0].model == "gpt-4o-mini"
+
+def test_migrates_chapters_keyed_by_title(tmp_path):
+    """Testa se um banco da versão anterior tem os capítulos convertidos"""
+    conn = sqlite3.connect(tmp_path / "runs.db")
+    conn.executescript("""
+        CREATE TABLE chapters (
+            run_id TEXT NOT NULL, title TEXT NOT NULL, position INTEGER,
+            status TEXT NOT NULL DEFAULT 'pending', started_at REAL, finished_at REAL,
+            generation_time REAL, review_time REAL, error TEXT,
+            PRIMARY KEY (run_id, title)
+        ) WITHOUT ROWID;
+        INSERT INTO chapters (run_id, title, position, status) VALUES ('r1', 'Introdução', 0, 'finished');
+    """)
+    conn.close()
+
+    repository = RunRepository(tmp_path / "runs.db")
+    repository.record([RunStarted(run_id="r1", timestamp=1000.0, topic="Python")])
+    [chapter] = repository.get_run("r1").chapter_records
+    assert (chapter.chapter_id, chapter.title, chapter.status) == ("Introdução", "Introdução", "finished")
+
+@pytest.mark.asyncio
+async def test_recorder_writes_in_batches(tmp_path):
+    """Testa se o assinante grava os eventos em lotes, numa transação por lote"""
+    repository = RunRepository(tmp_path / "runs.db")
+    batches = []
+    record = repository.record
+    repository.record = lambda events: (batches.append(len(events)), record(events))
+    bus = EventBus([RunRecorder(repository, batch_size=4)])
+    for event in run_events("r1", "Python", 1000.0, 30):
+        bus.publish(event)
+    await bus.aclose()
+
+    assert sum(batches) == 7
+    assert max(batches) == 4
+    assert repository.get_run("r1").status == "completed"
+
+@pytest.mark.asyncio
+async def test_recorder_never_drops_final_status(tmp_path):
+    """Testa se a fila cheia não descarta o evento que encerra a execução"""
+    repository = RunRepository(tmp_path / "runs.db")
+    recorder = RunRecorder(repository, batch_size=4, buffer_size=3)
+    bus = EventBus([recorder])
+    events = run_events("r1", "Python", 1000.0, 30)
+    flood = [ChapterFinished(run_id="r1", timestamp=1001.0, title=f"Extra {idx}") for idx in range(50)]
+    for event in events[:-1] + flood + events[-1:]:
+        bus.publish(event)
+    await bus.aclose()
+
+    assert recorder.dropped == 0
+    assert recorder.sync_flushes > 0
+    run = repository.get_run("r1")
+    assert run.status == "completed"
+    assert run.chapters == 2
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from src.core.export.streaming_writer import StreamingBookWriter
+
+@pytest.mark.asyncio
+async def test_out_of_order_chapters_written_in_order(tmp_path):
+    """Testa se capítulos concluídos fora de ordem são gravados na ordem do livro"""
+    path = tmp_path / "livro.md"
+    async with StreamingBookWriter(path, "Livro", ["a", "b", "c"]) as writer:
+        await asyncio.gather(writer.add("c", "C"), writer.add("b", "B"))
+        assert writer.written == 0
+        await writer.add("a", "A")
+        assert writer.written == 3
+        await writer.commit()
+
+    assert path.read_text(encoding="utf-8") == "# Livro\n\n\nA\n\nB\n\nC\n"
+    assert writer.peak_buffered == 3
+    assert list(tmp_path.iterdir()) == [path]
+
+@pytest.mark.asyncio
+async def test_abort_keeps_previous_file(tmp_path):
+    """Testa se uma gravação interrompida não altera o arquivo existente"""
+    path = tmp_path / "livro.md"
+    path.write_text("versão anterior", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        async with StreamingBookWriter(path, "Livro", ["a", "b"]) as writer:
+            await writer.add("a", "A")
+            await writer.commit()
+
+    assert path.read_text(encoding="utf-8") == "versão anterior"
+    assert list(tmp_path.iterdir()) == [path]
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_and_repeated_chapters(tmp_path):
+    """Testa se capítulos desconhecidos ou repetidos são rejeitados"""
+    async with StreamingBookWriter(tmp_path / "livro.md", "Livro", ["a", "b"]) as writer:
+        with pytest.raises(ValueError):
+            await writer.add("x", "X")
+        await writer.add("a", "A")
+        with pytest.raises(ValueError):
+            await writer.add("a", "A de novo")
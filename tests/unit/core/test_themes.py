@@ -0,0 +1,30 @@
+import pytest
+from src.core.config.settings import settings
+from src.core.export import themes
+from src.core.export.themes import compiled_theme, get_theme, register_theme
+
+def test_default_theme_from_settings(monkeypatch):
+    """Testa se o tema padrão vem de PDF_THEME"""
+    monkeypatch.setattr(settings, "PDF_THEME", "simples")
+    assert get_theme().name == "simples"
+    assert get_theme("padrao").name == "padrao"
+
+def test_unknown_theme():
+    """Testa o erro para temas não registrados"""
+    with pytest.raises(ValueError):
+        get_theme("inexistente")
+
+def test_digest_follows_css(monkeypatch):
+    """Testa se o hash do tema muda junto com o CSS"""
+    monkeypatch.setattr(themes, "_themes", dict(themes._themes))
+    register_theme("teste", "body { color: red; }")
+    before = get_theme("teste").digest
+    register_theme("teste", "body { color: blue; }")
+    assert get_theme("teste").digest != before
+    assert get_theme("teste").digest == get_theme("teste").digest
+
+def test_theme_compiled_once_per_process():
+    """Testa se o CSS e as fontes são reaproveitados entre renderizações"""
+    stylesheet, font_config = compiled_theme("padrao")
+    assert compiled_theme("padrao") == (stylesheet, font_config)
+    assert compiled_theme.cache_info().hits >= 1
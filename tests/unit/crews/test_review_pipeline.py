@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from src.crews.review_crew.review_crew import ReviewCrew
+from src.models.book_models import Chapter
+
+CONTENT = "# Introdução\n\n" + "Conteúdo do capítulo sobre Python. " * 10
+
+@pytest.fixture
+def review_crew():
+    with patch('src.crews.review_crew.review_crew.ChatOpenAI') as mock_chat:
+        mock_chat.return_value.model = "gpt-4o"
+        yield ReviewCrew()
+
+@pytest.mark.asyncio
+async def test_review_uses_copy_of_pipeline_crew(review_crew):
+    """Testa se cada revisão roda numa cópia do crew com os inputs do capítulo"""
+    calls = []
+
+    async def fake_kickoff(inputs):
+        calls.append(inputs)
+        await asyncio.sleep(0.01)
+        return MagicMock(raw=f"# {inputs['chapter_title']}\n\nRevisado")
+
+    base_crew = MagicMock()
+    base_crew.copy.return_value.kickoff_async.side_effect = fake_kickoff
+    chapter = Chapter(title="Introdução", content=CONTENT, generation_time=12.0)
+    context = {
+        "goal": "Ensinar Python",
+        "target_audience": "Iniciantes",
+        "book_type": "Guia",
+        "outline": [{"title": "Introdução", "description": "Visão geral"}]
+    }
+
+    with patch.object(review_crew, 'pipeline_crew', return_value=base_crew):
+        reviewed = await review_crew.review(chapter, context)
+
+    assert reviewed.content == "# Introdução\n\nRevisado"
+    assert reviewed.generation_time == 12.0
+    assert calls[0]["chapter_content"] == CONTENT
+    assert calls[0]["chapter_description"] == "Visão geral"
+
+@pytest.mark.asyncio
+async def test_review_rejects_short_content(review_crew):
+    """Testa a validação do conteúdo antes da revisão"""
+    with pytest.raises(ValueError):
+        await review_crew.review(Chapter(title="Introdução", content="curto"), {})
+
+def test_pipeline_crew_is_built_once(review_crew):
+    """Testa se o crew de revisão é construído uma única vez"""
+    crew = review_crew.pipeline_crew()
+    assert review_crew.pipeline_crew() is crew
+    assert "{chapter_content}" in crew.tasks[0].description
+    assert crew.tasks[1].context == [crew.tasks[0]]
@@ -267,4 +267,113 @@ def test_empty_goal():
             chapter_description="Descrição",
             target_audience="Iniciantes",
             goal=""  # objetivo vazio
-        )
\ No newline at end of file
+        )
+
+@pytest.fixture
+def batch_outlines():
+    """Outlines de exemplo para a escrita em lote"""
+    from src.models.book_models import ChapterOutline
+    return [
+        ChapterOutline(
+            title=f"Capítulo {i}",
+            description=f"Descrição detalhada do capítulo {i}",
+            topics=["Tópico A", "Tópico B"],
+            expected_length="médio"
+        )
+        for i in range(1, 6)
+    ]
+
+@pytest.mark.asyncio
+@patch('src.crews.write_crew.write_crew.ChatOpenAI')
+async def test_write_chapters_batch_preserves_order(mock_chat, batch_outlines):
+    """Testa se a escrita em lote retorna os capítulos na ordem do outline"""
+    import asyncio
+    mock_chat.return_value = MagicMock(model="gpt-4o")
+    crew = WriteChapterCrew()
+
+    async def fake_kickoff(inputs):
+        # Capítulos iniciais terminam por último
+        await asyncio.sleep(0.01 * (10 - int(inputs["chapter_title"].split()[-1])))
+        return MagicMock(raw=f"# {inputs['chapter_title']}\n\nConteúdo")
+
+    base_crew = MagicMock()
+    base_crew.copy.return_value.kickoff_async.side_effect = fake_kickoff
+
+    with patch.object(crew, 'batch_crew', return_value=base_crew) as mock_batch_crew:
+        chapters = await crew.write_chapters_batch(
+            batch_outlines,
+            {"topic": "Python", "goal": "Ensinar", "target_audience": "Iniciantes"},
+            max_concurrency=2
+        )
+
+    mock_batch_crew.assert_called_once()
+    assert [c.title for c in chapters] == [o.title for o in batch_outlines]
+    assert all(isinstance(c, Chapter) for c in chapters)
+    assert chapters[0].content.startswith("# Capítulo 1")
+
+@pytest.mark.asyncio
+@patch('src.crews.write_crew.write_crew.ChatOpenAI')
+async def test_write_chapters_batch_respects_concurrency(mock_chat, batch_outlines):
+    """Testa se o lote nunca excede o limite de concorrência"""
+    import asyncio
+    mock_chat.return_value = MagicMock(model="gpt-4o")
+    crew = WriteChapterCrew()
+    running = 0
+    peak = 0
+
+    async def fake_kickoff(inputs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return MagicMock(raw="conteúdo")
+
+    base_crew = MagicMock()
+    base_crew.copy.return_value.kickoff_async.side_effect = fake_kickoff
+
+    with patch.object(crew, 'batch_crew', return_value=base_crew):
+        await crew.write_chapters_batch(batch_outlines, {"topic": "Python"}, max_concurrency=2)
+
+    assert peak == 2
+
+@pytest.mark.asyncio
+@patch('src.crews.write_crew.write_crew.ChatOpenAI')
+async def test_write_chapters_pipelined_overlaps_research_and_writing(mock_chat, batch_outlines):
+    """Testa se a escrita começa antes de todas as pesquisas terminarem"""
+    import asyncio
+    mock_chat.return_value = MagicMock(model="gpt-4o")
+    crew = WriteChapterCrew()
+    events = []
+
+    async def fake_research(inputs):
+        idx = int(inputs["chapter_title"].split()[-1])
+        await asyncio.sleep(0.01 * idx)
+        events.append(("research", idx))
+        return MagicMock(raw=f"pesquisa {idx}")
+
+    async def fake_write(inputs):
+        idx = int(inputs["chapter_title"].split()[-1])
+        events.append(("write", idx))
+        await asyncio.sleep(0.005)
+        return MagicMock(raw=f"# {inputs['chapter_title']}\n\n{inputs['research']}")
+
+    research_base = MagicMock()
+    research_base.copy.return_value.kickoff_async.side_effect = fake_research
+    writer_base = MagicMock()
+    writer_base.copy.return_value.kickoff_async.side_effect = fake_write
+
+    with patch.object(crew, 'research_crew', return_value=research_base), \
+         patch.object(crew, 'research_writer_crew', return_value=writer_base):
+        chapters = await crew.write_chapters_pipelined(
+            batch_outlines,
+            {"topic": "Python", "goal": "Ensinar", "target_audience": "Iniciantes"},
+            max_writers=2,
+            queue_size=1
+        )
+
+    assert [c.title for c in chapters] == [o.title for o in batch_outlines]
+    assert chapters[2].content.endswith("pesquisa 3")
+    last_research = max(i for i, event in enumerate(events) if event[0] == "research")
+    first_write = events.index(("write", 1))
+    assert first_write < last_research
@@ -0,0 +1,433 @@
+import asyncio
+import zipfile
+import pytest
+from src.flows.book_flow import BookFlow
+from src.interfaces.book_services import IBookOutlineGenerator, IChapterWriter, IBookSaver, IChapterReviewer
+from src.models.book_models import Chapter, ChapterLength, ChapterOutline
+from src.services.book_services import BookSaver
+from src.core.export.pdf_renderer import PdfRenderer
+from src.core.events import EventBus
+from src.core.run_repository import RunRecorder, RunRepository
+
+class FakeWriter(IBookOutlineGenerator, IChapterWriter):
+    """Gerador falso: o outline e os capítulos dependem do tema"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+
+    async def generate_outline(self, topic, goal, target_audience):
+        await asyncio.sleep(self.delay)
+        return [
+            ChapterOutline(title=f"{topic} {i}", description="Descrição", topics=["A"], expected_length=ChapterLength.CURTO)
+            for i in range(1, 4)
+        ]
+
+    async def write_chapter(self, outline, context):
+        await asyncio.sleep(self.delay)
+        return Chapter(title=outline.title, content=f"# {outline.title}\n\nSobre {context['topic']}")
+
+def fake_render(input_path, output_path, theme=None):
+    """Renderização falsa de PDF, executada no pool de processos"""
+    with open(output_path, "wb") as f:
+        f.write(b"%PDF-fake")
+    return output_path
+
+class FakeSaver(IBookSaver):
+    """Saver falso que apenas registra os livros salvos"""
+
+    def __init__(self):
+        self.saved = []
+        self.states = {}
+
+    async def save_pdf(self, state, filename):
+        state.output_path = f"{filename}.md"
+        self.saved.append(filename)
+
+    async def save_backup(self, state, filename):
+        pass
+
+    async def save_research(self, research, filename):
+        pass
+
+    async def save_state(self, state, filename):
+        self.states[filename] = state.model_copy(deep=True)
+
+    async def load_state(self, filename):
+        return self.states[filename]
+
+@pytest.fixture
+def flow():
+    writer = FakeWriter()
+    return BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+
+@pytest.mark.asyncio
+async def test_concurrent_executions_do_not_share_state(flow):
+    """Testa se execuções simultâneas na mesma instância mantêm estados separados"""
+    python, rust = await asyncio.gather(
+        flow.execute("Python", "Iniciantes", "Guia", run_id="a"),
+        flow.execute("Rust", "Avançados", "Guia", run_id="b")
+    )
+
+    assert [c.title for c in python.book] == ["Python 1", "Python 2", "Python 3"]
+    assert [c.title for c in rust.book] == ["Rust 1", "Rust 2", "Rust 3"]
+    assert all("Sobre Rust" in c.content for c in rust.book)
+    assert python.time_metrics is not rust.time_metrics
+    assert set(python.time_metrics.chapter_generation_times) == {"Python 1", "Python 2", "Python 3"}
+    assert sorted(flow.book_saver.saved) == ["python_a", "rust_b"]
+    assert sorted(flow.book_saver.states) == ["python_a", "rust_b"]
+    assert flow.active_runs == {}
+
+@pytest.mark.asyncio
+async def test_progress_events_carry_run_id(flow):
+    """Testa se os eventos de progresso identificam a execução"""
+    events = []
+    await flow.execute("Python", "Iniciantes", "Guia", progress_callback=lambda e, d: events.append((e, d)), run_id="abc")
+
+    assert events[0][0] == "run_started"
+    assert all(data["run_id"] == "abc" for _, data in events)
+    assert [e for e, _ in events].count("chapter_finished") == 3
+
+@pytest.mark.asyncio
+async def test_cancel_run(flow):
+    """Testa o cancelamento de uma execução pela sua task"""
+    flow.chapter_writer.delay = 1
+    task = asyncio.create_task(flow.execute("Python", "Iniciantes", "Guia", run_id="lento"))
+    await asyncio.sleep(0.05)
+
+    assert "lento" in flow.active_runs
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert flow.active_runs == {}
+
+class RecordingWriter(FakeWriter):
+    """Gerador falso que registra o contexto recebido por capítulo"""
+
+    def __init__(self, delay=0.01, length=ChapterLength.MEDIO):
+        super().__init__(delay)
+        self.length = length
+        self.contexts = []
+
+    async def generate_outline(self, topic, goal, target_audience):
+        return [
+            ChapterOutline(title=title, description="Descrição", topics=["A"], expected_length=self.length)
+            for title in ["Sumário", "Introdução", "Conclusão"]
+        ]
+
+    async def write_chapter(self, outline, context):
+        self.contexts.append((outline.expected_length, context))
+        return await super().write_chapter(outline, context)
+
+@pytest.mark.asyncio
+async def test_no_deadline_keeps_outline():
+    """Testa se, sem prazo, o outline e o modelo não são alterados"""
+    writer = RecordingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    state = await flow.execute("Python", "Iniciantes", "Guia")
+
+    assert state.degradations == []
+    assert all(length == ChapterLength.MEDIO for length, _ in writer.contexts)
+    assert all("model" not in context for _, context in writer.contexts)
+
+@pytest.mark.asyncio
+async def test_tight_deadline_degrades_in_order(monkeypatch):
+    """Testa se um prazo curto reduz o tamanho e depois troca o modelo"""
+    monkeypatch.setattr("src.flows.book_flow.settings.MAX_CONCURRENT_CHAPTERS", 3)
+    monkeypatch.setattr("src.flows.book_flow.settings.FALLBACK_MODEL_SPEEDUP", 2.0)
+    writer = RecordingWriter(length=ChapterLength.LONGO)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    events = []
+    # LONGO (240s) -> CURTO (120s) ainda não cabe em 100s; o modelo rápido leva a 60s
+    state = await flow.execute("Python", "Iniciantes", "Guia", progress_callback=lambda e, d: events.append(e), deadline_seconds=100)
+
+    assert len(state.degradations) == 2
+    assert all(length == ChapterLength.CURTO for length, _ in writer.contexts)
+    assert all(context["model"] == "gpt-4o-mini" for _, context in writer.contexts)
+    assert all(0 < context["timeout"]() <= 100 for _, context in writer.contexts)
+    assert [c.title for c in state.book] == ["Sumário", "Introdução", "Conclusão"]
+    assert "degraded" in events
+
+@pytest.mark.asyncio
+async def test_very_tight_deadline_skips_optional_chapters(monkeypatch):
+    """Testa se capítulos opcionais são omitidos quando nada mais basta"""
+    monkeypatch.setattr("src.flows.book_flow.settings.MAX_CONCURRENT_CHAPTERS", 1)
+    writer = RecordingWriter(length=ChapterLength.CURTO)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    state = await flow.execute("Python", "Iniciantes", "Guia", deadline_seconds=10)
+
+    assert [c.title for c in state.book] == ["Introdução", "Conclusão"]
+    assert state.degradations[-1] == "Capítulos omitidos: Sumário"
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_pending_chapters():
+    """Testa se o fim do prazo cancela os capítulos pendentes"""
+    writer = RecordingWriter(delay=1)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    events = []
+    with pytest.raises(RuntimeError, match="prazo esgotado"):
+        await flow.execute("Python", "Iniciantes", "Guia", progress_callback=lambda e, d: events.append(e), deadline_seconds=0.2)
+
+    assert len(writer.contexts) == 1
+    assert "deadline_exceeded" in events
+    assert flow.book_saver.saved == []
+    assert flow.active_runs == {}
+
+@pytest.mark.asyncio
+async def test_chapter_timeout_follows_remaining_deadline():
+    """Testa se o limite de cada capítulo é calculado quando a requisição começa"""
+    class TimingWriter(FakeWriter):
+        def __init__(self):
+            super().__init__(delay=0.05)
+            self.timeouts = []
+
+        async def write_chapter(self, outline, context):
+            self.timeouts.append(context["timeout"]())
+            return await super().write_chapter(outline, context)
+
+    writer = TimingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    await flow.execute("Python", "Iniciantes", "Guia", deadline_seconds=300)
+
+    assert len(writer.timeouts) == 3
+    assert writer.timeouts[0] > writer.timeouts[1] > writer.timeouts[2]
+
+@pytest.mark.asyncio
+async def test_step_timeout_is_not_reported_as_deadline(monkeypatch):
+    """Testa se o limite de uma etapa, sem prazo esgotado, não vira deadline_exceeded"""
+    monkeypatch.setattr("src.flows.book_flow.settings.OUTLINE_TIMEOUT_SECONDS", 0.05)
+    writer = FakeWriter(delay=0.5)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    events = []
+    with pytest.raises(RuntimeError, match="tempo limite de etapa"):
+        await flow.execute("Python", "Iniciantes", "Guia", progress_callback=lambda e, d: events.append(e), deadline_seconds=60)
+
+    assert "deadline_exceeded" not in events
+    assert "run_failed" in events
+
+@pytest.mark.asyncio
+async def test_regenerate_fits_pending_chapters_to_deadline(monkeypatch):
+    """Testa se a regeneração degrada só os capítulos a reescrever para caber no prazo"""
+    monkeypatch.setattr("src.flows.book_flow.settings.MAX_CONCURRENT_CHAPTERS", 1)
+    writer = RecordingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    previous = await flow.execute("Python", "Iniciantes", "Guia")
+    writer.contexts.clear()
+
+    new_outline = [o.model_copy() for o in previous.book_outline]
+    new_outline[1] = new_outline[1].model_copy(update={"description": "Nova descrição"})
+    # MEDIO (180s) -> CURTO (120s) ainda não cabe em 100s; o modelo rápido leva a 60s
+    state = await flow.regenerate(previous, new_outline, deadline_seconds=100)
+
+    assert [(length, context["model"]) for length, context in writer.contexts] == [(ChapterLength.CURTO, "gpt-4o-mini")]
+    assert [o.expected_length for o in state.book_outline] == [ChapterLength.MEDIO, ChapterLength.CURTO, ChapterLength.MEDIO]
+    assert len(state.degradations) == 2
+    assert [c.title for c in state.book] == ["Sumário", "Introdução", "Conclusão"]
+
+class FakeReviewer(IChapterReviewer):
+    """Revisor falso que marca o conteúdo revisado"""
+
+    def __init__(self, delay=0.1, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+
+    async def review(self, chapter, context):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if chapter.title == self.fail_on:
+                raise RuntimeError("Erro de API")
+            return chapter.model_copy(update={"content": chapter.content + "\n\nRevisado"})
+        finally:
+            self.active -= 1
+
+@pytest.mark.asyncio
+async def test_review_overlaps_with_writing(monkeypatch):
+    """Testa se a revisão acontece enquanto os capítulos seguintes são escritos"""
+    monkeypatch.setattr("src.flows.book_flow.settings.ENABLE_REVIEW", True)
+    monkeypatch.setattr("src.flows.book_flow.settings.MAX_CONCURRENT_REVIEWS", 2)
+    writer = FakeWriter(delay=0.1)
+    reviewer = FakeReviewer(delay=0.1)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver(), reviewer=reviewer)
+    events = []
+
+    start = asyncio.get_running_loop().time()
+    state = await flow.execute("Python", "Iniciantes", "Guia", progress_callback=lambda e, d: events.append(e))
+    elapsed = asyncio.get_running_loop().time() - start
+
+    # outline + 3 capítulos sequenciais + uma revisão (sem pipeline seriam 0.7s)
+    assert elapsed < 0.6
+    assert [c.title for c in state.book] == ["Python 1", "Python 2", "Python 3"]
+    assert all(c.content.endswith("Revisado") for c in state.book)
+    assert set(state.time_metrics.chapter_review_times) == {"Python 1", "Python 2", "Python 3"}
+    assert events.count("chapter_reviewed") == 3
+    assert reviewer.max_active <= 2
+
+@pytest.mark.asyncio
+async def test_failed_review_keeps_written_chapter(monkeypatch):
+    """Testa se uma revisão com erro mantém a versão escrita do capítulo"""
+    monkeypatch.setattr("src.flows.book_flow.settings.ENABLE_REVIEW", True)
+    writer = FakeWriter()
+    flow = BookFlow(
+        outline_generator=writer,
+        chapter_writer=writer,
+        book_saver=FakeSaver(),
+        reviewer=FakeReviewer(delay=0.01, fail_on="Python 2")
+    )
+    state = await flow.execute("Python", "Iniciantes", "Guia")
+
+    assert [c.content.endswith("Revisado") for c in state.book] == [True, False, True]
+
+class SameTitleWriter(FakeWriter):
+    """Gerador falso cujos capítulos têm todos o mesmo título"""
+
+    async def generate_outline(self, topic, goal, target_audience):
+        return [
+            ChapterOutline(title="Exercícios", description=f"Parte {i}", topics=["A"], expected_length=ChapterLength.CURTO)
+            for i in range(1, 4)
+        ]
+
+    async def write_chapter(self, outline, context):
+        await asyncio.sleep(self.delay)
+        return Chapter(title=outline.title, content=outline.description)
+
+@pytest.mark.asyncio
+async def test_review_keeps_chapters_with_same_title(monkeypatch):
+    """Testa se capítulos com o mesmo título recebem cada um a sua revisão"""
+    monkeypatch.setattr("src.flows.book_flow.settings.ENABLE_REVIEW", True)
+    writer = SameTitleWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver(), reviewer=FakeReviewer(delay=0.01))
+    state = await flow.execute("Python", "Iniciantes", "Guia")
+
+    assert [c.content for c in state.book] == [f"Parte {i}\n\nRevisado" for i in range(1, 4)]
+    assert [c.chapter_id for c in state.book] == [o.chapter_id for o in state.book_outline]
+
+@pytest.mark.asyncio
+async def test_review_disabled_by_default():
+    """Testa se a revisão só roda quando habilitada nas configurações"""
+    writer = FakeWriter()
+    reviewer = FakeReviewer(delay=0.01)
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver(), reviewer=reviewer)
+    state = await flow.execute("Python", "Iniciantes", "Guia")
+
+    assert reviewer.max_active == 0
+    assert not any(c.content.endswith("Revisado") for c in state.book)
+
+@pytest.mark.asyncio
+async def test_regenerate_only_writes_changed_chapters():
+    """Testa se a regeneração reescreve só os capítulos novos ou alterados"""
+    writer = RecordingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    previous = await flow.execute("Python", "Iniciantes", "Guia")
+    writer.contexts.clear()
+
+    new_outline = [o.model_copy() for o in previous.book_outline]
+    new_outline[1] = new_outline[1].model_copy(update={"description": "Nova descrição"})
+    new_outline.append(ChapterOutline(title="Apêndice", description="Extras", topics=["B"], expected_length=ChapterLength.CURTO))
+    events = []
+    state = await flow.regenerate(previous, new_outline, progress_callback=lambda e, d: events.append((e, d)))
+
+    assert len(writer.contexts) == 2
+    assert [c.title for c in state.book] == ["Sumário", "Introdução", "Conclusão", "Apêndice"]
+    assert state.book[0] == previous.book[0]
+    assert state.book[2] == previous.book[2]
+    assert [c.chapter_id for c in state.book] == [o.chapter_id for o in state.book_outline]
+    assert set(state.time_metrics.chapter_generation_times) == {"Introdução", "Apêndice"}
+    outline_event = dict(events)["outline_ready"]
+    assert outline_event["chapters"] == ["Introdução", "Apêndice"]
+    assert outline_event["reused"] == 2
+
+@pytest.mark.asyncio
+async def test_regenerate_with_same_outline_writes_nothing():
+    """Testa se regenerar sem mudanças apenas reaproveita o conteúdo"""
+    writer = RecordingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=FakeSaver())
+    previous = await flow.execute("Python", "Iniciantes", "Guia", run_id="v1")
+    writer.contexts.clear()
+
+    state = await flow.regenerate(previous, previous.book_outline, run_id="v2")
+
+    assert writer.contexts == []
+    assert [c.content for c in state.book] == [c.content for c in previous.book]
+    assert flow.book_saver.saved == ["python_v1", "python_v2"]
+
+@pytest.mark.asyncio
+async def test_book_streamed_to_markdown(tmp_path):
+    """Testa se o livro é gravado capítulo a capítulo pelo BookSaver"""
+    writer = FakeWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=BookSaver(tmp_path, PdfRenderer(1, render=fake_render)))
+    state = await flow.execute("Python", "Iniciantes", "Guia", run_id="r1")
+
+    content = (tmp_path / "python_r1.md").read_text(encoding="utf-8")
+    assert state.output_path == str(tmp_path / "python_r1.md")
+    assert content.index("# Python 1") < content.index("# Python 2") < content.index("# Python 3")
+    assert not list(tmp_path.glob(".*.tmp"))
+    backup = await flow.book_saver.load_backup("python_r1")
+    assert [c.content for c in backup.book] == [c.content for c in state.book]
+    assert state.epub_path == str(tmp_path / "python_r1.epub")
+    with zipfile.ZipFile(state.epub_path) as archive:
+        assert "EPUB/chapter_3.xhtml" in archive.namelist()
+
+    await flow.aclose()
+    assert state.pdf_path == str(tmp_path / "python_r1.pdf")
+    assert (tmp_path / "python_r1.pdf").read_bytes() == b"%PDF-fake"
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_on_same_topic_keep_separate_files(tmp_path):
+    """Testa se execuções simultâneas do mesmo tema gravam arquivos distintos"""
+    writer = FakeWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=BookSaver(tmp_path, PdfRenderer(1, render=fake_render)))
+    first, second = await asyncio.gather(
+        flow.execute("Python", "Iniciantes", "Guia", run_id="a"),
+        flow.execute("Python", "Avançados", "Guia", run_id="b")
+    )
+    await flow.aclose()
+
+    assert first.output_path != second.output_path
+    assert first.epub_path != second.epub_path
+    assert sorted(path.name for path in (tmp_path / "backup").iterdir()) == ["python_a.zip", "python_b.zip"]
+    assert sorted(path.name for path in (tmp_path / "state").iterdir()) == ["python_a.json", "python_b.json"]
+
+@pytest.mark.asyncio
+async def test_failed_run_leaves_no_partial_markdown(tmp_path):
+    """Testa se uma execução com falha descarta o arquivo parcial"""
+    class FailingWriter(FakeWriter):
+        async def write_chapter(self, outline, context):
+            if outline.title.endswith("3"):
+                raise ValueError("falha")
+            return await super().write_chapter(outline, context)
+
+    writer = FailingWriter()
+    flow = BookFlow(outline_generator=writer, chapter_writer=writer, book_saver=BookSaver(tmp_path, PdfRenderer(1, render=fake_render)))
+    with pytest.raises(RuntimeError):
+        await flow.execute("Python", "Iniciantes", "Guia")
+    await flow.aclose()
+
+    assert not list(tmp_path.glob("*.md"))
+    assert not list(tmp_path.glob("*.pdf"))
+    assert not list(tmp_path.glob("*.epub"))
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert not list((tmp_path / "backup").iterdir())
+
+@pytest.mark.asyncio
+async def test_runs_recorded_in_repository(tmp_path):
+    """Testa se as execuções do flow são gravadas no repositório SQLite"""
+    repository = RunRepository(tmp_path / "runs.db")
+    writer = FakeWriter()
+    flow = BookFlow(
+        outline_generator=writer,
+        chapter_writer=writer,
+        book_saver=FakeSaver(),
+        event_bus=EventBus([RunRecorder(repository)])
+    )
+    state = await flow.execute("Python", "Iniciantes", "Guia", run_id="run-1")
+    await flow.aclose()
+
+    run = repository.get_run("run-1")
+    assert run.status == "completed"
+    assert (run.topic, run.target_audience, run.book_type) == ("Python", "Iniciantes", "Guia")
+    assert run.output_path == state.output_path
+    assert [c.title for c in run.chapter_records] == ["Python 1", "Python 2", "Python 3"]
+    assert all(c.status == "finished" for c in run.chapter_records)
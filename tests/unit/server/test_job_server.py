@@ -0,0 +1,202 @@
+import asyncio
+import json
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from src.core.events import LlmRequest, OutlineReady, RunStarted, SaveDone
+from src.core.run_repository import RunRepository
+from src.models.book_models import BookState
+from src.server import JobManager, JobRequest, JobStatus, create_app
+
+class FakeFlow:
+    """BookFlow falso que emite eventos de progresso"""
+
+    def __init__(self, output_path, delay=0.01, fail=False):
+        self.output_path = output_path
+        self.delay = delay
+        self.fail = fail
+
+    async def execute(self, topic, target_audience, book_type, progress_callback=None, run_id=None, deadline_seconds=None):
+        progress_callback("outline_ready", {"chapters": ["Cap 1", "Cap 2"]})
+        for title in ["Cap 1", "Cap 2"]:
+            await asyncio.sleep(self.delay)
+            progress_callback("chapter_finished", {"title": title, "generation_time": self.delay})
+        if self.fail:
+            raise RuntimeError("falha simulada")
+        state = BookState(title=topic, topic=topic, goal="g", target_audience=target_audience)
+        state.output_path = str(self.output_path)
+        return state
+
+async def _client(manager):
+    client = TestClient(TestServer(create_app(manager)))
+    await client.start_server()
+    return client
+
+async def _wait_status(client, job_id, statuses, timeout=2):
+    for _ in range(int(timeout / 0.01)):
+        job = await (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} não chegou a {statuses}")
+
+@pytest.mark.asyncio
+async def test_submit_status_and_download(tmp_path):
+    """Testa o ciclo completo: submissão, status, SSE e download"""
+    output = tmp_path / "livro.md"
+    output.write_text("# Livro", encoding="utf-8")
+    manager = JobManager(lambda: FakeFlow(output), workers=2, max_queue_size=10)
+    client = await _client(manager)
+    try:
+        response = await client.post("/jobs", json={"topic": "Python", "target_audience": "Iniciantes"})
+        assert response.status == 202
+        job_id = (await response.json())["job_id"]
+
+        events = await client.get(f"/jobs/{job_id}/events")
+        body = await events.text()
+        names = [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+        assert names[0] == "queued"
+        assert names.count("chapter_finished") == 2
+        assert names[-1] == "completed"
+        last = json.loads([line for line in body.splitlines() if line.startswith("data: ")][-1][6:])
+        assert last["data"]["output_path"] == str(output)
+
+        job = await _wait_status(client, job_id, {"completed"})
+        assert job["completed_chapters"] == 2
+        assert job["total_chapters"] == 2
+
+        download = await client.get(f"/jobs/{job_id}/download")
+        assert download.status == 200
+        assert await download.text() == "# Livro"
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_cancel_queued_and_running_jobs(tmp_path):
+    """Testa o cancelamento de jobs na fila e em execução"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", delay=10), workers=1, max_queue_size=10)
+    client = await _client(manager)
+    try:
+        first = (await (await client.post("/jobs", json={"topic": "Python", "target_audience": "Todos"})).json())["job_id"]
+        second = (await (await client.post("/jobs", json={"topic": "Rust", "target_audience": "Todos"})).json())["job_id"]
+        await _wait_status(client, first, {"running"})
+
+        assert (await (await client.delete(f"/jobs/{second}")).json())["status"] == "cancelled"
+        await client.delete(f"/jobs/{first}")
+        await _wait_status(client, first, {"cancelled"})
+        assert manager.get(second).status == JobStatus.CANCELLED
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_cancel_finished_or_unknown_job(tmp_path):
+    """Testa o cancelamento de jobs concluídos ou inexistentes"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", delay=0), workers=1, max_queue_size=10)
+    client = await _client(manager)
+    try:
+        job_id = (await (await client.post("/jobs", json={"topic": "Python", "target_audience": "Todos"})).json())["job_id"]
+        await _wait_status(client, job_id, {"completed"})
+
+        assert (await client.delete(f"/jobs/{job_id}")).status == 409
+        assert (await client.delete("/jobs/inexistente")).status == 404
+        assert manager.get(job_id).status == JobStatus.COMPLETED
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_evicted(tmp_path):
+    """Testa se jobs concluídos são esquecidos além do limite e após o prazo"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", delay=0), workers=1, max_queue_size=50, max_finished_jobs=5)
+    await manager.start()
+    try:
+        ids = [manager.submit(JobRequest(topic=f"Tema {i}", target_audience="Todos")).job_id for i in range(20)]
+        await manager._queue.join()
+
+        assert len(manager.jobs) == 5
+        assert set(manager.jobs) == set(ids[-5:])
+        assert set(manager._history) == set(manager.jobs)
+
+        manager.finished_ttl = 0
+        await asyncio.sleep(0.01)
+        last = manager.submit(JobRequest(topic="Outro", target_audience="Todos")).job_id
+        await manager._queue.join()
+        assert set(manager.jobs) <= {last}
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_failed_job_and_validation(tmp_path):
+    """Testa jobs com falha e requisições inválidas"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", fail=True), workers=1, max_queue_size=1)
+    client = await _client(manager)
+    try:
+        assert (await client.post("/jobs", json={"topic": "P"})).status == 400
+        assert (await client.get("/jobs/inexistente")).status == 404
+
+        job_id = (await (await client.post("/jobs", json={"topic": "Python", "target_audience": "Todos"})).json())["job_id"]
+        job = await _wait_status(client, job_id, {"failed"})
+        assert "falha simulada" in job["error"]
+        assert (await client.get(f"/jobs/{job_id}/download")).status == 409
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_many_queued_jobs_do_not_block(tmp_path):
+    """Testa centenas de jobs enfileirados num único processo"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", delay=0), workers=8, max_queue_size=500)
+    client = await _client(manager)
+    try:
+        ids = []
+        for i in range(300):
+            response = await client.post("/jobs", json={"topic": f"Tema {i}", "target_audience": "Todos"})
+            ids.append((await response.json())["job_id"])
+        for job_id in ids:
+            await _wait_status(client, job_id, {"failed", "completed"}, timeout=10)
+        assert all(manager.get(job_id).status == JobStatus.COMPLETED for job_id in ids)
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_run_history_endpoints(tmp_path):
+    """Testa a consulta do histórico de execuções"""
+    runs = RunRepository(tmp_path / "runs.db")
+    runs.record([
+        RunStarted(run_id="r1", timestamp=1000.0, topic="Python", model="gpt-4o"),
+        OutlineReady(run_id="r1", timestamp=1001.0, chapters=["Cap 1"]),
+        LlmRequest(run_id="r1", timestamp=1002.0, title="Cap 1", model="gpt-4o", duration=30.0),
+        SaveDone(run_id="r1", timestamp=2500.0, output_path="python.md"),
+    ])
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md"), workers=1, max_queue_size=1)
+    client = TestClient(TestServer(create_app(manager, runs=runs)))
+    await client.start_server()
+    try:
+        listed = await (await client.get("/runs", params={"model": "gpt-4o", "min_duration": "1200"})).json()
+        assert [run["run_id"] for run in listed] == ["r1"]
+        assert await (await client.get("/runs", params={"status": "failed"})).json() == []
+        assert (await client.get("/runs", params={"since": "ontem"})).status == 400
+
+        run = await (await client.get("/runs/r1")).json()
+        assert run["status"] == "completed"
+        assert [c["title"] for c in run["chapter_records"]] == ["Cap 1"]
+        assert (await client.get("/runs/r9")).status == 404
+
+        requests = await (await client.get("/requests", params={"model": "gpt-4o"})).json()
+        assert [(r["run_id"], r["duration"]) for r in requests] == [("r1", 30.0)]
+        assert await (await client.get("/requests", params={"model": "gpt-4o-mini"})).json() == []
+    finally:
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_stop_with_running_job(tmp_path):
+    """Testa se stop encerra os workers mesmo com um job em execução"""
+    manager = JobManager(lambda: FakeFlow(tmp_path / "x.md", delay=10), workers=1, max_queue_size=10)
+    await manager.start()
+    job_id = manager.submit(JobRequest(topic="Python", target_audience="Todos")).job_id
+    for _ in range(200):
+        if manager.get(job_id).status == JobStatus.RUNNING:
+            break
+        await asyncio.sleep(0.01)
+    assert manager.get(job_id).status == JobStatus.RUNNING
+
+    async with asyncio.timeout(5):
+        await manager.stop()
+    assert all(task.done() for task in manager._worker_tasks)
@@ -0,0 +1,72 @@
+import pytest
+from src.models.book_models import ChapterOutline, ChapterLength
+from src.services.book_services import BookResearcher
+
+class FakeSearchTool:
+    """Ferramenta de busca falsa com a interface do SerperDevTool"""
+
+    def __init__(self):
+        self.queries = []
+
+    def run(self, search_query: str):
+        self.queries.append(search_query)
+        return {
+            "organic": [
+                {"title": "Documentação Python", "link": "https://docs.python.org/3/", "snippet": "Referência oficial"},
+                {"title": f"Artigo sobre {search_query}", "link": f"https://example.com/{len(self.queries)}", "snippet": "x" * 1000},
+            ]
+        }
+
+@pytest.fixture
+def outline():
+    return [
+        ChapterOutline(title="Introdução", description="Visão geral", topics=["História"], expected_length=ChapterLength.CURTO),
+        ChapterOutline(title="Funções", description="Como usar funções", topics=["Argumentos", "Retorno"], expected_length=ChapterLength.MEDIO),
+    ]
+
+@pytest.mark.asyncio
+async def test_research_book_deduplicates_sources(outline):
+    """Testa se fontes repetidas entre capítulos são armazenadas uma única vez"""
+    tool = FakeSearchTool()
+    bundle = await BookResearcher(search_tool=tool).research_book(outline, {"topic": "Python"})
+
+    assert len(tool.queries) == 5
+    docs = [s for s in bundle.sources.values() if s.url.startswith("https://docs.python.org")]
+    assert len(docs) == 1
+    assert docs[0].source_id in bundle.chapter_sources[outline[0].chapter_id]
+    assert docs[0].source_id in bundle.chapter_sources[outline[1].chapter_id]
+
+@pytest.mark.asyncio
+async def test_research_slice_is_compact(outline):
+    """Testa se cada capítulo recebe apenas a sua fatia, com resumos truncados"""
+    bundle = await BookResearcher(search_tool=FakeSearchTool()).research_book(outline, {"topic": "Python"})
+
+    intro_slice = bundle.slice_for(outline[0].chapter_id)
+    assert "Documentação Python" in intro_slice
+    assert "Funções" not in intro_slice
+    assert all(len(s.snippet) <= 300 for s in bundle.sources.values())
+    assert bundle.slice_for("inexistente") == ""
+
+@pytest.mark.asyncio
+async def test_research_tolerates_search_failures(outline):
+    """Testa se falhas de busca não interrompem a pesquisa do livro"""
+    class FailingTool:
+        def run(self, search_query: str):
+            raise RuntimeError("serviço indisponível")
+
+    bundle = await BookResearcher(search_tool=FailingTool()).research_book(outline, {"topic": "Python"})
+    assert bundle.sources == {}
+    assert bundle.chapter_sources[outline[0].chapter_id] == []
+
+@pytest.mark.asyncio
+async def test_research_keeps_chapters_with_same_title_apart():
+    """Testa se capítulos com o mesmo título recebem fatias separadas"""
+    outline = [
+        ChapterOutline(title="Exercícios", description="Exercícios de listas", topics=["Listas"], expected_length=ChapterLength.CURTO),
+        ChapterOutline(title="Exercícios", description="Exercícios de classes", topics=["Classes"], expected_length=ChapterLength.CURTO),
+    ]
+    bundle = await BookResearcher(search_tool=FakeSearchTool()).research_book(outline, {"topic": "Python"})
+
+    first, second = (bundle.chapter_sources[chapter.chapter_id] for chapter in outline)
+    assert first != second
+    assert bundle.slice_for(outline[0].chapter_id) != bundle.slice_for(outline[1].chapter_id)
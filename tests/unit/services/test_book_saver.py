@@ -0,0 +1,100 @@
+import pytest
+from src.core.config.settings import settings
+from src.core.export import backup_archive, streaming_writer
+from src.models.book_models import BookState, Chapter, ChapterLength, ChapterOutline
+from src.services.book_services import BookSaver
+
+@pytest.fixture
+def state():
+    outline = [ChapterOutline(title="Introdução", description="Visão geral", topics=["A"], expected_length=ChapterLength.CURTO)]
+    return BookState(
+        title="Python",
+        topic="Python",
+        goal="Ensinar Python",
+        target_audience="Iniciantes",
+        book_outline=outline,
+        book=[Chapter(title="Introdução", content="# Introdução\n\nTexto", chapter_id=outline[0].chapter_id)]
+    )
+
+@pytest.mark.asyncio
+async def test_state_roundtrip(tmp_path, state):
+    """Testa se o estado salvo pode ser carregado para regenerar o livro"""
+    saver = BookSaver(tmp_path)
+    await saver.save_state(state, "python")
+    loaded = await saver.load_state("python")
+
+    assert loaded.book_outline[0].chapter_id == state.book_outline[0].chapter_id
+    assert loaded.book == state.book
+
+@pytest.mark.asyncio
+async def test_load_missing_state(tmp_path):
+    """Testa o erro ao carregar um estado inexistente"""
+    with pytest.raises(ValueError):
+        await BookSaver(tmp_path).load_state("inexistente")
+
+@pytest.mark.asyncio
+async def test_backup_roundtrip(tmp_path, state):
+    """Testa se o backup guarda o livro num único arquivo e pode ser restaurado"""
+    saver = BookSaver(tmp_path)
+    await saver.save_backup(state, "python")
+
+    assert [p.name for p in (tmp_path / "backup").iterdir()] == ["python.zip"]
+    restored = await saver.load_backup("python")
+    assert restored.book == state.book
+    assert restored.book_outline == state.book_outline
+    chapter = await saver.read_backup_chapter("python", state.book[0].chapter_id)
+    assert chapter.content == "# Introdução\n\nTexto"
+
+@pytest.mark.asyncio
+async def test_backups_share_unchanged_chapters(tmp_path, state):
+    """Testa se backups com o mesmo capítulo armazenam o texto uma única vez"""
+    saver = BookSaver(tmp_path)
+    await saver.save_backup(state, "python")
+    await saver.save_backup(state, "python_copia")
+    blobs = list(saver.chapter_store.objects_dir.glob("*/*"))
+    assert len(blobs) == 1
+
+    state.book[0].content += "\n\nNovo parágrafo"
+    saver.chapter_store.grace_seconds = 0
+    await saver.save_backup(state, "python")
+    await saver.save_backup(state, "python_copia")
+    assert len(list(saver.chapter_store.objects_dir.glob("*/*"))) == 1
+    assert (await saver.load_backup("python_copia")).book == state.book
+
+@pytest.mark.asyncio
+async def test_save_pdf_opens_markdown_once(tmp_path, state, monkeypatch):
+    """Testa se o markdown é aberto uma única vez e nenhum arquivo fica aberto"""
+    opened = []
+    real_open = streaming_writer.aiofiles.open
+
+    async def tracking_open(*args, **kwargs):
+        handle = await real_open(*args, **kwargs)
+        opened.append(handle)
+        return handle
+
+    monkeypatch.setattr(streaming_writer.aiofiles, "open", tracking_open)
+    monkeypatch.setattr(settings, "RENDER_PDF", False)
+    await BookSaver(tmp_path).save_pdf(state, "python")
+
+    assert len(opened) == 1
+    assert opened[0].closed
+    assert (tmp_path / "python.md").read_text(encoding="utf-8").startswith("# Python")
+    assert not list(tmp_path.glob(".*.tmp"))
+
+@pytest.mark.asyncio
+async def test_save_backup_opens_zip_once(tmp_path, state, monkeypatch):
+    """Testa se o zip do backup é aberto uma única vez e fechado ao final"""
+    opened = []
+
+    class TrackingZipFile(backup_archive.zipfile.ZipFile):
+        def __init__(self, file, mode="r", *args, **kwargs):
+            super().__init__(file, mode, *args, **kwargs)
+            if mode == "w":
+                opened.append(self)
+
+    monkeypatch.setattr(backup_archive.zipfile, "ZipFile", TrackingZipFile)
+    await BookSaver(tmp_path).save_backup(state, "python")
+
+    assert len(opened) == 1
+    assert opened[0].fp is None
+    assert not list((tmp_path / "backup").glob(".*.tmp"))
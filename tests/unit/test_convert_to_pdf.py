@@ -0,0 +1,87 @@
+import json
+import os
+import time
+import pytest
+from convert_to_pdf import MANIFEST_NAME, convert_directory, convert_md_to_pdf, needs_conversion
+
+def fake_convert(input_file, theme=None):
+    """Conversão falsa executada nos workers: falha nos arquivos 'ruim', derruba o worker nos 'crash'"""
+    name = os.path.basename(input_file)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("ruim"):
+        return "markdown inválido"
+    with open(input_file[:-3] + ".pdf", "w", encoding="utf-8") as f:
+        f.write(f"{theme}:{open(input_file, encoding='utf-8').read()}")
+    return None
+
+def write_books(root, names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {name}", encoding="utf-8")
+
+def test_missing_input_raises_instead_of_exiting(tmp_path):
+    """Testa se a conversão de um arquivo inexistente levanta exceção"""
+    with pytest.raises(FileNotFoundError):
+        convert_md_to_pdf(str(tmp_path / "nada.md"))
+
+def test_needs_conversion(tmp_path):
+    """Testa as regras de conversão pelo manifesto e pela data do PDF"""
+    md, pdf = tmp_path / "a.md", tmp_path / "a.pdf"
+    md.write_text("# a", encoding="utf-8")
+    assert needs_conversion(md, pdf, "h1", None)
+
+    pdf.write_text("pdf", encoding="utf-8")
+    os.utime(md, (time.time() - 60, time.time() - 60))
+    assert not needs_conversion(md, pdf, "h1", None)
+    assert not needs_conversion(md, pdf, "h1", "h1")
+    assert needs_conversion(md, pdf, "h2", "h1")
+
+def test_batch_converts_tree_and_skips_unchanged(tmp_path):
+    """Testa a conversão da árvore, o resumo das falhas e o reaproveitamento na segunda execução"""
+    write_books(tmp_path, ["a.md", "sub/b.md", "sub/ruim.md"])
+
+    summary = convert_directory(str(tmp_path), workers=2, theme="padrao", convert=fake_convert)
+    assert sorted(summary.converted) == ["a.md", "sub/b.md"]
+    assert summary.failed == {"sub/ruim.md": "markdown inválido"}
+    assert (tmp_path / "sub" / "b.pdf").read_text(encoding="utf-8") == "padrao:# sub/b.md"
+    assert set(json.loads((tmp_path / MANIFEST_NAME).read_text())) == {"a.md", "sub/b.md"}
+
+    (tmp_path / "a.md").write_text("# a revisado", encoding="utf-8")
+    summary = convert_directory(str(tmp_path), workers=2, theme="padrao", convert=fake_convert)
+    assert summary.converted == ["a.md"]
+    assert summary.skipped == ["sub/b.md"]
+
+    # Outro tema invalida o manifesto
+    summary = convert_directory(str(tmp_path), workers=2, theme="simples", convert=fake_convert)
+    assert sorted(summary.converted) == ["a.md", "sub/b.md"]
+
+def test_dead_worker_does_not_stop_batch(tmp_path):
+    """Testa se a morte de um worker só marca como falha o arquivo que a causou"""
+    write_books(tmp_path, ["a.md", "b.md", "crash.md", "d.md"])
+
+    summary = convert_directory(str(tmp_path), workers=1, convert=fake_convert)
+    assert sorted(summary.converted) == ["a.md", "b.md", "d.md"]
+    assert list(summary.failed) == ["crash.md"]
+
+def pid_convert(input_file, theme=None):
+    """Conversão falsa que registra no PDF o processo que a executou"""
+    if os.path.basename(input_file).startswith("crash"):
+        os._exit(1)
+    with open(input_file[:-3] + ".pdf", "w", encoding="utf-8") as f:
+        f.write(str(os.getpid()))
+    return None
+
+def test_poison_file_does_not_isolate_queued_files(tmp_path):
+    """Testa se só o arquivo que derruba o worker é isolado e os demais seguem no pool compartilhado"""
+    names = [f"livro{idx:02d}.md" for idx in range(30)]
+    write_books(tmp_path, names[:15] + ["crash.md"] + names[15:])
+
+    summary = convert_directory(str(tmp_path), workers=2, convert=pid_convert)
+
+    assert sorted(summary.converted) == names
+    assert list(summary.failed) == ["crash.md"]
+    pids = {(tmp_path / name).with_suffix(".pdf").read_text(encoding="utf-8") for name in names}
+    # No máximo dois workers por rodada: duas quedas e a rodada final
+    assert len(pids) <= 6
@@ -0,0 +1,82 @@
+import sqlite3
+import pytest
+from src.tools.local_search import BM25Index, split_passages, tokenize
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Fixture que cria um corpus markdown pequeno"""
+    corpus_dir = tmp_path / "corpus"
+    corpus_dir.mkdir()
+    (corpus_dir / "python.md").write_text(
+        "# Python\n\nPython é uma linguagem de programação.\n\n"
+        "## Funções\n\nFunções em Python são definidas com def e podem retornar valores.\n",
+        encoding="utf-8"
+    )
+    (corpus_dir / "culinaria.md").write_text(
+        "# Receitas\n\nComo preparar um bolo de cenoura com cobertura de chocolate.\n",
+        encoding="utf-8"
+    )
+    return corpus_dir
+
+@pytest.fixture
+def index(tmp_path):
+    return BM25Index(tmp_path / "index.db")
+
+def test_tokenize_removes_accents_and_stopwords():
+    """Testa a normalização dos termos"""
+    assert tokenize("Funções em Python") == ["funcoes", "python"]
+
+def test_split_passages_by_heading():
+    """Testa a divisão do markdown em passagens por cabeçalho"""
+    passages = list(split_passages("# A\n\ntexto a\n\n## B\n\ntexto b"))
+    assert passages == [("A", "texto a"), ("B", "texto b")]
+
+def test_search_ranks_relevant_passage_first(index, corpus):
+    """Testa se a passagem mais relevante aparece primeiro"""
+    index.update([corpus])
+    results = index.search("funções python")
+
+    assert results
+    assert results[0]["title"] == "Funções"
+    assert results[0]["link"].startswith("file://")
+    assert all("Receitas" != r["title"] for r in results)
+
+def test_incremental_update(index, corpus):
+    """Testa se só arquivos novos, alterados ou removidos são reindexados"""
+    assert index.update([corpus]) == {"added": 2, "updated": 0, "removed": 0}
+    assert index.update([corpus]) == {"added": 0, "updated": 0, "removed": 0}
+
+    (corpus / "novo.md").write_text("# Asyncio\n\nProgramação assíncrona com asyncio.", encoding="utf-8")
+    (corpus / "culinaria.md").unlink()
+    assert index.update([corpus]) == {"added": 1, "updated": 0, "removed": 1}
+
+    assert index.search("asyncio")[0]["title"] == "Asyncio"
+    assert index.search("bolo cenoura") == []
+
+def test_search_empty_index(index):
+    """Testa a busca em índice vazio"""
+    assert index.search("python") == []
+
+def test_search_limit_keeps_best_passages(index, corpus):
+    """Testa se o limite devolve as passagens mais relevantes, em ordem"""
+    index.update([corpus])
+    results = index.search("python funções", limit=1)
+
+    assert [r["title"] for r in results] == ["Funções"]
+    assert results[0]["position"] == 1
+    assert results[0]["score"] > 0
+
+def test_legacy_index_is_rebuilt(tmp_path, corpus):
+    """Testa se um índice no formato antigo é descartado e reconstruído"""
+    path = tmp_path / "index.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            "CREATE TABLE files (path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);"
+            "CREATE TABLE postings (term TEXT, doc_id INTEGER, tf INTEGER);"
+        )
+        conn.execute("INSERT INTO files VALUES (?, ?, ?)", (str(corpus / "python.md"), 0, 0))
+    conn.close()
+
+    index = BM25Index(path)
+    assert index.update([corpus]) == {"added": 2, "updated": 0, "removed": 0}
+    assert index.search("bolo")[0]["title"] == "Receitas"
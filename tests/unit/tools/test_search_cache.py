@@ -0,0 +1,84 @@
+import threading
+import time
+import pytest
+from src.tools.search_cache import SearchCache
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture que retorna um cache de pesquisa em diretório temporário"""
+    return SearchCache(cache_dir=tmp_path / "search", ttl=60, max_bytes=1024 * 1024)
+
+def test_key_normalization():
+    """Testa se consultas equivalentes geram a mesma chave"""
+    assert SearchCache.make_key("  Python   Básico ") == SearchCache.make_key("python básico")
+    assert SearchCache.make_key("python", {"n_results": 10}) != SearchCache.make_key("python", {"n_results": 5})
+    assert SearchCache.make_key("python", {"a": 1, "b": None}) == SearchCache.make_key("python", {"a": 1})
+
+def test_hit_and_miss(cache):
+    """Testa se a segunda consulta é atendida pelo cache"""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"organic": [{"title": "Python"}]}
+
+    first = cache.get_or_fetch("python", {}, fetch)
+    second = cache.get_or_fetch("PYTHON ", {}, fetch)
+
+    assert first == second
+    assert len(calls) == 1
+    metrics = cache.metrics()
+    assert metrics.hits == 1
+    assert metrics.misses == 1
+    assert metrics.hit_rate == 0.5
+
+def test_persistence_across_instances(cache, tmp_path):
+    """Testa se as entradas sobrevivem a uma nova instância do cache"""
+    cache.get_or_fetch("python", {}, lambda: {"ok": True})
+
+    reopened = SearchCache(cache_dir=tmp_path / "search", ttl=60, max_bytes=1024 * 1024)
+    assert reopened.get_or_fetch("python", {}, lambda: pytest.fail("não deveria pesquisar")) == {"ok": True}
+    assert reopened.metrics().entries == 1
+
+def test_ttl_expiration(tmp_path):
+    """Testa se entradas expiradas são descartadas"""
+    cache = SearchCache(cache_dir=tmp_path, ttl=0.05, max_bytes=1024 * 1024)
+    cache.get_or_fetch("python", {}, lambda: "antigo")
+    time.sleep(0.1)
+    assert cache.get_or_fetch("python", {}, lambda: "novo") == "novo"
+
+def test_size_eviction(tmp_path):
+    """Testa se o cache remove as entradas menos usadas ao exceder o limite"""
+    cache = SearchCache(cache_dir=tmp_path, ttl=60, max_bytes=600)
+    for i in range(5):
+        cache.get_or_fetch(f"consulta {i}", {}, lambda: "x" * 200)
+
+    metrics = cache.metrics()
+    assert metrics.size_bytes <= 600
+    assert metrics.evictions > 0
+    assert cache.get(SearchCache.make_key("consulta 4")) is not None
+
+def test_single_flight(cache):
+    """Testa se consultas idênticas concorrentes compartilham uma requisição"""
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "resultado"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("python", {}, fetch)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["resultado"] * 5
+    assert len(calls) == 1
+    assert cache.metrics().coalesced + cache.metrics().hits == 4